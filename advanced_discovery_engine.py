@@ -10,17 +10,33 @@ IMPROVEMENTS:
 5. Pattern learning from successful discoveries
 """
 
+import base64
 import json
+import math
 import numpy as np
 import sqlite3
 import pickle
-import requests
-import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Iterable, Set, Tuple, Optional
 from collections import Counter
+import os
 import re
 
+from github_client import TokenSpec, get_client
+from github_graphql import GraphQLSearchPager, REPOSITORY_BATCH_SIZE, resolve_repositories
+from keyword_matcher import KeywordMatcher
+from repo_features import FEATURES, RepoFeatures
+
+# github.com/<owner>/<repo> links in README markdown, HTML or plain text
+GITHUB_REPO_LINK = re.compile(r'github\.com/([A-Za-z0-9][A-Za-z0-9-]{0,38})/([A-Za-z0-9_.-]+)')
+
+# First path segments on github.com that are site pages, not owners
+NON_OWNER_PATHS = {
+    'about', 'apps', 'collections', 'contact', 'enterprise', 'explore',
+    'features', 'login', 'marketplace', 'notifications', 'orgs', 'pricing',
+    'security', 'settings', 'site', 'sponsors', 'topics', 'trending', 'users',
+}
+
 class AdvancedEmbedding:
     """
     Significantly better embeddings using:
@@ -53,6 +69,9 @@ class AdvancedEmbedding:
         'support', 'consulting', 'training', 'certification'
     ]
 
+    # Both tables above, matched by the shared feature store
+    KEYWORDS = FEATURES.register(*CATEGORY_KEYWORDS.values(), MONETIZATION_SIGNALS)
+
     # Language ecosystem value (higher = more enterprise demand)
     LANGUAGE_VALUE = {
         'go': 1.2, 'rust': 1.15, 'java': 1.1, 'python': 1.0, 'typescript': 1.05,
@@ -62,62 +81,54 @@ class AdvancedEmbedding:
     @classmethod
     def generate(cls, repo_data: Dict[str, Any], dimension: int = 256) -> np.ndarray:
         """Generate advanced embedding"""
+        return cls.from_features(FEATURES.features(repo_data), dimension)
 
-        vec = np.zeros(dimension, dtype=np.float32)
+    @classmethod
+    def from_features(cls, features: RepoFeatures, dimension: int = 256) -> np.ndarray:
+        """Embedding from a repo's feature record"""
 
-        # Extract text fields (handle None values)
-        name = (repo_data.get('name') or '').lower()
-        description = (repo_data.get('description') or '').lower()
-        category = (repo_data.get('category') or '').lower()
-        topics = [t.lower() for t in repo_data.get('topics', [])]
-        language = (repo_data.get('language') or '').lower()
+        vec = np.zeros(dimension, dtype=np.float32)
 
-        combined_text = f"{name} {description} {category} {' '.join(topics)}"
+        description = features.description
+        hits = features.hits()
 
         # Feature 1-10: Category signals
         idx = 0
         for cat_name, keywords in cls.CATEGORY_KEYWORDS.items():
-            score = sum(1.0 for kw in keywords if kw in combined_text)
+            score = sum(1.0 for kw in keywords if kw in hits)
             vec[idx] = np.tanh(score / 3.0)  # Normalize to [-1, 1]
             idx += 1
 
         # Feature 11-20: Monetization signals
         for i, signal in enumerate(cls.MONETIZATION_SIGNALS[:10]):
-            if signal in combined_text:
+            if signal in hits:
                 vec[10 + i] = 1.0
 
         # Feature 21-30: TF-IDF style word importance
-        words = re.findall(r'\b\w+\b', combined_text)
+        words = features.words
         word_freq = Counter(words)
         important_words = [w for w, c in word_freq.most_common(10)]
         for i, word in enumerate(important_words):
             vec[20 + i] = len(word) / 15.0  # Longer words = more specific
 
         # Feature 31-40: Repository metrics (normalized)
-        stars = repo_data.get('stars', 0)
-        forks = repo_data.get('forks', 0)
-        watchers = repo_data.get('watchers', stars)
-        open_issues = repo_data.get('open_issues', 0)
-
-        vec[30] = np.log1p(stars) / 10.0
-        vec[31] = np.log1p(forks) / 10.0
-        vec[32] = np.log1p(watchers) / 10.0
-        vec[33] = np.log1p(open_issues) / 10.0
+        vec[30] = features.log_stars / 10.0
+        vec[31] = features.log_forks / 10.0
+        vec[32] = features.log_watchers / 10.0
+        vec[33] = features.log_open_issues / 10.0
 
         # Fork/star ratio (high = active community)
-        if stars > 0:
-            vec[34] = min(forks / stars, 1.0)
+        vec[34] = min(features.fork_ratio, 1.0)
 
         # Issue/star ratio (activity indicator)
-        if stars > 0:
-            vec[35] = min(open_issues / stars, 1.0)
+        vec[35] = min(features.issue_ratio, 1.0)
 
         # Feature 36-40: Language signals
-        lang_value = cls.LANGUAGE_VALUE.get(language, 0.8)
+        lang_value = cls.LANGUAGE_VALUE.get(features.language, 0.8)
         vec[36] = lang_value
 
         # Feature 41-50: Topic embeddings
-        for i, topic in enumerate(topics[:10]):
+        for i, topic in enumerate(features.topics[:10]):
             vec[40 + i] = 1.0
 
         # Feature 51-100: Character n-grams from description
@@ -142,6 +153,40 @@ class AdvancedEmbedding:
         return vec
 
 
+def has_recent_activity(pushed_at: Optional[str], days: int = 90) -> bool:
+    """True if the repo was pushed to within the last `days` days"""
+    if not pushed_at:
+        return False
+
+    try:
+        pushed = datetime.fromisoformat(pushed_at.replace('Z', '+00:00'))
+    except ValueError:
+        return False
+
+    return (datetime.now(pushed.tzinfo) - pushed).days < days
+
+
+def extract_repo_links(text: str) -> List[Tuple[str, str]]:
+    """Unique (owner, name) pairs linked from `text`, in order of appearance"""
+    links = []
+    seen = set()
+
+    for match in GITHUB_REPO_LINK.finditer(text):
+        owner, name = match.groups()
+        name = name.rstrip('.')
+        if name.endswith('.git'):
+            name = name[:-4]
+
+        key = f"{owner}/{name}".lower()
+        if not name or owner.lower() in NON_OWNER_PATHS or key in seen:
+            continue
+
+        seen.add(key)
+        links.append((owner, name))
+
+    return links
+
+
 class FastMoneyScorer:
     """
     Advanced fast-money scoring algorithm using multiple factors:
@@ -152,17 +197,60 @@ class FastMoneyScorer:
     - Risk assessment
     """
 
+    # Enterprise-friendly categories
+    ENTERPRISE_CATEGORIES = ['security', 'devops', 'analytics', 'database', 'ai']
+
+    # Clear monetization keywords
+    MONETIZATION_KEYWORDS = ['api', 'saas', 'platform', 'service', 'enterprise']
+
+    # Annual revenue multiplier by category (first match wins, default 100)
+    REVENUE_MULTIPLIERS = {
+        'security': 200,
+        'ai': 300,
+        'devops': 150,
+        'analytics': 180,
+        'database': 250,
+        'api': 120,
+    }
+
+    # High-value languages
+    HIGH_VALUE_LANGUAGES = ['go', 'rust', 'java', 'python', 'typescript']
+
+    # The batch path (columns) scans with this matcher, score() reads the shared feature record
+    KEYWORDS = KeywordMatcher(ENTERPRISE_CATEGORIES, MONETIZATION_KEYWORDS, REVENUE_MULTIPLIERS)
+    FEATURES.register(KEYWORDS.keywords)
+
+    # score_batch labels, in threshold order
+    TIME_TO_MARKET = ["1-2 months", "2-4 months", "3-6 months", "6-12 months"]
+    RISK_LEVELS = ["High", "Medium", "Low"]
+
+    # Structured array returned by score_batch
+    SCORE_DTYPE = np.dtype([
+        ('total_score', 'f8'),
+        ('demand_score', 'f8'),
+        ('competition_score', 'f8'),
+        ('ease_score', 'f8'),
+        ('revenue_score', 'f8'),
+        ('revenue_low', 'i8'),
+        ('revenue_high', 'i8'),
+        ('time_to_market', 'U11'),
+        ('risk_level', 'U6'),
+        ('is_fast_money', '?'),
+    ])
+
     @staticmethod
     def score(repo_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate comprehensive fast-money score"""
 
-        stars = repo_data.get('stars', 0)
-        forks = repo_data.get('forks', 0)
-        language = (repo_data.get('language') or '').lower()
-        category = (repo_data.get('category') or '').lower()
-        description = (repo_data.get('description') or '').lower()
-        topics = [t.lower() for t in repo_data.get('topics', [])]
-        has_recent_activity = repo_data.get('recent_activity', False)
+        features = FEATURES.features(repo_data)
+        stars = features.stars
+        language = features.language
+        category = features.category
+        has_recent_activity = features.recent_activity
+
+        category_hits = features.category_hits
+        description_hits = features.description_hits
+        text_hits = features.hits('description', 'topics')
 
         # Initialize scores
         demand_score = 0.0
@@ -188,7 +276,7 @@ class FastMoneyScorer:
             demand_score += 0.5
 
         # High fork ratio = people want to build on it
-        if stars > 0 and (forks / stars) > 0.3:
+        if features.fork_ratio > 0.3:
             demand_score += 0.5
 
         # 2. Competition Analysis (0-2 points)
@@ -200,23 +288,20 @@ class FastMoneyScorer:
 
         # 3. Ease of Monetization (0-3 points)
         # Enterprise-friendly categories
-        enterprise_categories = ['security', 'devops', 'analytics', 'database', 'ai']
-        if any(cat in category for cat in enterprise_categories):
+        if any(cat in category_hits for cat in FastMoneyScorer.ENTERPRISE_CATEGORIES):
             ease_score += 1.5
 
         # Clear monetization keywords
-        monetization_keywords = ['api', 'saas', 'platform', 'service', 'enterprise']
-        keyword_count = sum(1 for kw in monetization_keywords if kw in description or kw in ' '.join(topics))
+        keyword_count = sum(1 for kw in FastMoneyScorer.MONETIZATION_KEYWORDS if kw in text_hits)
         ease_score += min(keyword_count * 0.5, 1.5)
 
         # 4. Revenue Potential (0-2 points)
         # High-value languages
-        high_value_langs = ['go', 'rust', 'java', 'python', 'typescript']
-        if language in high_value_langs:
+        if language in FastMoneyScorer.HIGH_VALUE_LANGUAGES:
             revenue_score += 1.0
 
         # B2B categories
-        if 'security' in category or 'enterprise' in description:
+        if 'security' in category_hits or 'enterprise' in description_hits:
             revenue_score += 1.0
 
         # Calculate final score (0-10)
@@ -252,17 +337,8 @@ class FastMoneyScorer:
         """Estimate annual revenue potential"""
 
         # Base multiplier by category
-        category_multipliers = {
-            'security': 200,
-            'ai': 300,
-            'devops': 150,
-            'analytics': 180,
-            'database': 250,
-            'api': 120,
-        }
-
         multiplier = 100
-        for cat, mult in category_multipliers.items():
+        for cat, mult in FastMoneyScorer.REVENUE_MULTIPLIERS.items():
             if cat in category.lower():
                 multiplier = mult
                 break
@@ -271,7 +347,10 @@ class FastMoneyScorer:
         low = int(stars * multiplier * 0.05)
         high = int(stars * multiplier * 0.3 * (score / 10.0))
 
-        # Format
+        return FastMoneyScorer.format_revenue(low, high)
+
+    @staticmethod
+    def format_revenue(low: int, high: int) -> str:
         if high >= 1_000_000:
             return f"${low // 1000}K-${high // 1_000_000}M"
         else:
@@ -323,16 +402,174 @@ class FastMoneyScorer:
         else:
             return "Low"
 
+    @staticmethod
+    def columns(repos: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Columnar arrays of the repo_data fields score() reads (hit matrices over KEYWORDS)"""
+        keywords = FastMoneyScorer.KEYWORDS
+        column_index = {keyword: j for j, keyword in enumerate(keywords.keywords)}
+
+        n = len(repos)
+        stars = np.zeros(n, dtype=np.int64)
+        forks = np.zeros(n, dtype=np.int64)
+        recent_activity = np.zeros(n, dtype=bool)
+        has_license = np.zeros(n, dtype=bool)
+        high_value_language = np.zeros(n, dtype=bool)
+        category_hits = np.zeros((n, len(column_index)), dtype=bool)
+        description_hits = np.zeros((n, len(column_index)), dtype=bool)
+        text_hits = np.zeros((n, len(column_index)), dtype=bool)
+
+        for i, repo_data in enumerate(repos):
+            stars[i] = repo_data.get('stars', 0)
+            forks[i] = repo_data.get('forks', 0)
+            recent_activity[i] = bool(repo_data.get('recent_activity', False))
+            has_license[i] = repo_data.get('license') is not None
+            high_value_language[i] = (repo_data.get('language') or '').lower() in FastMoneyScorer.HIGH_VALUE_LANGUAGES
+
+            description = keywords.hits((repo_data.get('description') or '').lower())
+            topics = keywords.hits(' '.join(t.lower() for t in repo_data.get('topics', [])))
+
+            for keyword in keywords.hits((repo_data.get('category') or '').lower()):
+                category_hits[i, column_index[keyword]] = True
+            for keyword in description:
+                description_hits[i, column_index[keyword]] = True
+            for keyword in description | topics:
+                text_hits[i, column_index[keyword]] = True
+
+        return {
+            'stars': stars,
+            'forks': forks,
+            'recent_activity': recent_activity,
+            'has_license': has_license,
+            'high_value_language': high_value_language,
+            'category_hits': category_hits,
+            'description_hits': description_hits,
+            'text_hits': text_hits,
+        }
+
+    @staticmethod
+    def score_batch(columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Vectorized score() + estimate_revenue/time_to_market/assess_risk
+
+        Returns a SCORE_DTYPE structured array with unrounded scores and
+        the revenue range as integers; the float operations and their order
+        match the per-repo path, so score_many() reproduces score() exactly.
+        """
+        column_index = {keyword: j for j, keyword in enumerate(FastMoneyScorer.KEYWORDS.keywords)}
+        stars = columns['stars']
+        forks = columns['forks']
+        recent = columns['recent_activity']
+        category_hits = columns['category_hits']
+
+        def any_hit(hits: np.ndarray, keywords: List[str]) -> np.ndarray:
+            return hits[:, [column_index[keyword] for keyword in keywords]].any(axis=1)
+
+        # 1. Market demand
+        demand = np.select(
+            [stars >= 5000, stars >= 2000, stars >= 1000, stars >= 500, stars >= 100],
+            [3.0, 2.5, 2.0, 1.5, 1.0],
+            default=0.0
+        )
+        demand = demand + np.where(recent, 0.5, 0.0)
+        fork_ratio = np.divide(forks, stars, out=np.zeros(len(stars)), where=stars > 0)
+        demand = demand + np.where((stars > 0) & (fork_ratio > 0.3), 0.5, 0.0)
+
+        # 2. Competition
+        competition = np.where(stars < 5000, 1.0, 0.0) + np.where(stars > 500, 1.0, 0.0)
+
+        # 3. Ease of monetization
+        ease = np.where(any_hit(category_hits, FastMoneyScorer.ENTERPRISE_CATEGORIES), 1.5, 0.0)
+        keyword_count = columns['text_hits'][:, [column_index[kw] for kw in FastMoneyScorer.MONETIZATION_KEYWORDS]].sum(axis=1)
+        ease = ease + np.minimum(keyword_count * 0.5, 1.5)
+
+        # 4. Revenue potential
+        revenue = np.where(columns['high_value_language'], 1.0, 0.0)
+        b2b = any_hit(category_hits, ['security']) | any_hit(columns['description_hits'], ['enterprise'])
+        revenue = revenue + np.where(b2b, 1.0, 0.0)
+
+        total = demand + competition + ease + revenue
+
+        # Revenue range
+        multiplier = np.select(
+            [any_hit(category_hits, [category]) for category in FastMoneyScorer.REVENUE_MULTIPLIERS],
+            list(FastMoneyScorer.REVENUE_MULTIPLIERS.values()),
+            default=100
+        )
+        low = (stars * multiplier * 0.05).astype(np.int64)
+        high = (stars * multiplier * 0.3 * (total / 10.0)).astype(np.int64)
+
+        # Time to market
+        time_to_market = np.select(
+            [total >= 8.5, total >= 7.5, total >= 6.5],
+            FastMoneyScorer.TIME_TO_MARKET[:3],
+            default=FastMoneyScorer.TIME_TO_MARKET[3]
+        )
+
+        # Risk
+        risk_points = (
+            np.where(stars < 500, 2, 0) +
+            np.where(columns['has_license'], 0, 1) +
+            np.where(recent, 0, 1) +
+            np.where(total < 6.0, 2, 0)
+        )
+        risk_level = np.select(
+            [risk_points >= 4, risk_points >= 2],
+            FastMoneyScorer.RISK_LEVELS[:2],
+            default=FastMoneyScorer.RISK_LEVELS[2]
+        )
+
+        scores = np.zeros(len(stars), dtype=FastMoneyScorer.SCORE_DTYPE)
+        scores['total_score'] = total
+        scores['demand_score'] = demand
+        scores['competition_score'] = competition
+        scores['ease_score'] = ease
+        scores['revenue_score'] = revenue
+        scores['revenue_low'] = low
+        scores['revenue_high'] = high
+        scores['time_to_market'] = time_to_market
+        scores['risk_level'] = risk_level
+        scores['is_fast_money'] = total >= 7.0
+        return scores
+
+    @staticmethod
+    def score_many(repos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """score() results for a batch of repo_data dicts, computed with score_batch"""
+        scores = FastMoneyScorer.score_batch(FastMoneyScorer.columns(repos)).tolist()
+
+        return [
+            {
+                'total_score': round(total, 1),
+                'demand_score': round(demand, 1),
+                'competition_score': round(competition, 1),
+                'ease_score': round(ease, 1),
+                'revenue_score': round(revenue, 1),
+                'estimated_revenue': FastMoneyScorer.format_revenue(low, high),
+                'time_to_market': time_to_market,
+                'risk_level': risk_level,
+                'is_fast_money': is_fast_money,
+            }
+            for total, demand, competition, ease, revenue, low, high, time_to_market, risk_level, is_fast_money in scores
+        ]
+
 
 class MultiSourceDiscovery:
     """Discover repos from multiple sources"""
 
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: TokenSpec = None, search_backend: Optional[str] = None):
+        # One token or a list of tokens (pooled, see github_client.TokenPool)
         self.token = github_token
-        self.headers = {}
-        if self.token:
-            self.headers['Authorization'] = f'token {self.token}'
-        self.headers['Accept'] = 'application/vnd.github.v3+json'
+        self.client = get_client(self.token)
+
+        # 'rest' (default) or 'graphql' (smaller, projected payloads; needs a token)
+        self.search_backend = search_backend or os.getenv('GITHUB_SEARCH_BACKEND', 'rest')
+        if self.search_backend == 'graphql' and not self.token:
+            print("⚠️  GraphQL search needs a GitHub token - using REST search")
+            self.search_backend = 'rest'
+        self.graphql_pager = GraphQLSearchPager(self.client)
+
+        # README links parsed once per README blob SHA; repos already returned
+        self.readme_links_by_sha: Dict[str, List[Tuple[str, str]]] = {}
+        self.known_repos: Set[str] = set()
 
     def discover_trending(self, language: str = '', since: str = 'weekly') -> List[Dict]:
         """
@@ -352,18 +589,68 @@ class MultiSourceDiscovery:
 
         return self._search_repos(query, max_results=50)
 
-    def discover_awesome_lists(self) -> List[Dict]:
-        """Discover repos from awesome lists"""
+    def discover_awesome_lists(self, max_lists: int = 20, known: Iterable[str] = ()) -> List[Dict]:
+        """
+        Discover repos linked from awesome lists
+
+        Every github.com/owner/repo link in each list's README is collected,
+        links already in `known` (owner/name) or returned earlier are
+        dropped, and the rest are resolved through batched GraphQL lookups:
+        a list with 1000 links costs about 10 requests.
+        """
 
         # Search for awesome lists
         query = "awesome stars:>1000"
-        awesome_lists = self._search_repos(query, max_results=20)
+        awesome_lists = self._search_repos(query, max_results=max_lists)
 
         print(f"  Found {len(awesome_lists)} awesome lists")
 
-        # TODO: Parse awesome list READMEs to extract repos
-        # For now, return the awesome lists themselves
-        return awesome_lists
+        if not self.token:
+            print("  ⚠️  Resolving awesome list links needs a GitHub token (GraphQL) - returning the lists")
+            return awesome_lists
+
+        known = {name.lower() for name in known} | self.known_repos
+        known.update((repo.get('full_name') or '').lower() for repo in awesome_lists)
+
+        candidates = []
+        for awesome_list in awesome_lists:
+            full_name = awesome_list.get('full_name')
+            try:
+                links = self.readme_links(full_name)
+            except Exception as e:
+                print(f"  ⚠️  README error for {full_name}: {e}")
+                continue
+
+            new_links = [(owner, name) for owner, name in links if f"{owner}/{name}".lower() not in known]
+            known.update(f"{owner}/{name}".lower() for owner, name in new_links)
+            candidates.extend(new_links)
+
+            print(f"    {full_name}: {len(links)} links, {len(new_links)} new")
+
+        try:
+            repos = resolve_repositories(self.client, candidates)
+        except Exception as e:
+            print(f"  ⚠️  Discovery error: {e}")
+            return []
+
+        self.known_repos.update(repo['full_name'].lower() for repo in repos if repo.get('full_name'))
+        print(f"  Resolved {len(repos)}/{len(candidates)} linked repos "
+              f"in {math.ceil(len(candidates) / REPOSITORY_BATCH_SIZE)} requests")
+
+        return repos
+
+    def readme_links(self, full_name: str) -> List[Tuple[str, str]]:
+        """Repo links in a repo's README, parsed once per README blob SHA"""
+        # Served from the shared response cache (free 304s) once fetched
+        readme = self.client.get_json(f'/repos/{full_name}/readme')
+
+        sha = readme.get('sha')
+        links = self.readme_links_by_sha.get(sha)
+        if links is None:
+            text = base64.b64decode(readme.get('content') or '').decode('utf-8', errors='replace')
+            links = self.readme_links_by_sha[sha] = extract_repo_links(text)
+
+        return links
 
     def discover_by_topic(self, topic: str, min_stars: int = 100) -> List[Dict]:
         """Discover repos by topic"""
@@ -374,23 +661,18 @@ class MultiSourceDiscovery:
     def _search_repos(self, query: str, max_results: int = 30) -> List[Dict]:
         """Search GitHub repositories"""
 
-        url = "https://api.github.com/search/repositories"
-        params = {
-            'q': query,
-            'sort': 'stars',
-            'order': 'desc',
-            'per_page': min(100, max_results)
-        }
-
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-
-            data = response.json()
-            repos = data.get('items', [])
-
-            time.sleep(1.2)  # Rate limiting
-
+            if self.search_backend == 'graphql':
+                repos = self.graphql_pager.page(query, sort='stars', per_page=max_results)
+            else:
+                data = self.client.search_repositories(
+                    query,
+                    sort='stars',
+                    per_page=max_results
+                )
+                repos = data.get('items', [])
+
+            # No fixed sleep: the shared rate governor paces requests
             return repos
 
         except Exception as e:
@@ -4,17 +4,17 @@ Analyze GitHub stargazers' repositories for monetization opportunities.
 """
 
 import json
-import requests
-import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import sys
 
+from github_client import get_client, tokens_from_env
+from enrichment_pipeline import EnrichmentPipeline, min_stars, not_archived, not_fork, pushed_within
+from keyword_matcher import KeywordMatcher
+
 # GitHub API configuration
-GITHUB_TOKEN = None  # Will use public API with rate limiting
-HEADERS = {
-    'Accept': 'application/vnd.github.v3+json',
-}
+GITHUB_TOKEN = tokens_from_env()  # None: public API (60 core requests/hour)
+CLIENT = get_client(GITHUB_TOKEN)
 
 # Monetization keywords indicating commercial potential
 MONETIZATION_KEYWORDS = [
@@ -33,6 +33,9 @@ EXPERIMENTAL_KEYWORDS = [
     'hello-world', 'getting-started', 'leetcode', 'interview'
 ]
 
+# Both tables, matched in one scan per text
+KEYWORDS = KeywordMatcher(MONETIZATION_KEYWORDS, EXPERIMENTAL_KEYWORDS)
+
 def load_stargazers(filepath: str) -> List[Dict]:
     """Load stargazers data from JSON file."""
     with open(filepath, 'r') as f:
@@ -61,7 +64,7 @@ def fetch_user_repos(username: str) -> List[Dict]:
     page = 1
 
     while True:
-        url = f'https://api.github.com/users/{username}/repos'
+        url = f'/users/{username}/repos'
         params = {
             'per_page': 100,
             'page': page,
@@ -70,14 +73,8 @@ def fetch_user_repos(username: str) -> List[Dict]:
         }
 
         try:
-            response = requests.get(url, headers=HEADERS, params=params, timeout=10)
-
-            if response.status_code == 403:  # Rate limit
-                reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-                wait_time = max(reset_time - time.time(), 0) + 1
-                print(f"Rate limited. Waiting {wait_time:.0f} seconds...")
-                time.sleep(wait_time)
-                continue
+            # Rate limits / 5xx are waited out by the client's retry policy
+            response = CLIENT.get(url, params=params)
 
             if response.status_code != 200:
                 print(f"Error fetching repos for {username}: {response.status_code}")
@@ -92,8 +89,7 @@ def fetch_user_repos(username: str) -> List[Dict]:
             if len(data) < 100:
                 break
 
-            page += 1
-            time.sleep(0.5)  # Be nice to API
+            page += 1  # Pacing is handled by the shared rate governor
 
         except Exception as e:
             print(f"Exception fetching repos for {username}: {e}")
@@ -103,11 +99,11 @@ def fetch_user_repos(username: str) -> List[Dict]:
 
 def fetch_recent_commits(owner: str, repo: str) -> Optional[str]:
     """Fetch the date of the most recent commit."""
-    url = f'https://api.github.com/repos/{owner}/{repo}/commits'
+    url = f'/repos/{owner}/{repo}/commits'
     params = {'per_page': 1}
 
     try:
-        response = requests.get(url, headers=HEADERS, params=params, timeout=10)
+        response = CLIENT.get(url, params=params)
 
         if response.status_code == 200:
             data = response.json()
@@ -115,10 +111,30 @@ def fetch_recent_commits(owner: str, repo: str) -> Optional[str]:
                 return data[0].get('commit', {}).get('committer', {}).get('date')
 
     except Exception as e:
-        pass
+        print(f"Exception fetching commits for {owner}/{repo}: {e}")
 
     return None
 
+def fetch_community_profile(owner: str, repo: str) -> Dict:
+    """README / license presence and health score in one call."""
+    try:
+        response = CLIENT.get(f'/repos/{owner}/{repo}/community/profile')
+
+        if response.status_code == 200:
+            data = response.json()
+            files = data.get('files') or {}
+            license_info = files.get('license') or {}
+            return {
+                'has_readme': bool(files.get('readme')),
+                'license': license_info.get('spdx_id') or license_info.get('name'),
+                'health_percentage': data.get('health_percentage'),
+            }
+
+    except Exception as e:
+        print(f"Exception fetching community profile for {owner}/{repo}: {e}")
+
+    return {}
+
 def calculate_commercial_score(repo: Dict) -> float:
     """
     Calculate commercial potential score (0-10) based on multiple factors.
@@ -175,8 +191,9 @@ def calculate_commercial_score(repo: Dict) -> float:
         ' '.join(repo.get('topics', []))
     )
 
-    monetization_matches = sum(1 for kw in MONETIZATION_KEYWORDS if kw in text_to_check)
-    experimental_matches = sum(1 for kw in EXPERIMENTAL_KEYWORDS if kw in text_to_check)
+    hits = KEYWORDS.hits(text_to_check)
+    monetization_matches = sum(1 for kw in MONETIZATION_KEYWORDS if kw in hits)
+    experimental_matches = sum(1 for kw in EXPERIMENTAL_KEYWORDS if kw in hits)
 
     if monetization_matches >= 3:
         score += 2
@@ -303,25 +320,26 @@ def estimate_investment(stars: int) -> str:
     else:
         return "$25K-60K (extensive development & marketing needed)"
 
-def analyze_repo_for_monetization(repo: Dict, user: Dict) -> Optional[Dict]:
-    """Analyze a single repository for monetization potential."""
-
-    # Basic filters
-    stars = repo.get('stargazers_count', 0)
-    if stars < 100:
-        return None
-
-    if repo.get('archived', False):
-        return None
+def is_experimental(repo: Dict) -> bool:
+    """Name/description look like a tutorial, demo or exercise."""
+    text = (repo.get('name', '') + ' ' + (repo.get('description') or '')).lower()
+    hits = KEYWORDS.hits(text)
+    experimental_matches = sum(1 for kw in EXPERIMENTAL_KEYWORDS if kw in hits)
+    return experimental_matches >= 2
+
+# Tier 0: free checks on the repo list payload
+MONETIZATION_FILTERS = [
+    min_stars(100),
+    not_archived(),
+    not_fork(),
+    pushed_within(365),  # Untouched for a year: abandoned, not an opportunity
+    ('not_experimental', lambda repo: not is_experimental(repo)),
+]
 
-    if repo.get('fork', False):
-        return None
+def score_repo_for_monetization(repo: Dict) -> Optional[Dict]:
+    """Cheap scoring pass on a repo that passed the basic filters."""
 
-    # Check for experimental/low-value project
-    text = (repo.get('name', '') + ' ' + (repo.get('description') or '')).lower()
-    experimental_matches = sum(1 for kw in EXPERIMENTAL_KEYWORDS if kw in text)
-    if experimental_matches >= 2:
-        return None
+    stars = repo.get('stargazers_count', 0)
 
     # Calculate scores
     commercial_score = calculate_commercial_score(repo)
@@ -360,16 +378,36 @@ def analyze_repo_for_monetization(repo: Dict, user: Dict) -> Optional[Dict]:
         'monetization_strategies': strategies,
         'time_to_market': estimate_time_to_market(repo, stars),
         'required_investment': estimate_investment(stars),
-        'owner': {
-            'username': user.get('username'),
-            'profile_url': user.get('profile_url'),
-            'followers': user.get('followers'),
-            'company': user.get('company'),
-            'location': user.get('location'),
-            'bio': user.get('bio')
-        }
     }
 
+def owner_summary(user: Dict) -> Dict:
+    """Owner fields attached to each opportunity."""
+    return {
+        'username': user.get('username'),
+        'profile_url': user.get('profile_url'),
+        'followers': user.get('followers'),
+        'company': user.get('company'),
+        'location': user.get('location'),
+        'bio': user.get('bio')
+    }
+
+def enrich_opportunity(repo: Dict, opportunity: Dict) -> Dict:
+    """Per-repo API calls, only for opportunities that made the shortlist."""
+    owner = repo.get('owner', {}).get('login')
+    name = repo.get('name')
+
+    last_commit_at = fetch_recent_commits(owner, name)
+    opportunity['last_commit_at'] = last_commit_at
+    if last_commit_at:
+        opportunity['recently_maintained'] = is_recently_active(last_commit_at, months=3)
+
+    profile = fetch_community_profile(owner, name)
+    opportunity['has_readme'] = profile.get('has_readme')
+    opportunity['health_percentage'] = profile.get('health_percentage')
+    opportunity['license'] = opportunity['license'] or profile.get('license')
+
+    return opportunity
+
 def main():
     """Main analysis function."""
 
@@ -395,7 +433,20 @@ def main():
         reverse=True
     )
 
-    # Analyze repositories
+    # Enrichment costs 2 core calls per shortlisted repo - too much for the
+    # anonymous 60/hour budget, which the repo listing already needs
+    if not GITHUB_TOKEN:
+        print("⚠️  No GITHUB_TOKEN - skipping commit/community-profile enrichment "
+              "(last_commit_at, has_readme, health_percentage stay unset)")
+
+    # Analyze repositories: filters -> scoring -> API enrichment of the top 5 only
+    pipeline = EnrichmentPipeline(
+        MONETIZATION_FILTERS,
+        score_repo_for_monetization,
+        enrich=enrich_opportunity if GITHUB_TOKEN else None,
+        rank_key=lambda opp: opp['commercial_score']
+    )
+
     all_opportunities = []
     users_analyzed = 0
     max_users = 30  # Analyze top 30 users (API rate limit consideration)
@@ -410,18 +461,10 @@ def main():
         repos = fetch_user_repos(username)
         print(f"Fetched {len(repos)} repositories")
 
-        # Analyze each repo
-        user_opportunities = []
-        for repo in repos:
-            opportunity = analyze_repo_for_monetization(repo, user)
-            if opportunity:
-                user_opportunities.append(opportunity)
-
-        # Sort by commercial score
-        user_opportunities.sort(key=lambda x: x['commercial_score'], reverse=True)
-
-        # Take top 5 per user
-        top_opportunities = user_opportunities[:5]
+        # Take top 5 per user (sorted by commercial score)
+        top_opportunities = pipeline.run(repos, top_n=5)
+        for opp in top_opportunities:
+            opp['owner'] = owner_summary(user)
 
         if top_opportunities:
             print(f"Found {len(top_opportunities)} monetizable repos for {username}")
@@ -431,9 +474,6 @@ def main():
         all_opportunities.extend(top_opportunities)
         users_analyzed += 1
 
-        # Rate limit protection
-        time.sleep(2)
-
     # Sort all opportunities by commercial score
     all_opportunities.sort(key=lambda x: x['commercial_score'], reverse=True)
 
@@ -444,6 +484,7 @@ def main():
             'analysis_date': datetime.now().isoformat(),
             'total_opportunities': len(all_opportunities),
             'users_analyzed': users_analyzed,
+            'enriched': bool(GITHUB_TOKEN),
             'opportunities': all_opportunities
         }, f, indent=2)
 
@@ -451,6 +492,8 @@ def main():
     print(f"Analysis complete!")
     print(f"Total opportunities found: {len(all_opportunities)}")
     print(f"Results saved to: {output_file}")
+    print(f"Pipeline pass rates:")
+    pipeline.print_stats()
 
     # Print summary
     if all_opportunities:
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+📼 Record / Replay Transport for GitHub Traffic
+
+A requests transport adapter mounted on the shared GitHub client session,
+so every fetcher that uses github_client can run against a cassette:
+
+- record: real requests go out; each request/response pair is appended to
+  a gzip-compressed JSONL cassette
+- replay: responses come from the cassette only (no network, no rate
+  limit); an optional per-request latency simulates the real API
+
+Configure with environment variables:
+    GITHUB_CASSETTE=runs/pipeline.jsonl.gz
+    GITHUB_CASSETTE_MODE=record | replay      (default: replay)
+    GITHUB_CASSETTE_LATENCY=0.15              (seconds per replayed request)
+
+Requests are matched on method + path + sorted query params + body (the
+host is ignored, so a cassette replays against any GITHUB_API_URL). A key
+recorded several times replays its responses in order; the last one then
+repeats. Authorization headers are never written to the cassette.
+
+While a cassette is active the shared clients skip the response cache and
+the rate-limit governor DB: every request reaches the cassette (so a
+recording is complete and a replay is deterministic), and replayed headers
+never leak into a real run's rate-limit state.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_PATH = os.getenv('GITHUB_CASSETTE', '')
+CASSETTE_MODE = os.getenv('GITHUB_CASSETTE_MODE', 'replay')
+CASSETTE_LATENCY = float(os.getenv('GITHUB_CASSETTE_LATENCY', '0'))
+
+# Describe the wire encoding of the original body, not the decoded one we store
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class CassetteMissError(requests.RequestException):
+    """Replay mode got a request that the cassette never recorded"""
+
+
+def request_key(method: str, url: str, body: Optional[bytes]) -> str:
+    """Match key: method + path with sorted query + body digest"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    normalized = urlunsplit(('', '', parts.path, query, ''))
+
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    body_hash = hashlib.sha256(body).hexdigest()[:16] if body else ''
+
+    return f"{method.upper()} {normalized} {body_hash}".rstrip()
+
+
+class Cassette:
+    """Recorded interactions for one cassette file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.interactions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.play_counts: Dict[str, int] = defaultdict(int)
+        self.stats = {'recorded': 0, 'replayed': 0, 'missed': 0}
+
+    def load(self):
+        """Read every recorded interaction (replay mode)"""
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    interaction = json.loads(line)
+                    self.interactions[interaction['key']].append(interaction)
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response):
+        """Append one request/response pair (record mode)"""
+        interaction = {
+            'key': request_key(request.method, request.url, request.body),
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in DROPPED_HEADERS
+            },
+            'body': base64.b64encode(response.content).decode('ascii'),
+            'elapsed': response.elapsed.total_seconds(),
+            'recorded_at': time.time(),
+        }
+
+        with self.lock:
+            # Each append is its own gzip member; readers see one stream
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(json.dumps(interaction) + '\n')
+            self.stats['recorded'] += 1
+
+    def play(self, request: requests.PreparedRequest) -> requests.Response:
+        """Rebuild the recorded response for `request` (replay mode)"""
+        key = request_key(request.method, request.url, request.body)
+
+        with self.lock:
+            recorded = self.interactions.get(key)
+            if not recorded:
+                self.stats['missed'] += 1
+                raise CassetteMissError(f"No recorded response for {key}")
+
+            index = min(self.play_counts[key], len(recorded) - 1)
+            self.play_counts[key] += 1
+            self.stats['replayed'] += 1
+            interaction = recorded[index]
+
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response._content = base64.b64decode(interaction['body'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.reason = 'Replayed'
+        return response
+
+
+class CassetteAdapter(HTTPAdapter):
+    """HTTPAdapter that records to or replays from a Cassette"""
+
+    def __init__(self, cassette: Cassette, mode: str = 'replay', latency: float = 0.0, **kwargs):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.mode == 'replay':
+            if self.latency:
+                time.sleep(self.latency)
+            return self.cassette.play(request)
+
+        response = super().send(request, **kwargs)
+        self.cassette.record(request, response)
+        return response
+
+
+# One Cassette per file per process, shared by every client's adapter
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path: str, mode: str) -> Cassette:
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = Cassette(path)
+            if mode == 'replay':
+                cassette.load()
+            _cassettes[path] = cassette
+            print(f"📼 GitHub cassette ({mode}): {path}", flush=True)
+        return cassette
+
+
+def cassette_active() -> bool:
+    """True when GITHUB_CASSETTE routes the shared clients through a cassette"""
+    return bool(CASSETTE_PATH)
+
+
+def cassette_adapter_from_env(pool_size: int = 10) -> Optional[CassetteAdapter]:
+    """CassetteAdapter configured by GITHUB_CASSETTE*, or None when unset"""
+    if not cassette_active():
+        return None
+
+    cassette = get_cassette(CASSETTE_PATH, CASSETTE_MODE)
+    return CassetteAdapter(
+        cassette,
+        mode=CASSETTE_MODE,
+        latency=CASSETTE_LATENCY,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size
+    )
@@ -6,32 +6,49 @@ Runs 24/7 discovering hidden gems and feeding them to the AI.
 Never stops. Self-improving. Always learning.
 
 Features:
-- Continuous GitHub scanning
-- Rate limit management (5000 req/hour with token)
+- Continuous GitHub scanning (queries fan out concurrently per cycle)
+- Full coverage per query: date-sliced past the 1000-result search cap
+- Persisted crawl frontier: restarts resume, finished slices refresh on a schedule
+- Seen-repo filter: unchanged repos are skipped before scoring and writes
+- Page prefetch: the next page downloads while the current one is scored
+- GH Archive dumps (GH_ARCHIVE_DIR) scored offline each cycle, no API budget
+- Rate limit management: separate search (30/min) and core (5000/hour) buckets
+- Multiple tokens (GITHUB_TOKENS=a,b,c) pooled, budgets scale per token
+- Gem enrichment on the core budget, interleaved with searches
 - Real-time database updates
 - Pattern learning from discoveries
 - Auto-generates ideas from patterns
 - Streams to WASM dashboard
 """
 
+import asyncio
 import json
+import random
 import time
 import os
 import signal
 import sys
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
-from collections import deque
 import sqlite3
 
+from github_client import TokenSpec, token_count, tokens_from_env
 from hidden_gem_discovery import HiddenGemDiscovery, HiddenGemScorer
+from crawl_frontier import CrawlFrontier
+from query_planner import QueryPlanner
+from seen_filter import SeenRepoFilter, seen_key
+from repo_categorizer import CATEGORIZER
+from repo_features import FEATURES
+from gh_archive import ArchiveIngest, expand_paths
+from rate_governor import MultiBucketLimiter
 from ai_idea_generator import PatternLearner, IdeaGenerator
 
 class ContinuousDiscoveryEngine:
     """Runs continuous discovery with rate limiting and learning"""
 
-    def __init__(self, github_token: str = None):
-        self.github_token = github_token or os.getenv('GITHUB_TOKEN')
+    def __init__(self, github_token: TokenSpec = None):
+        self.github_token = github_token or tokens_from_env()
+        self.token_count = token_count(self.github_token)
         self.discovery = HiddenGemDiscovery(self.github_token)
 
         # State
@@ -40,14 +57,32 @@ class ContinuousDiscoveryEngine:
         self.gems_found = 0
         self.session_start = datetime.now()
 
-        # Rate limiting (5000 req/hour with token, 60 without)
-        self.max_requests_per_hour = 5000 if self.github_token else 60
-        self.request_history = deque(maxlen=self.max_requests_per_hour)
+        # Rate limiting: one bucket per endpoint class, sized for every pooled token
+        # search: 30/min (10 without token), core: 5000/hour (60 without token)
+        self.limiter = MultiBucketLimiter(
+            authenticated=bool(self.github_token),
+            tokens=max(self.token_count, 1)
+        )
+
+        # Max search requests / enrichment calls in flight at once during a cycle
+        self.max_concurrent_queries = 4
+        self.max_concurrent_enrichments = 4
 
         # Database for persistence
         self.db_path = "continuous_discovery.db"
         self.init_database()
 
+        # Search progress survives restarts: resume each query slice where it stopped
+        self.frontier = CrawlFrontier(self.db_path)
+        self.planner = QueryPlanner(self.paced_search_page, frontier=self.frontier)
+
+        # Repos already scored at their current pushed_at are skipped
+        self.seen = SeenRepoFilter(self.db_path)
+        self.queued_keys = set()  # Gems waiting for enrichment this cycle
+
+        # Downloaded GH Archive hourly dumps, each ingested once
+        self.archive_dir = os.getenv('GH_ARCHIVE_DIR', '')
+
         # Pattern learning
         self.learner = PatternLearner()
         self.learned_gems = []
@@ -91,6 +126,13 @@ class ContinuousDiscoveryEngine:
             )
         """)
 
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ingested_archives (
+                path TEXT PRIMARY KEY,
+                ingested_at TEXT
+            )
+        """)
+
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_multiplier
             ON discovered_gems(agentdb_multiplier DESC)
@@ -101,40 +143,31 @@ class ContinuousDiscoveryEngine:
 
         print(f"✅ Database initialized: {self.db_path}")
 
-    def check_rate_limit(self) -> bool:
-        """Check if we can make another request"""
-        now = datetime.now()
-
-        # Remove requests older than 1 hour
-        while self.request_history and (now - self.request_history[0]) > timedelta(hours=1):
-            self.request_history.popleft()
+    def announce_wait(self, resource: str):
+        """Say so when the `resource` bucket is about to make us wait a while"""
+        wait_seconds = self.limiter.buckets[resource].wait_time()
 
-        # Check if under limit
-        return len(self.request_history) < self.max_requests_per_hour
-
-    def wait_for_rate_limit(self):
-        """Wait if rate limit reached"""
-        if not self.check_rate_limit():
-            oldest_request = self.request_history[0]
-            wait_until = oldest_request + timedelta(hours=1)
-            wait_seconds = (wait_until - datetime.now()).total_seconds()
-
-            if wait_seconds > 0:
-                print(f"⏸️  Rate limit reached. Waiting {int(wait_seconds)}s (~{int(wait_seconds/60)} minutes)...")
+        if wait_seconds > 30:
+            print(f"⏸️  {resource} budget used up. Waiting ~{int(wait_seconds)}s for refill...")
+            if not self.github_token:
                 print(f"   💡 TIP: Add GITHUB_TOKEN for 5000 req/hour limit!")
 
-                # Sleep in chunks and show progress
-                for i in range(int(wait_seconds)):
-                    if i % 60 == 0:  # Every minute
-                        remaining = int(wait_seconds - i)
-                        print(f"   ⏳ {remaining}s remaining ({remaining//60}min {remaining%60}s)...", flush=True)
-                    time.sleep(1)
-                    if not self.running:
-                        break
+    async def acquire_request_slot(self, resource: str):
+        """Wait until the `resource` bucket ('search' or 'core') has a token"""
+        self.announce_wait(resource)
+        await self.limiter.acquire(resource)
+
+    def paced_search_page(self, query: str, per_page: int = 100, page: int = 1):
+        """
+        The planner's search callback: one search token per real request
 
-    def record_request(self):
-        """Record API request for rate limiting"""
-        self.request_history.append(datetime.now())
+        Runs in the planner's worker thread, so planner steps that send
+        nothing (replayed splits, skipped slices, the final exhausted
+        `next()`) never spend search budget.
+        """
+        self.announce_wait('search')
+        self.limiter.acquire_blocking('search')
+        return self.discovery.search_page(query, per_page, page)
 
     def store_gem(self, gem: Dict[str, Any]):
         """Store discovered gem in database"""
@@ -240,11 +273,39 @@ class ContinuousDiscoveryEngine:
         print(f"🔍 Total Scanned: {self.total_scanned:,}")
         print(f"💎 Gems Found: {self.gems_found}")
         print(f"⚡ Scan Rate: {rate:.1f} repos/hour")
-        print(f"📊 Rate Limit: {len(self.request_history)}/{self.max_requests_per_hour}")
+        for resource, state in self.limiter.status().items():
+            print(f"📊 {resource.capitalize()} bucket: {state['available']}/{state['capacity']} available ({state['used']} used)")
+
+        planner = self.planner.stats
+        print(f"🗺️  Planner: {planner['requests']} search requests, {planner['splits']} date splits, {planner['capped_slices']} capped slices")
+        frontier = self.frontier.summary()
+        print(f"🧭 Frontier: {frontier['slices']} slices ({frontier['exhausted']} exhausted, {frontier['in_progress']} in progress), "
+              f"{planner['resumed']} resumed / {planner['skipped']} skipped this session")
+
+        categorizer = CATEGORIZER.stats()
+        print(f"🏷️  Categorizer cache: {categorizer['hits']} hits / {categorizer['misses']} misses ({categorizer['hit_rate']:.0%})")
+        features = FEATURES.stats()
+        print(f"🧬 Feature store: {features['hits']} hits / {features['misses']} misses ({features['hit_rate']:.0%}), "
+              f"{features['loaded']} loaded / {features['stored']} stored")
+
+        # Per-token usage (one entry unless several tokens are pooled)
+        for fingerprint, state in self.discovery.client.usage().items():
+            budgets = ', '.join(
+                f"{resource} {budget['remaining']}/{budget['limit']}"
+                for resource, budget in sorted(state['budgets'].items())
+            )
+            print(f"🔑 Token {fingerprint}: {state['requests']} requests" + (f" ({budgets})" if budgets else ""))
+
+        # Budget shared with every other process on this machine
+        governor = self.discovery.client.governor
+        if governor is not None:
+            for bucket, state in sorted(governor.status().items()):
+                print(f"🚦 Shared {bucket}: {state['remaining']}/{state['limit']} (resets in {state['resets_in']}s)")
+
         print(f"{'='*70}\n")
 
-    def run_discovery_cycle(self):
-        """Run one discovery cycle"""
+    def sample_queries(self) -> List[tuple]:
+        """Pick this cycle's (query, max_stars) pairs"""
 
         # UPDATED: AgentDB-focused queries - Find repos with SPEED/LATENCY problems!
         # AgentDB is 10-50x FASTER (2-3ms vs 50-100ms) - find repos that need this!
@@ -295,7 +356,6 @@ class ContinuousDiscoveryEngine:
         ]
 
         # Rotate through different queries each cycle to find new repos
-        import random
         queries = random.sample(all_queries, min(8, len(all_queries)))  # Increased to 8
 
         # Add language diversity to find different repos
@@ -305,81 +365,290 @@ class ContinuousDiscoveryEngine:
         if lang_suffix:
             queries = [(f"{q} language:{lang_suffix}", s) for q, s in queries]
 
+        return queries
+
+    def run_discovery_cycle(self):
+        """Run one discovery cycle"""
+        return asyncio.run(self.run_discovery_cycle_async(self.sample_queries()))
+
+    async def run_discovery_cycle_async(self, queries: List[tuple]) -> List[Dict]:
+        """
+        Fan the cycle's queries out concurrently
+
+        Requests are paced by the rate limiter only; each page is scored as
+        soon as it arrives while the remaining queries are still in flight.
+        The query planner walks every result of each query (date-slicing
+        past the 1000-result cap) instead of guessing a page to rotate to.
+        Candidate gems go to an enrichment queue served from the core
+        budget, so core calls fill the gaps while search tokens refill.
+        """
         cycle_gems = []
+        in_flight = asyncio.Semaphore(self.max_concurrent_queries)
+        enrich_queue: asyncio.Queue = asyncio.Queue()
 
-        for query, max_stars in queries:
-            if not self.running:
-                break
+        async def fetch(query: str, max_stars: int):
+            async with in_flight:
+                if not self.running:
+                    return
 
-            print(f"🔍 Searching: {query} (stars < {max_stars})")
+                print(f"🔍 Searching: {query} (stars < {max_stars})")
+                pages = self.planner.pages(f"{query} stars:<{max_stars}")
 
-            # Wait for rate limit
-            self.wait_for_rate_limit()
+                async def next_page():
+                    # The planner takes a search token right before each real request
+                    if not self.running:
+                        return None
+                    return await asyncio.to_thread(next, pages, None)
 
-            # Search with pagination to get different results each time
-            # Use modulo of cycle count to rotate through pages
-            import math
-            page = (self.total_scanned // 1000) % 10  # Rotate through 10 pages
+                pending = asyncio.create_task(next_page())
+                stale = False
 
-            repos = self.discovery._search_repos(
-                f"{query} stars:<{max_stars}",
-                max_results=30,
-                page=page + 1  # Pages start at 1
-            )
-            self.record_request()
-            self.total_scanned += len(repos)
+                while pending is not None:
+                    try:
+                        planned = await pending
+                    except Exception as e:
+                        print(f"  ⚠️  Error: {e}")
+                        break
 
-            if page > 0:
-                print(f"   📄 Page {page + 1} (exploring deeper results)")
+                    if planned is None:
+                        break
 
-            # Score each repo
-            for repo in repos:
-                if not self.running:
-                    break
-
-                repo_data = {
-                    'name': repo.get('name'),
-                    'owner': repo.get('owner', {}).get('login'),
-                    'url': repo.get('html_url'),
-                    'stars': repo.get('stargazers_count', 0),
-                    'forks': repo.get('forks_count', 0),
-                    'description': repo.get('description'),
-                    'language': repo.get('language'),
-                    'topics': repo.get('topics', []),
-                    'created_at': repo.get('created_at'),
-                    'category': self.discovery._categorize(repo),
-                }
-
-                score_data = HiddenGemScorer.score_hidden_gem(repo_data)
-
-                # UPDATED: More selective - focus on quality over quantity
-                # Star filter: 5-100 stars = real projects, not abandoned
-                # Multiplier: >= 15 for higher quality gems
-                stars = repo_data.get('stars', 0)
-                forks = repo_data.get('forks', 0)
-                has_real_traction = stars >= 5 and stars <= 100
-                has_forks = forks > 0  # Someone is using it
-                high_multiplier = score_data['agentdb_multiplier'] >= 15
-
-                if score_data['is_hidden_gem'] and high_multiplier and (has_real_traction or has_forks):
-                    gem = {**repo_data, **score_data}
+                    # Prefetch: the next page downloads while this one is scored.
+                    # After a stale page, the page already in flight is still
+                    # scored (and then recorded) but nothing more is asked for.
+                    pending = asyncio.create_task(next_page()) if self.running and not stale else None
+                    await asyncio.sleep(0)  # Let the fetch reach its worker thread before scoring blocks the loop
+
+                    if planned['split']:
+                        print(f"   ✂️  {planned['total_count']} results > 1000 - splitting by {self.planner.field} date")
+                        continue
+
+                    if planned['pages'] > 1:
+                        print(f"   📄 Page {planned['page']}/{planned['pages']} of {planned['query']}")
+
+                    self.total_scanned += len(planned['items'])
+                    new_repos = self.filter_new(planned['items'])
+
+                    if planned['items'] and not new_repos and not stale:
+                        stale = True
+                        print(f"   ⏭️  Nothing new on page {planned['page']} - moving on (frontier resumes here later)")
+
+                    for gem in self.score_page(new_repos):
+                        enrich_queue.put_nowait(gem)
+
+                    # Only a scored page moves the frontier forward
+                    await asyncio.to_thread(self.planner.complete, planned)
+
+        async def enrich_worker():
+            while True:
+                gem = await enrich_queue.get()
+                try:
+                    if self.running:
+                        await self.acquire_request_slot('core')
+                        gem['last_commit_at'] = await asyncio.to_thread(
+                            self.discovery.fetch_last_commit, gem['owner'], gem['name']
+                        )
                     self.store_gem(gem)
+                    self.seen.mark([{'id': gem['seen_key'], 'pushed_at': gem['pushed_at']}])
                     cycle_gems.append(gem)
 
                     print(f"  💎 FOUND: {gem['name']} ({gem['stars']}⭐) - {gem['agentdb_multiplier']}x multiplier")
+                finally:
+                    enrich_queue.task_done()
+
+        workers = [asyncio.create_task(enrich_worker()) for _ in range(self.max_concurrent_enrichments)]
+        tasks = [asyncio.create_task(fetch(query, max_stars)) for query, max_stars in queries]
+
+        await asyncio.gather(*tasks)
 
-            # Small delay between queries
-            time.sleep(2)
+        # Searches are done - let enrichment drain, then stop the workers
+        await enrich_queue.join()
+        for worker in workers:
+            worker.cancel()
+
+        self.queued_keys.clear()
+        self.seen.save()
+
+        seen_stats = self.seen.take_stats()
+        print(f"♻️  Skipped {seen_stats['skipped']}/{seen_stats['checked']} already-seen repos "
+              f"({seen_stats['skip_ratio']:.0%}) this cycle")
 
         return cycle_gems
 
+    def ingest_archives(self) -> List[Dict]:
+        """
+        Score candidates from GH Archive dumps not ingested yet
+
+        New files in GH_ARCHIVE_DIR are streamed together. Repos created in
+        that window have exact archive star counts; with a token, older
+        repos that gained stars are resolved to real counts (batched
+        GraphQL). Those in the 5-100 star band go through the same seen
+        filter and scoring as search pages. Gems are stored directly: their
+        last push is already known, so no enrichment call.
+        """
+        if not self.archive_dir:
+            return []
+
+        conn = sqlite3.connect(self.db_path)
+        done = {row[0] for row in conn.execute("SELECT path FROM ingested_archives")}
+        conn.close()
+
+        # Skip files modified in the last minute - probably still downloading
+        paths = [
+            path for path in expand_paths([self.archive_dir])
+            if path not in done and time.time() - os.path.getmtime(path) > 60
+        ]
+        if not paths:
+            return []
+
+        print(f"🗄️  Ingesting {len(paths)} GH Archive file(s) from {self.archive_dir}")
+        archive = ArchiveIngest()
+        archive.ingest(paths)
+        candidates = list(archive.candidates())
+        if self.token_count:
+            try:
+                candidates.extend(archive.resolved_candidates(self.discovery.client))
+            except Exception as e:
+                print(f"  ⚠️  Archive resolve error: {e}")
+        else:
+            print("  ⚠️  No GitHub token - only repos created inside the archive window are scored")
+        print(f"   {archive.stats['events']:,} events, {archive.stats['repos']:,} repos, "
+              f"{archive.stats['resolved']:,} resolved, {len(candidates):,} in the star band")
+
+        archive_gems = []
+        for start in range(0, len(candidates), 100):
+            page = candidates[start:start + 100]
+            self.total_scanned += len(page)
+
+            for gem in self.score_page(self.filter_new(page)):
+                gem['last_commit_at'] = gem['pushed_at']
+                self.store_gem(gem)
+                self.seen.mark([{'id': gem['seen_key'], 'pushed_at': gem['pushed_at']}])
+                archive_gems.append(gem)
+                print(f"  💎 FOUND (archive): {gem['name']} ({gem['stars']}⭐) - {gem['agentdb_multiplier']}x multiplier")
+
+        self.queued_keys.clear()
+        self.seen.save()
+
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany(
+            "INSERT OR REPLACE INTO ingested_archives (path, ingested_at) VALUES (?, ?)",
+            [(path, datetime.now().isoformat()) for path in paths]
+        )
+        conn.commit()
+        conn.close()
+
+        return archive_gems
+
+    def rescore_gems(self) -> int:
+        """
+        Recompute every stored gem's scores (after a scoring change)
+
+        All rows are scored in one vectorized batch, so 100k+ gems take
+        seconds. Returns the number of rows updated.
+        """
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("SELECT id, data FROM discovered_gems").fetchall()
+
+        gems = [json.loads(data) for _, data in rows]
+        scores = HiddenGemScorer.score_many(gems)
+
+        updates = []
+        for (row_id, _), gem, score_data in zip(rows, gems, scores):
+            gem.update(score_data)
+            updates.append((
+                gem['hidden_gem_score'],
+                gem['agentdb_multiplier'],
+                gem['base_value'],
+                gem['value_with_agentdb'],
+                json.dumps(gem),
+                row_id
+            ))
+
+        conn.executemany("""
+            UPDATE discovered_gems
+            SET hidden_gem_score = ?, agentdb_multiplier = ?, base_value = ?,
+                value_with_agentdb = ?, data = ?
+            WHERE id = ?
+        """, updates)
+        conn.commit()
+        conn.close()
+
+        return len(updates)
+
+    def filter_new(self, repos: List[Dict]) -> List[Dict]:
+        """Drop repos already handled at their current pushed_at (or queued this cycle)"""
+        unseen = self.seen.filter_unseen(repos)
+        queued = [repo for repo in unseen if seen_key(repo) in self.queued_keys]
+        if queued:
+            # Gems from an earlier page this cycle, still waiting to be stored
+            self.seen.stats['skipped'] += len(queued)
+            unseen = [repo for repo in unseen if seen_key(repo) not in self.queued_keys]
+        return unseen
+
+    def score_page(self, repos: List[Dict]) -> List[Dict]:
+        """
+        Score one page of new search results and return the gem candidates
+
+        Callers pass pages through filter_new() first. Non-gems are marked
+        seen here; gems once they are stored.
+        """
+        page_gems = []
+        handled = []
+
+        repo_datas = [
+            {
+                'name': repo.get('name'),
+                'owner': repo.get('owner', {}).get('login'),
+                'url': repo.get('html_url'),
+                'stars': repo.get('stargazers_count', 0),
+                'forks': repo.get('forks_count', 0),
+                'description': repo.get('description'),
+                'language': repo.get('language'),
+                'topics': repo.get('topics', []),
+                'created_at': repo.get('created_at'),
+                'category': self.discovery._categorize(repo),
+            }
+            for repo in repos
+        ]
+        # Feature records for the whole page in one SQLite round trip
+        FEATURES.features_many(repo_datas)
+
+        for repo, repo_data in zip(repos, repo_datas):
+            if not self.running:
+                break
+
+            score_data = HiddenGemScorer.score_hidden_gem(repo_data)
+
+            # UPDATED: More selective - focus on quality over quantity
+            # Star filter: 5-100 stars = real projects, not abandoned
+            # Multiplier: >= 15 for higher quality gems
+            stars = repo_data.get('stars', 0)
+            forks = repo_data.get('forks', 0)
+            has_real_traction = stars >= 5 and stars <= 100
+            has_forks = forks > 0  # Someone is using it
+            high_multiplier = score_data['agentdb_multiplier'] >= 15
+
+            if score_data['is_hidden_gem'] and high_multiplier and (has_real_traction or has_forks):
+                gem = {**repo_data, **score_data, 'seen_key': seen_key(repo), 'pushed_at': repo.get('pushed_at')}
+                self.queued_keys.add(gem['seen_key'])
+                page_gems.append(gem)
+            else:
+                handled.append(repo)
+
+        self.seen.mark(handled)
+        return page_gems
+
     def run(self):
         """Main continuous loop"""
 
         print("=" * 70)
         print("♾️  CONTINUOUS HIDDEN GEM DISCOVERY")
         print("=" * 70)
-        print(f"GitHub Token: {'✅ Authenticated (5000 req/h)' if self.github_token else '⚠️  No token (60 req/h)'}")
+        if self.token_count > 1:
+            print(f"GitHub Tokens: ✅ {self.token_count} pooled ({self.token_count * 5000} req/h)")
+        else:
+            print(f"GitHub Token: {'✅ Authenticated (5000 req/h)' if self.github_token else '⚠️  No token (60 req/h)'}")
         print(f"Database: {self.db_path}")
         print(f"Press Ctrl+C to stop gracefully")
         print("=" * 70)
@@ -394,8 +663,9 @@ class ContinuousDiscoveryEngine:
                 print(f"🔄 DISCOVERY CYCLE #{cycle_count}")
                 print(f"{'='*70}")
 
-                # Run discovery
-                cycle_gems = self.run_discovery_cycle()
+                # Run discovery (archive dumps first - they cost no API budget)
+                cycle_gems = self.ingest_archives()
+                cycle_gems += self.run_discovery_cycle()
 
                 # Add to learned patterns
                 self.learned_gems.extend(cycle_gems)
@@ -467,12 +737,13 @@ class ContinuousDiscoveryEngine:
 def main():
     """Start continuous discovery"""
 
-    # Get GitHub token
-    github_token = os.getenv('GITHUB_TOKEN')
+    # Get GitHub token(s) - GITHUB_TOKENS=a,b,c pools several accounts
+    github_token = tokens_from_env()
 
     if not github_token:
         print("⚠️  WARNING: No GITHUB_TOKEN found")
         print("   Set with: export GITHUB_TOKEN=your_token_here")
+        print("   (or GITHUB_TOKENS=token1,token2 to pool several)")
         print("   Rate limit: 60 requests/hour without token")
         print("   Rate limit: 5000 requests/hour with token")
         print("   Continuing anyway...")
@@ -480,6 +751,14 @@ def main():
 
     # Start engine
     engine = ContinuousDiscoveryEngine(github_token)
+
+    # --rescore: recompute stored gems' scores with the current weights, then exit
+    if '--rescore' in sys.argv[1:]:
+        started = time.time()
+        count = engine.rescore_gems()
+        print(f"♻️  Rescored {count:,} gems in {time.time() - started:.1f}s")
+        return
+
     engine.run()
 
 
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+🧭 Persisted Search Crawl Frontier
+
+Remembers how far every planned search slice has been crawled, so a
+restarted discovery run picks up where the last one stopped instead of
+refetching page 1 of every query.
+
+One row per (query, language, slice):
+- last_page / pages / total_count: progress through the slice
+- split / split_end: the slice was over the 1000-result cap and was
+  divided into `pages` sub-slices up to split_end (open-ended queries keep
+  growing past it); re-probes reuse these boundaries so child keys stay stable
+- exhausted: every page has been read
+- fetched_at: when the slice was last touched
+
+Finished (exhausted or split) slices are skipped until their refresh is
+due; slices covering recent dates are refreshed sooner than old ones.
+"""
+
+import re
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+# Refresh schedule for finished slices
+RECENT_REFRESH_SECONDS = 24 * 3600        # Slice (or query) reaching into the last RECENT_DAYS
+ARCHIVE_REFRESH_SECONDS = 7 * 24 * 3600   # Slice entirely older than that
+RECENT_DAYS = 90
+
+LANGUAGE_PATTERN = re.compile(r'\s*\blanguage:(\S+)')
+SLICE_PATTERN = re.compile(r'\s*\b((?:created|pushed):(\S+?)\.\.(\S+))')
+
+
+def frontier_key(query: str) -> Tuple[str, str, str]:
+    """Split a planned search query into (query, language, slice)"""
+    language = ''
+    slice_spec = ''
+
+    match = LANGUAGE_PATTERN.search(query)
+    if match:
+        language = match.group(1)
+        query = query[:match.start()] + query[match.end():]
+
+    match = SLICE_PATTERN.search(query)
+    if match:
+        slice_spec = match.group(1)
+        query = query[:match.start()] + query[match.end():]
+
+    return ' '.join(query.split()), language, slice_spec
+
+
+def refresh_interval(slice_spec: str) -> int:
+    """Seconds before a finished slice is due to be crawled again"""
+    match = SLICE_PATTERN.search(slice_spec)
+    if not match:
+        return RECENT_REFRESH_SECONDS  # Unsliced queries always include new repos
+
+    try:
+        end = date.fromisoformat(match.group(3))
+    except ValueError:
+        return RECENT_REFRESH_SECONDS
+
+    if end < date.today() - timedelta(days=RECENT_DAYS):
+        return ARCHIVE_REFRESH_SECONDS
+    return RECENT_REFRESH_SECONDS
+
+
+class CrawlFrontier:
+    """SQLite-backed progress table for planned search slices"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.init_database()
+
+    def connect(self) -> sqlite3.Connection:
+        # One connection per call: the planner runs in worker threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def init_database(self):
+        conn = self.connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_frontier (
+                query TEXT NOT NULL,
+                language TEXT NOT NULL,
+                slice TEXT NOT NULL,
+                last_page INTEGER,
+                pages INTEGER,
+                total_count INTEGER,
+                split INTEGER DEFAULT 0,
+                split_end TEXT,
+                exhausted INTEGER DEFAULT 0,
+                fetched_at REAL,
+                PRIMARY KEY (query, language, slice)
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Progress for a planned query, or None if it was never crawled
+
+        `due` is set once the row's refresh interval has passed.
+        """
+        key = frontier_key(query)
+
+        conn = self.connect()
+        row = conn.execute("""
+            SELECT last_page, pages, total_count, split, split_end, exhausted, fetched_at
+            FROM crawl_frontier WHERE query = ? AND language = ? AND slice = ?
+        """, key).fetchone()
+        conn.close()
+
+        if not row:
+            return None
+
+        last_page, pages, total_count, split, split_end, exhausted, fetched_at = row
+
+        return {
+            'last_page': last_page,
+            'pages': pages,
+            'total_count': total_count,
+            'split': bool(split),
+            'split_end': date.fromisoformat(split_end) if split_end else None,
+            'exhausted': bool(exhausted),
+            'due': time.time() - fetched_at >= refresh_interval(key[2]),
+        }
+
+    def record(
+        self,
+        query: str,
+        page: int,
+        pages: int,
+        total_count: int,
+        split: bool = False,
+        exhausted: bool = False,
+        split_end: Optional[date] = None
+    ):
+        """Store progress after a page of `query` was fetched"""
+        conn = self.connect()
+        conn.execute("""
+            INSERT OR REPLACE INTO crawl_frontier
+            (query, language, slice, last_page, pages, total_count, split, split_end,
+             exhausted, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            *frontier_key(query), page, pages, total_count, int(split),
+            split_end.isoformat() if split_end else None, int(exhausted), time.time()
+        ))
+        conn.commit()
+        conn.close()
+
+    def summary(self) -> Dict[str, int]:
+        """Slice counts by state"""
+        conn = self.connect()
+        row = conn.execute("""
+            SELECT COUNT(*), SUM(exhausted), SUM(split) FROM crawl_frontier
+        """).fetchone()
+        conn.close()
+
+        total, exhausted, split = (value or 0 for value in row)
+        return {
+            'slices': total,
+            'exhausted': exhausted,
+            'split': split,
+            'in_progress': total - exhausted - split,
+        }
@@ -9,13 +9,16 @@ on live data for immediate pattern learning.
 import json
 import os
 import sys
-import time
 import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import requests
 
+from github_client import get_client
+from page_prefetch import PagePrefetcher, numbered_pages
+from repo_categorizer import categorize
+
 # Import our training module
 from train_simple_vector_db import SimpleVectorDB, generate_embedding
 
@@ -24,18 +27,17 @@ class LiveGitHubDiscovery:
 
     def __init__(self, github_token: Optional[str] = None):
         self.token = github_token or os.getenv('GITHUB_TOKEN')
-        self.base_url = 'https://api.github.com'
-        self.headers = {}
+        self.client = get_client(self.token)
+
+        # Search pages kept downloading while the current one is processed
+        self.prefetch_depth = int(os.getenv('GITHUB_PREFETCH_DEPTH', '2'))
 
         if self.token:
-            self.headers['Authorization'] = f'token {self.token}'
             print(f"✅ Using GitHub token (authenticated - 5000 req/hour)")
         else:
             print(f"⚠️  No GitHub token (60 req/hour limit)")
             print(f"   Set GITHUB_TOKEN env var for higher limits")
 
-        self.headers['Accept'] = 'application/vnd.github.v3+json'
-
     def search_repositories(
         self,
         query: str,
@@ -51,7 +53,6 @@ class LiveGitHubDiscovery:
         # Build search query
         search_query = f"{query} stars:>={min_stars}"
 
-        url = f"{self.base_url}/search/repositories"
         params = {
             'q': search_query,
             'sort': sort,
@@ -60,40 +61,44 @@ class LiveGitHubDiscovery:
         }
 
         repos = []
-        page = 1
+        seen_ids = set()
         max_pages = (max_results // 100) + 1
 
-        while len(repos) < max_results and page <= max_pages:
-            params['page'] = page
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
+            response = self.client.get('/search/repositories', params={**params, 'page': page})
 
-            try:
-                response = requests.get(url, headers=self.headers, params=params)
+            # Check rate limit (cached responses carry no rate-limit headers)
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            if remaining is not None and int(remaining) < 10:
+                print(f"⚠️  Rate limit low: {remaining} requests remaining")
 
-                # Check rate limit
-                remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-                if remaining < 10:
-                    print(f"⚠️  Rate limit low: {remaining} requests remaining")
+            response.raise_for_status()
+            return response.json().get('items', [])
 
-                response.raise_for_status()
-                data = response.json()
+        def has_new(items: List[Dict[str, Any]]) -> bool:
+            # Result sets shift while paging; stop once a page adds nothing
+            return any(item.get('id') not in seen_ids for item in items)
 
-                items = data.get('items', [])
-                if not items:
-                    break
+        # Pacing is handled by the shared rate governor; the next page
+        # downloads while this one is collected
+        pages = PagePrefetcher(numbered_pages(fetch_page, last=max_pages), depth=self.prefetch_depth, is_new=has_new)
 
-                repos.extend(items)
-                print(f"   Fetched page {page}: {len(items)} repos (total: {len(repos)})")
+        try:
+            with pages:
+                for page, items in enumerate(pages, 1):
+                    new_items = [item for item in items if item.get('id') not in seen_ids]
+                    seen_ids.update(item.get('id') for item in new_items)
+                    repos.extend(new_items)
+                    print(f"   Fetched page {page}: {len(items)} repos (total: {len(repos)})")
 
-                page += 1
-                time.sleep(1.2)  # Rate limiting
+                    if len(repos) >= max_results:
+                        break
 
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 403:
-                    print(f"❌ Rate limit exceeded. Wait or add GitHub token.")
-                    break
-                else:
-                    print(f"❌ Error: {e}")
-                    break
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 403:
+                print(f"❌ Rate limit exceeded. Wait or add GitHub token.")
+            else:
+                print(f"❌ Error: {e}")
 
         print(f"✅ Found {len(repos)} repositories")
         return repos[:max_results]
@@ -191,31 +196,7 @@ class LiveGitHubDiscovery:
 
     def categorize_repo(self, repo: Dict[str, Any]) -> str:
         """Categorize repository based on content"""
-
-        desc = (repo.get('description') or '').lower()
-        topics = [t.lower() for t in repo.get('topics', [])]
-        language = (repo.get('language') or '').lower()
-        text = f"{desc} {' '.join(topics)}"
-
-        # Category detection
-        if any(kw in text for kw in ['security', 'pentest', 'vulnerability', 'exploit']):
-            return 'Security Tools'
-        elif any(kw in text for kw in ['ai', 'ml', 'machine learning', 'neural', 'llm', 'gpt']):
-            return 'AI/ML Tools'
-        elif any(kw in text for kw in ['devops', 'deployment', 'ci/cd', 'kubernetes', 'docker']):
-            return 'DevOps Tools'
-        elif any(kw in text for kw in ['api', 'framework', 'library', 'sdk']):
-            return 'Developer Framework'
-        elif any(kw in text for kw in ['dashboard', 'analytics', 'monitoring', 'observability']):
-            return 'Analytics Platform'
-        elif any(kw in text for kw in ['database', 'storage', 'sql', 'nosql']):
-            return 'Database Technology'
-        elif any(kw in text for kw in ['web', 'frontend', 'react', 'vue', 'angular']):
-            return 'Web Development'
-        elif any(kw in text for kw in ['education', 'tutorial', 'learning', 'course']):
-            return 'Education Platform'
-        else:
-            return 'General Software'
+        return categorize(repo, 'live')
 
     def suggest_strategies(self, category: str) -> List[str]:
         """Suggest monetization strategies based on category"""
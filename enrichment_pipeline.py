@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+🪜 Tiered Enrichment Pipeline
+
+Runs repos through increasingly expensive stages and only passes survivors
+on, so per-repo API calls are spent on repos that can still make the cut:
+
+- Tier 0: free filters on search/list payload fields (stars, fork,
+  archived, pushed_at, ...)
+- Tier 1: cheap in-process scorers; a scorer returns None to drop the repo
+- Tier 2: expensive enrichment (commits, README, license, ...) on a
+  bounded thread pool, optionally only for the top-ranked tier 1 results
+
+Each tier's pass rate is recorded, and tier 0 counts drops per filter.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Repo = Dict[str, Any]
+Filter = Tuple[str, Callable[[Repo], bool]]
+
+TIERS = ('tier0', 'tier1', 'tier2')
+
+
+# Tier 0 filters: (name, predicate) pairs on payload fields only
+
+def min_stars(count: int) -> Filter:
+    return (f'stars>={count}', lambda repo: repo.get('stargazers_count', 0) >= count)
+
+
+def not_fork() -> Filter:
+    return ('not_fork', lambda repo: not repo.get('fork', False))
+
+
+def not_archived() -> Filter:
+    return ('not_archived', lambda repo: not repo.get('archived', False))
+
+
+def pushed_within(days: int) -> Filter:
+    def recent(repo: Repo) -> bool:
+        pushed_at = repo.get('pushed_at')
+        if not pushed_at:
+            return False
+        try:
+            pushed = datetime.fromisoformat(pushed_at.replace('Z', '+00:00'))
+        except ValueError:
+            return False
+        return (datetime.now(pushed.tzinfo) - pushed).days < days
+
+    return (f'pushed<{days}d', recent)
+
+
+class EnrichmentPipeline:
+    """Tier 0 filters -> tier 1 scorer -> bounded tier 2 enrichment"""
+
+    def __init__(
+        self,
+        filters: Sequence[Filter],
+        score: Callable[[Repo], Optional[Dict[str, Any]]],
+        enrich: Optional[Callable[[Repo, Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+        max_workers: int = 4,
+        rank_key: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ):
+        self.filters = list(filters)
+        self.score = score
+        self.enrich = enrich
+        self.max_workers = max(1, max_workers)
+        self.rank_key = rank_key
+        self.stats = {tier: {'in': 0, 'out': 0} for tier in TIERS}
+        self.filter_drops = {name: 0 for name, _ in self.filters}
+
+    def passes_filters(self, repo: Repo) -> bool:
+        for name, predicate in self.filters:
+            if not predicate(repo):
+                self.filter_drops[name] += 1
+                return False
+        return True
+
+    def record(self, tier: str, passed_in: int, passed_out: int):
+        self.stats[tier]['in'] += passed_in
+        self.stats[tier]['out'] += passed_out
+
+    def run(self, repos: Iterable[Repo], top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Push one batch through every tier and return the enriched results
+
+        With `top_n` (and a rank_key), only the best tier 1 results are
+        enriched - the rest could no longer make the cut. Results come back
+        sorted by rank_key when one is set.
+        """
+        repos = list(repos)
+
+        # Tier 0: free payload filters
+        candidates = [repo for repo in repos if self.passes_filters(repo)]
+        self.record('tier0', len(repos), len(candidates))
+
+        # Tier 1: cheap scorers
+        scored = []
+        for repo in candidates:
+            result = self.score(repo)
+            if result is not None:
+                scored.append((repo, result))
+        self.record('tier1', len(candidates), len(scored))
+
+        if self.rank_key is not None:
+            scored.sort(key=lambda pair: self.rank_key(pair[1]), reverse=True)
+        if top_n is not None:
+            scored = scored[:top_n]
+
+        if self.enrich is None:
+            return [result for _, result in scored]
+
+        # Tier 2: expensive enrichment, max_workers calls in flight
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='enrich') as executor:
+            enriched = list(executor.map(lambda pair: self.enrich(*pair), scored))
+        results = [result for result in enriched if result is not None]
+        self.record('tier2', len(scored), len(results))
+
+        if self.rank_key is not None:
+            results.sort(key=self.rank_key, reverse=True)
+        return results
+
+    def pass_rates(self) -> Dict[str, float]:
+        """Fraction of each tier's input that passed it"""
+        return {
+            tier: counts['out'] / counts['in'] if counts['in'] else 0.0
+            for tier, counts in self.stats.items()
+        }
+
+    def print_stats(self):
+        rates = self.pass_rates()
+        for tier in TIERS:
+            counts = self.stats[tier]
+            print(f"  {tier}: {counts['out']}/{counts['in']} passed ({rates[tier]:.0%})")
+
+        drops = ', '.join(f"{name} {count}" for name, count in self.filter_drops.items() if count)
+        if drops:
+            print(f"  tier0 drops: {drops}")
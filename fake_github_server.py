@@ -0,0 +1,679 @@
+#!/usr/bin/env python3
+"""
+🧪 Local GitHub API Stand-In
+
+A fake of the GitHub endpoints this repo uses, backed by a deterministic
+synthetic corpus, for load, scaling and failure testing without spending
+real rate limit:
+
+- GET  /search/repositories        (terms, stars:, forks:, language:,
+                                    created:, pushed:, sort, paging, 1000 cap)
+- GET  /users/{login}, /users/{login}/repos
+- GET  /repos/{owner}/{name}/stargazers, /repos/{owner}/{name}/commits
+- POST /graphql                    (repository search and stargazer queries)
+
+The corpus scales to millions of repos (heavy-tailed stars, forks that
+track stars, Zipf-weighted words and topics, recent-skewed dates). Rate
+limits are enforced per token and resource with real X-RateLimit-* headers
+and 403s; ETags answer If-None-Match with a free 304. Latency, 5xx errors
+and secondary rate limits can be injected.
+
+Usage:
+    python fake_github_server.py --repos 1000000 --rate-scale 100
+    GITHUB_API_URL=http://127.0.0.1:8765 GITHUB_RATE_LIMIT_SCALE=100 \\
+        GITHUB_TOKEN=fake python continuous_discovery.py
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from array import array
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import accumulate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from rate_governor import DEFAULT_LIMITS
+
+SEARCH_RESULT_CAP = 1000
+EPOCH = date(2008, 1, 1)
+
+# Words the discovery queries look for, then general filler
+VOCABULARY = [
+    'ai', 'agent', 'memory', 'vector', 'search', 'embeddings', 'embedding', 'database',
+    'performance', 'latency', 'slow', 'fast', 'optimize', 'chatbot', 'chat', 'context',
+    'persistent', 'retrieval', 'retention', 'real-time', 'realtime', 'rag', 'semantic',
+    'speed', 'document', 'pinecone', 'alternative', 'weaviate', 'qdrant', 'chromadb',
+    'redis', 'sqlite', 'code', 'assistant', 'customer', 'support', 'conversational',
+    'recommendation', 'engine', 'collaborative', 'editor', 'websocket', 'multiplayer',
+    'dashboard', 'analytics', 'monitoring', 'state', 'management', 'live', 'streaming',
+    'llm', 'gpt', 'ml', 'machine', 'learning', 'model', 'inference', 'training',
+    'tool', 'library', 'framework', 'api', 'cli', 'web', 'app', 'server', 'client',
+    'simple', 'lightweight', 'open', 'source', 'data', 'pipeline', 'kubernetes',
+    'devops', 'security', 'plugin', 'sdk', 'automation', 'bot', 'game', 'mobile',
+    'react', 'vue', 'graph', 'storage', 'cache', 'queue', 'event', 'team', 'message',
+    'conversation', 'workflow', 'saas', 'self-hosted', 'enterprise', 'notes',
+]
+
+TOPICS = [
+    'ai', 'llm', 'rag', 'vector-database', 'embeddings', 'chatbot', 'agents', 'python',
+    'typescript', 'javascript', 'rust', 'go', 'websocket', 'realtime', 'analytics',
+    'dashboard', 'machine-learning', 'nlp', 'openai', 'langchain', 'sqlite', 'redis',
+    'collaboration', 'devtools', 'cli', 'react', 'self-hosted', 'api', 'database', 'search',
+]
+
+LANGUAGES = [
+    ('Python', 28), ('TypeScript', 18), ('JavaScript', 17), ('Go', 8), ('Rust', 6),
+    ('Java', 7), ('C++', 5), ('Ruby', 3), ('PHP', 3), ('Shell', 3), (None, 2),
+]
+
+LICENSES = [
+    ('MIT', 'MIT License', 45), ('Apache-2.0', 'Apache License 2.0', 20),
+    ('GPL-3.0', 'GNU General Public License v3.0', 8), ('BSD-3-Clause', 'BSD 3-Clause License', 4),
+    (None, None, 23),
+]
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+QUALIFIER_PATTERN = re.compile(r'(\w+):(\S+)')
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def zipf_weights(count: int, exponent: float = 0.9) -> List[float]:
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def day_to_iso(day: int) -> str:
+    return (EPOCH + timedelta(days=day)).isoformat() + 'T12:00:00Z'
+
+
+def stable_hash(text: str) -> int:
+    return zlib.crc32(text.encode('utf-8'))
+
+
+class SyntheticCorpus:
+    """Compact, deterministic repo + user corpus (a few bytes per repo)"""
+
+    def __init__(self, repo_count: int, seed: int = 42):
+        self.repo_count = repo_count
+        self.user_count = max(1000, repo_count // 5)
+        self.today = (date.today() - EPOCH).days
+        rng = random.Random(seed)
+
+        self.stars = array('I')
+        self.forks = array('I')
+        self.created = array('H')     # Days since EPOCH
+        self.pushed = array('H')
+        self.language = array('B')
+        self.license = array('B')
+        self.words = array('B')       # Description word ids, sliced by word_offsets
+        self.word_offsets = array('I', [0])
+        self.topics = array('B')
+        self.topic_offsets = array('I', [0])
+        self.postings: Dict[str, array] = {}
+
+        word_ids = list(range(len(VOCABULARY)))
+        word_weights = zipf_weights(len(VOCABULARY))
+        rng.shuffle(word_weights)
+        word_cum = list(accumulate(word_weights))
+        topic_ids = list(range(len(TOPICS)))
+        topic_cum = list(accumulate(zipf_weights(len(TOPICS))))
+        language_ids = list(range(len(LANGUAGES)))
+        language_cum = list(accumulate(w for _, w in LANGUAGES))
+        license_ids = list(range(len(LICENSES)))
+        license_cum = list(accumulate(w for _, _, w in LICENSES))
+
+        # Index terms per word / topic id, tokenized once
+        word_terms = [tokenize(word) for word in VOCABULARY]
+        topic_terms = [tokenize(topic) for topic in TOPICS]
+        choices = rng.choices
+
+        for repo_id in range(repo_count):
+            # Heavy tail: most repos have a handful of stars, a few have thousands
+            stars = int(rng.paretovariate(1.1)) - 1
+            self.stars.append(min(stars, 400000))
+            self.forks.append(int(stars * rng.random() * 0.3))
+
+            created = int(self.today * (rng.random() ** 0.5))  # Skewed recent
+            self.created.append(created)
+            self.pushed.append(created + int((self.today - created) * (rng.random() ** 0.3)))
+
+            self.language.append(choices(language_ids, cum_weights=language_cum)[0])
+            self.license.append(choices(license_ids, cum_weights=license_cum)[0])
+
+            words = choices(word_ids, cum_weights=word_cum, k=rng.randint(4, 10))
+            topics = sorted(set(choices(topic_ids, cum_weights=topic_cum, k=rng.randint(0, 5))))
+            self.words.extend(words)
+            self.word_offsets.append(len(self.words))
+            self.topics.extend(topics)
+            self.topic_offsets.append(len(self.topics))
+
+            terms = set()
+            for word in words:
+                terms.update(word_terms[word])
+            for topic in topics:
+                terms.update(topic_terms[topic])
+            for term in terms:
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = array('I')
+                postings.append(repo_id)
+
+    # Repos
+
+    def owner_of(self, repo_id: int) -> str:
+        return f"user{repo_id % self.user_count}"
+
+    def name_of(self, repo_id: int) -> str:
+        words = self.words[self.word_offsets[repo_id]:self.word_offsets[repo_id] + 2]
+        return '-'.join(VOCABULARY[w] for w in words) + f"-{repo_id}"
+
+    def resolve(self, owner: str, name: str) -> int:
+        """Repo id from owner/name; unknown names map onto a stable repo"""
+        match = re.search(r'-(\d+)$', name)
+        if match and int(match.group(1)) < self.repo_count:
+            return int(match.group(1))
+        return stable_hash(f"{owner}/{name}") % self.repo_count
+
+    def star_count(self, owner: str, name: str) -> int:
+        repo_id = self.resolve(owner, name)
+        if not re.search(r'-\d+$', name):
+            return max(self.stars[repo_id], 20000)  # Named real repos (e.g. DB-GPT) are popular
+        return self.stars[repo_id]
+
+    def repo(self, repo_id: int) -> Dict[str, Any]:
+        """REST search item / repo payload"""
+        owner = self.owner_of(repo_id)
+        name = self.name_of(repo_id)
+        words = self.words[self.word_offsets[repo_id]:self.word_offsets[repo_id + 1]]
+        topics = self.topics[self.topic_offsets[repo_id]:self.topic_offsets[repo_id + 1]]
+        spdx, license_name, _ = LICENSES[self.license[repo_id]]
+
+        return {
+            'id': repo_id + 1,
+            'name': name,
+            'full_name': f"{owner}/{name}",
+            'owner': {'login': owner, 'type': 'User'},
+            'html_url': f"https://github.com/{owner}/{name}",
+            'description': ' '.join(VOCABULARY[w] for w in words).capitalize(),
+            'stargazers_count': self.stars[repo_id],
+            'watchers_count': self.stars[repo_id],
+            'forks_count': self.forks[repo_id],
+            'open_issues_count': self.forks[repo_id] // 3,
+            'language': LANGUAGES[self.language[repo_id]][0],
+            'topics': [TOPICS[t] for t in topics],
+            'created_at': day_to_iso(self.created[repo_id]),
+            'updated_at': day_to_iso(self.pushed[repo_id]),
+            'pushed_at': day_to_iso(self.pushed[repo_id]),
+            'license': {'key': spdx.lower(), 'spdx_id': spdx, 'name': license_name} if spdx else None,
+            'archived': False,
+            'fork': False,
+        }
+
+    def graphql_repo(self, repo_id: int) -> Dict[str, Any]:
+        """Repository node with the fields of github_graphql.REPOSITORY_FIELDS"""
+        item = self.repo(repo_id)
+        return {
+            'databaseId': item['id'],
+            'name': item['name'],
+            'nameWithOwner': item['full_name'],
+            'url': item['html_url'],
+            'description': item['description'],
+            'owner': {'login': item['owner']['login']},
+            'stargazerCount': item['stargazers_count'],
+            'forkCount': item['forks_count'],
+            'primaryLanguage': {'name': item['language']} if item['language'] else None,
+            'repositoryTopics': {'nodes': [{'topic': {'name': t}} for t in item['topics']]},
+            'createdAt': item['created_at'],
+            'pushedAt': item['pushed_at'],
+            'licenseInfo': {'spdxId': item['license']['spdx_id'], 'name': item['license']['name']}
+            if item['license'] else None,
+            'isArchived': False,
+            'isFork': False,
+        }
+
+    # Search
+
+    @staticmethod
+    def parse_range(value: str) -> Tuple[float, float]:
+        """GitHub numeric/date qualifier (<N, >=N, A..B, N) as an inclusive range"""
+        def parse(v: str) -> float:
+            return float((date.fromisoformat(v[:10]) - EPOCH).days) if '-' in v else float(v)
+
+        if '..' in value:
+            lo, hi = value.split('..', 1)
+            return (parse(lo) if lo != '*' else float('-inf')), (parse(hi) if hi != '*' else float('inf'))
+        for op, (lo_off, hi_off) in (('>=', (0, None)), ('<=', (None, 0)), ('>', (1, None)), ('<', (None, -1))):
+            if value.startswith(op):
+                bound = parse(value[len(op):])
+                if hi_off is None:
+                    return bound + lo_off, float('inf')
+                return float('-inf'), bound + hi_off
+        return parse(value), parse(value)
+
+    @lru_cache(maxsize=256)
+    def search(self, q: str, sort: str = '', order: str = 'desc') -> Tuple[int, ...]:
+        """Ids matching a search query, in result order (all of them, uncapped)"""
+        terms = []
+        filters = []
+        for token in q.split():
+            match = QUALIFIER_PATTERN.fullmatch(token)
+            if match and match.group(1) in ('stars', 'forks', 'created', 'pushed', 'language', 'sort'):
+                key, value = match.groups()
+                if key == 'sort':  # GraphQL-style sort qualifier
+                    sort, _, direction = value.partition('-')
+                    order = direction or 'desc'
+                else:
+                    filters.append((key, value))
+            else:
+                terms.extend(tokenize(token))
+
+        if terms:
+            postings = sorted((self.postings.get(term, array('I')) for term in set(terms)), key=len)
+            candidates = set(postings[0])
+            for other in postings[1:]:
+                candidates.intersection_update(other)
+            ids = sorted(candidates)
+        else:
+            ids = range(self.repo_count)
+
+        for key, value in filters:
+            if key == 'language':
+                names = [i for i, (name, _) in enumerate(LANGUAGES) if (name or '').lower() == value.lower()]
+                ids = [i for i in ids if self.language[i] in names]
+                continue
+
+            column = {'stars': self.stars, 'forks': self.forks, 'created': self.created, 'pushed': self.pushed}[key]
+            lo, hi = self.parse_range(value)
+            ids = [i for i in ids if lo <= column[i] <= hi]
+
+        ids = list(ids)
+        if sort in ('stars', 'forks', 'updated'):
+            column = {'stars': self.stars, 'forks': self.forks, 'updated': self.pushed}[sort]
+            ids.sort(key=lambda i: column[i], reverse=(order != 'asc'))
+
+        return tuple(ids)
+
+    # Users
+
+    def user_index(self, login: str) -> int:
+        match = re.fullmatch(r'user(\d+)', login)
+        if match and int(match.group(1)) < self.user_count:
+            return int(match.group(1))
+        return stable_hash(login) % self.user_count
+
+    def user_repo_ids(self, login: str) -> range:
+        return range(self.user_index(login), self.repo_count, self.user_count)
+
+    def user(self, login: str) -> Dict[str, Any]:
+        index = self.user_index(login)
+        rng = random.Random(index)
+        created = int(self.today * rng.random())
+        return {
+            'login': login,
+            'id': index + 1,
+            'html_url': f"https://github.com/{login}",
+            'avatar_url': f"https://avatars.githubusercontent.com/u/{index + 1}",
+            'name': f"User {index}",
+            'company': rng.choice([None, None, 'Acme', 'Initech', 'Globex']),
+            'blog': rng.choice(['', '', f"https://{login}.dev"]),
+            'location': rng.choice([None, 'Berlin', 'San Francisco', 'Bangalore', 'Remote']),
+            'bio': rng.choice([None, 'Building things', 'AI engineer', 'Open source maintainer']),
+            'twitter_username': None,
+            'hireable': rng.choice([None, True]),
+            'public_repos': len(self.user_repo_ids(login)),
+            'public_gists': int(rng.paretovariate(2)) - 1,
+            'followers': int(rng.paretovariate(1.2)) - 1,
+            'following': int(rng.paretovariate(1.5)) - 1,
+            'created_at': day_to_iso(created),
+            'updated_at': day_to_iso(created + int((self.today - created) * rng.random())),
+        }
+
+    def graphql_user(self, login: str) -> Dict[str, Any]:
+        user = self.user(login)
+        return {
+            'login': login,
+            'name': user['name'],
+            'url': user['html_url'],
+            'avatarUrl': user['avatar_url'],
+            'repositories': {'totalCount': user['public_repos']},
+            'followers': {'totalCount': user['followers']},
+            'following': {'totalCount': user['following']},
+            'gists': {'totalCount': user['public_gists']},
+            'createdAt': user['created_at'],
+            'updatedAt': user['updated_at'],
+            'bio': user['bio'],
+            'location': user['location'],
+            'company': user['company'],
+            'websiteUrl': user['blog'] or None,
+            'twitterUsername': None,
+            'isHireable': bool(user['hireable']),
+        }
+
+    def stargazer_login(self, repo_id: int, index: int) -> str:
+        return f"user{stable_hash(f'{repo_id}:{index}') % self.user_count}"
+
+
+class RateLimiter:
+    """Per (token, resource) fixed windows, like GitHub's primary limits"""
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+        self.windows: Dict[Tuple[str, str], List[float]] = {}
+        self.lock = threading.Lock()
+
+    def take(self, token: str, resource: str, charge: bool = True) -> Dict[str, str]:
+        """
+        Count one request; returns the headers (Remaining -1 means refused)
+
+        With `charge` False nothing is counted (a 304 reports the window as is).
+        """
+        auth_limit, anon_limit, window = DEFAULT_LIMITS[resource]
+        limit = max(1, int((auth_limit if token else anon_limit) * self.scale))
+        now = time.time()
+
+        with self.lock:
+            used, reset_at = self.windows.get((token, resource), (0, 0))
+            if now >= reset_at:
+                used, reset_at = 0, now + window
+
+            allowed = used < limit or not charge
+            if allowed and charge:
+                used += 1
+            self.windows[(token, resource)] = (used, reset_at)
+
+        return {
+            'X-RateLimit-Limit': str(limit),
+            'X-RateLimit-Remaining': str(max(limit - used, 0)) if allowed else '-1',
+            'X-RateLimit-Used': str(used),
+            'X-RateLimit-Reset': str(int(reset_at)),
+            'X-RateLimit-Resource': resource,
+        }
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: 'FakeGitHubServer'
+
+    # (token, resource) admitted for the current request, charged by send_json
+    pending: Optional[Tuple[str, str]] = None
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # Plumbing
+
+    def send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+        pending, self.pending = self.pending, None
+        not_modified = status == 200 and self.headers.get('If-None-Match') == etag
+        if pending is not None:
+            # Conditional hits are free, like on GitHub: check the ETag before charging
+            rate = self.server.limiter.take(*pending, charge=not not_modified)
+            if rate['X-RateLimit-Remaining'] == '-1':
+                rate['X-RateLimit-Remaining'] = '0'
+                self.send_json(403, {'message': 'API rate limit exceeded.'}, rate)
+                return
+            headers = {**rate, **(headers or {})}
+            with self.server.stats_lock:
+                self.server.stats[pending[1]] += 1
+
+        if not_modified:
+            status, body = 304, b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if status in (200, 304):
+            self.send_header('ETag', etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def admit(self, resource: str) -> Optional[Dict[str, str]]:
+        """
+        Apply latency and injected faults; None if already answered
+
+        The rate limit is charged when the response is sent, so a request
+        answered with a 304 costs nothing.
+        """
+        config = self.server
+        if config.latency:
+            time.sleep(config.latency)
+
+        if config.error_rate and random.random() < config.error_rate:
+            self.send_json(502, {'message': 'Server Error'})
+            return None
+
+        token = (self.headers.get('Authorization') or '').split(' ')[-1]
+
+        if config.secondary_rate and random.random() < config.secondary_rate:
+            self.send_json(403, {'message': 'You have exceeded a secondary rate limit.'}, {'Retry-After': '1'})
+            return None
+
+        self.pending = (token, resource)
+        return {}
+
+    def page_params(self, query: Dict[str, List[str]]) -> Tuple[int, int]:
+        per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+        page = max(int(query.get('page', ['1'])[0]), 1)
+        return per_page, page
+
+    # REST
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip('/')
+        query = parse_qs(parts.query)
+        corpus = self.server.corpus
+
+        if path == '/search/repositories':
+            headers = self.admit('search')
+            if headers is None:
+                return
+            per_page, page = self.page_params(query)
+            ids = corpus.search(query.get('q', [''])[0], query.get('sort', [''])[0], query.get('order', ['desc'])[0])
+            start = (page - 1) * per_page
+            if start >= SEARCH_RESULT_CAP:
+                self.send_json(422, {'message': 'Only the first 1000 search results are available'}, headers)
+                return
+            window = ids[start:min(start + per_page, SEARCH_RESULT_CAP)]
+            self.send_json(200, {
+                'total_count': len(ids),
+                'incomplete_results': False,
+                'items': [corpus.repo(i) for i in window],
+            }, headers)
+            return
+
+        match = re.fullmatch(r'/users/([^/]+)(/repos)?', path)
+        if match:
+            headers = self.admit('core')
+            if headers is None:
+                return
+            login, repos = match.groups()
+            if not repos:
+                self.send_json(200, corpus.user(login), headers)
+                return
+            per_page, page = self.page_params(query)
+            ids = corpus.user_repo_ids(login)[(page - 1) * per_page:page * per_page]
+            self.send_json(200, [corpus.repo(i) for i in ids], headers)
+            return
+
+        match = re.fullmatch(r'/repos/([^/]+)/([^/]+)/(stargazers|commits)', path)
+        if match:
+            headers = self.admit('core')
+            if headers is None:
+                return
+            owner, name, kind = match.groups()
+            repo_id = corpus.resolve(owner, name)
+            per_page, page = self.page_params(query)
+
+            if kind == 'stargazers':
+                total = corpus.star_count(owner, name)
+                start = (page - 1) * per_page
+                logins = [corpus.stargazer_login(repo_id, i) for i in range(start, min(start + per_page, total))]
+                self.send_json(200, [{'login': login, 'type': 'User'} for login in logins], headers)
+            else:
+                pushed = corpus.pushed[repo_id]
+                commits = [{
+                    'sha': hashlib.sha1(f"{repo_id}:{i}".encode()).hexdigest(),
+                    'commit': {
+                        'message': f"Commit {i}",
+                        'author': {'date': day_to_iso(max(pushed - i, corpus.created[repo_id]))},
+                        'committer': {'date': day_to_iso(max(pushed - i, corpus.created[repo_id]))},
+                    },
+                } for i in range((page - 1) * per_page, page * per_page)]
+                self.send_json(200, commits, headers)
+            return
+
+        if path == '/rate_limit':
+            self.send_json(200, {'resources': {}})
+            return
+
+        self.send_json(404, {'message': 'Not Found'})
+
+    # GraphQL
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip('/') != '/graphql':
+            self.send_json(404, {'message': 'Not Found'})
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+        if not self.headers.get('Authorization'):
+            self.send_json(401, {'message': 'This endpoint requires you to be authenticated.'})
+            return
+
+        headers = self.admit('graphql')
+        if headers is None:
+            return
+
+        query = request.get('query', '')
+        variables = request.get('variables') or {}
+        corpus = self.server.corpus
+
+        def cursor_offset(cursor: Optional[str]) -> int:
+            return int(base64.b64decode(cursor).decode()) if cursor else 0
+
+        def connection(total: int, offset: int, nodes: List[Any], **extra) -> Dict[str, Any]:
+            end = offset + len(nodes)
+            return {
+                **extra,
+                'pageInfo': {
+                    'hasNextPage': end < total,
+                    'endCursor': base64.b64encode(str(end).encode()).decode() if nodes else None,
+                },
+                'nodes': nodes,
+            }
+
+        first = min(int(variables.get('first', 30)), 100)
+        offset = cursor_offset(variables.get('after'))
+
+        if 'search(' in query:
+            ids = corpus.search(variables.get('q', ''))
+            total = min(len(ids), SEARCH_RESULT_CAP)
+            window = ids[offset:min(offset + first, total)]
+            data = {'search': connection(total, offset, [corpus.graphql_repo(i) for i in window],
+                                         repositoryCount=len(ids))}
+        elif 'stargazers(' in query:
+            owner, name = variables.get('owner', ''), variables.get('name', '')
+            repo_id = corpus.resolve(owner, name)
+            total = corpus.star_count(owner, name)
+            logins = [corpus.stargazer_login(repo_id, i) for i in range(offset, min(offset + first, total))]
+            data = {'repository': {'stargazers': connection(
+                total, offset, [corpus.graphql_user(login) for login in logins], totalCount=total
+            )}}
+        else:
+            self.send_json(200, {'errors': [{'message': 'Query not supported by the fake server'}]}, headers)
+            return
+
+        self.send_json(200, {'data': data}, headers)
+
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        corpus: SyntheticCorpus,
+        rate_scale: float = 1.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        secondary_rate: float = 0.0,
+        verbose: bool = False
+    ):
+        super().__init__(address, FakeGitHubHandler)
+        self.corpus = corpus
+        self.limiter = RateLimiter(rate_scale)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.secondary_rate = secondary_rate
+        self.verbose = verbose
+        self.stats = {'core': 0, 'search': 0, 'graphql': 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local GitHub API stand-in backed by a synthetic corpus")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--repos', type=int, default=100000, help="Synthetic repos to generate")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--rate-scale', type=float, default=1.0, help="Multiply GitHub's rate limits")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered 502")
+    parser.add_argument('--secondary-rate', type=float, default=0.0, help="Fraction answered with a secondary limit")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    print(f"🧪 Generating {args.repos:,} synthetic repos (seed {args.seed})...")
+    started = time.time()
+    corpus = SyntheticCorpus(args.repos, args.seed)
+    print(f"✅ Corpus ready in {time.time() - started:.1f}s ({corpus.user_count:,} users)")
+
+    server = FakeGitHubServer(
+        (args.host, args.port), corpus,
+        rate_scale=args.rate_scale,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        secondary_rate=args.secondary_rate,
+        verbose=args.verbose
+    )
+
+    print(f"🚀 Fake GitHub API on {server.url}")
+    print(f"   export GITHUB_API_URL={server.url}")
+    if args.rate_scale != 1:
+        print(f"   export GITHUB_RATE_LIMIT_SCALE={args.rate_scale:g}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\n📊 Requests served: {server.stats}")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,53 @@
 #!/usr/bin/env python3
 """
 Fetch stargazers from DB-GPT repository
+
+With a token, stargazers and their profiles are fetched through GraphQL,
+100 users per query. Without one, falls back to REST (one call per user).
 """
-import requests
 import json
-import time
 import sys
+import time
 from datetime import datetime
 
+from crawl_checkpoint import CrawlCheckpoint
+from github_client import get_client
+
 # Configuration
 REPO_OWNER = "eosphoros-ai"
 REPO_NAME = "DB-GPT"
 OUTPUT_FILE = "/media/terry/data/projects/projects/getidea-git-bank/stargazers_data.json"
 TARGET_COUNT = 1000  # Fetch 1000 stargazers
-PER_PAGE = 100
+PER_PAGE = 100  # Also the GraphQL connection page size (max 100)
+
+# Stargazers plus every profile field either crawler stores, one page per query
+STARGAZERS_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    stargazers(first: $first, after: $after) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        login
+        name
+        url
+        avatarUrl
+        repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+        followers { totalCount }
+        following { totalCount }
+        gists(privacy: PUBLIC) { totalCount }
+        createdAt
+        updatedAt
+        bio
+        location
+        company
+        websiteUrl
+        twitterUsername
+        isHireable
+      }
+    }
+  }
+}
+"""
 
 def get_github_token():
     """Try to get GitHub token from gh CLI"""
@@ -29,120 +63,236 @@ def get_github_token():
     return None
 
 def fetch_stargazers_page(page, token=None):
-    """Fetch a single page of stargazers"""
-    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/stargazers"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+    """
+    Fetch a single page of stargazers
 
+    Rate limits and server errors are retried by the client's retry policy;
+    returns None if the page still could not be fetched.
+    """
+    url = f"/repos/{REPO_OWNER}/{REPO_NAME}/stargazers"
     params = {
         "per_page": PER_PAGE,
         "page": page
     }
 
     print(f"Fetching page {page}...", file=sys.stderr)
-    response = requests.get(url, headers=headers, params=params)
+    try:
+        response = get_client(token).get(url, params=params)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return None
 
     if response.status_code == 200:
         return response.json()
-    elif response.status_code == 403:
-        print(f"Rate limit exceeded. Waiting...", file=sys.stderr)
-        time.sleep(60)
-        return fetch_stargazers_page(page, token)
     else:
         print(f"Error: {response.status_code} - {response.text}", file=sys.stderr)
-        return []
+        return None
 
 def fetch_user_details(username, token=None):
     """Fetch detailed information for a user"""
-    url = f"https://api.github.com/users/{username}"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
-    response = requests.get(url, headers=headers)
+    url = f"/users/{username}"
+    try:
+        response = get_client(token).get(url)
+    except Exception as e:
+        print(f"Error fetching {username}: {e}", file=sys.stderr)
+        return None
 
     if response.status_code == 200:
         return response.json()
-    elif response.status_code == 403:
-        print(f"Rate limit exceeded. Waiting...", file=sys.stderr)
-        time.sleep(60)
-        return fetch_user_details(username, token)
     else:
         print(f"Error fetching {username}: {response.status_code}", file=sys.stderr)
         return None
 
-def main():
-    token = get_github_token()
-    if token:
-        print("Using authenticated GitHub token", file=sys.stderr)
-    else:
-        print("No GitHub token found. Using unauthenticated requests (limited to 60/hour)", file=sys.stderr)
+def build_user_record(username, user_details):
+    """Build a stargazers_data.json record from a REST /users/{u} payload"""
+    return {
+        "username": username,
+        "profile_url": user_details.get('html_url'),
+        "public_repos_count": user_details.get('public_repos', 0),
+        "followers": user_details.get('followers', 0),
+        "following": user_details.get('following', 0),
+        "account_created": user_details.get('created_at'),
+        "account_updated": user_details.get('updated_at'),
+        "bio": user_details.get('bio'),
+        "location": user_details.get('location'),
+        "company": user_details.get('company'),
+        "blog": user_details.get('blog'),
+        "twitter_username": user_details.get('twitter_username'),
+        "hireable": user_details.get('hireable'),
+        "public_gists": user_details.get('public_gists', 0)
+    }
 
-    all_stargazers = []
-    page = 1
-    pages_needed = (TARGET_COUNT + PER_PAGE - 1) // PER_PAGE
+def build_user_record_from_graphql(node):
+    """Build the same record from a GraphQL User node"""
+    return {
+        "username": node.get('login'),
+        "profile_url": node.get('url'),
+        "public_repos_count": node.get('repositories', {}).get('totalCount', 0),
+        "followers": node.get('followers', {}).get('totalCount', 0),
+        "following": node.get('following', {}).get('totalCount', 0),
+        "account_created": node.get('createdAt'),
+        "account_updated": node.get('updatedAt'),
+        "bio": node.get('bio'),
+        "location": node.get('location'),
+        "company": node.get('company'),
+        "blog": node.get('websiteUrl') or '',  # REST reports an unset blog as ""
+        "twitter_username": node.get('twitterUsername'),
+        "hireable": True if node.get('isHireable') else None,  # REST uses null, not false
+        "public_gists": node.get('gists', {}).get('totalCount', 0)
+    }
 
-    print(f"Fetching {TARGET_COUNT} stargazers from {REPO_OWNER}/{REPO_NAME}...", file=sys.stderr)
+def fetch_stargazers_graphql_page(run_query, cursor=None, build_record=build_user_record_from_graphql):
+    """Fetch one page of stargazers with their profiles in a single GraphQL query"""
+    variables = {
+        "owner": REPO_OWNER,
+        "name": REPO_NAME,
+        "first": PER_PAGE,
+        "after": cursor
+    }
+
+    data = run_query(STARGAZERS_QUERY, variables)
+    stargazers = (data.get('repository') or {}).get('stargazers') or {}
+    page_info = stargazers.get('pageInfo') or {}
+
+    records = [build_record(node) for node in stargazers.get('nodes') or [] if node]
+    next_cursor = page_info.get('endCursor') if page_info.get('hasNextPage') else None
+
+    return records, next_cursor
+
+def crawl_stargazers_graphql(run_query, checkpoint, build_record=build_user_record_from_graphql):
+    """
+    Crawl stargazers via GraphQL: ~1 request per 100 users, no per-user calls
+
+    `run_query(query, variables)` returns the response data - the pooled
+    client's graphql() or a gh CLI wrapper; `build_record` turns a User
+    node into an output record.
+    """
+    state = checkpoint.resume() or {}
+    cursor = state.get('cursor')
+    page = state.get('page', 1)
+    done = state.get('done', False)
 
-    while len(all_stargazers) < TARGET_COUNT:
+    if state:
+        print(f"Resuming at page {page} ({checkpoint.count} stargazers already saved)", file=sys.stderr)
+
+    while not done and checkpoint.count < TARGET_COUNT:
+        print(f"Fetching page {page} (GraphQL)...", file=sys.stderr)
+
+        try:
+            records, cursor = fetch_stargazers_graphql_page(run_query, cursor, build_record)
+        except Exception as e:
+            print(f"GraphQL error on page {page}: {e}", file=sys.stderr)
+            break
+
+        checkpoint.append(records[:TARGET_COUNT - checkpoint.count])
+        print(f"  {checkpoint.count}/{TARGET_COUNT} stargazers hydrated", file=sys.stderr)
+
+        done = not cursor
+        if done:
+            print(f"No more stargazers after page {page}", file=sys.stderr)
+
+        page += 1
+        checkpoint.commit(page=page, cursor=cursor, done=done)
+
+    return done or checkpoint.count >= TARGET_COUNT
+
+def hydrate_users(usernames, fetch_details, build_record, start, delay=0.0):
+    """
+    Records for `usernames` (up to TARGET_COUNT - start), plus the
+    usernames whose details could not be fetched
+    """
+    records = []
+    failed = []
+    for username in usernames:
+        if start + len(records) >= TARGET_COUNT:
+            break
+
+        print(f"  [{start + len(records) + 1}/{TARGET_COUNT}] Fetching details for {username}...", file=sys.stderr)
+        user_details = fetch_details(username)
+
+        if user_details:
+            records.append(build_record(username, user_details))
+        else:
+            failed.append(username)
+
+        if delay:
+            time.sleep(delay)
+
+    return records, failed
+
+def crawl_stargazers_rest(token, checkpoint):
+    """
+    Crawl stargazers via REST: one /users/{u} call per stargazer
+
+    Users whose details still fail after the client's retries are kept in
+    the checkpoint (`failed`) and retried first on the next run; the crawl
+    only reports finished once none are left.
+    """
+    state = checkpoint.resume() or {}
+    page = state.get('page', 1)
+    failed = state.get('failed', [])
+    done = state.get('done', False)
+
+    if state:
+        print(f"Resuming at page {page} ({checkpoint.count} stargazers already saved)", file=sys.stderr)
+
+    fetch_details = lambda username: fetch_user_details(username, token)
+
+    if failed:
+        print(f"Retrying {len(failed)} stargazers that failed last run...", file=sys.stderr)
+        records, failed = hydrate_users(failed, fetch_details, build_user_record, checkpoint.count)
+        checkpoint.append(records)
+        checkpoint.commit(page=page, failed=failed, done=done)
+
+    while not done and checkpoint.count < TARGET_COUNT:
         stargazers = fetch_stargazers_page(page, token)
 
+        if stargazers is None:
+            # Gave up on this page - keep the checkpoint so a rerun resumes here
+            break
+
         if not stargazers:
             print(f"No more stargazers found at page {page}", file=sys.stderr)
+            done = True
+            checkpoint.commit(page=page, failed=failed, done=done)
             break
 
         print(f"Processing {len(stargazers)} stargazers from page {page}...", file=sys.stderr)
 
-        for idx, stargazer in enumerate(stargazers):
-            if len(all_stargazers) >= TARGET_COUNT:
-                break
-
-            username = stargazer.get('login')
-            print(f"  [{len(all_stargazers) + 1}/{TARGET_COUNT}] Fetching details for {username}...", file=sys.stderr)
-
-            # Fetch detailed user info
-            user_details = fetch_user_details(username, token)
-
-            if user_details:
-                user_data = {
-                    "username": username,
-                    "profile_url": user_details.get('html_url'),
-                    "public_repos_count": user_details.get('public_repos', 0),
-                    "followers": user_details.get('followers', 0),
-                    "following": user_details.get('following', 0),
-                    "account_created": user_details.get('created_at'),
-                    "account_updated": user_details.get('updated_at'),
-                    "bio": user_details.get('bio'),
-                    "location": user_details.get('location'),
-                    "company": user_details.get('company'),
-                    "blog": user_details.get('blog'),
-                    "twitter_username": user_details.get('twitter_username'),
-                    "hireable": user_details.get('hireable'),
-                    "public_gists": user_details.get('public_gists', 0)
-                }
-                all_stargazers.append(user_data)
-
-            # Rate limiting - be nice to GitHub API
-            time.sleep(0.5)
+        usernames = [stargazer.get('login') for stargazer in stargazers]
+        page_records, page_failed = hydrate_users(usernames, fetch_details, build_user_record, checkpoint.count)
+        failed += page_failed
 
         page += 1
 
-        # Save intermediate results every page
-        if page % 2 == 0:
-            with open(OUTPUT_FILE, 'w') as f:
-                json.dump(all_stargazers, f, indent=2)
-            print(f"Intermediate save: {len(all_stargazers)} stargazers saved", file=sys.stderr)
+        # Append this page and move the resume cursor past it (failed users ride along)
+        checkpoint.append(page_records)
+        checkpoint.commit(page=page, failed=failed)
+        print(f"Checkpoint: {checkpoint.count} stargazers saved"
+              + (f", {len(failed)} to retry" if failed else ""), file=sys.stderr)
+
+    return (done or checkpoint.count >= TARGET_COUNT) and not failed
+
+def main():
+    token = get_github_token()
+
+    print(f"Fetching {TARGET_COUNT} stargazers from {REPO_OWNER}/{REPO_NAME}...", file=sys.stderr)
+
+    # Append-only checkpoint next to OUTPUT_FILE; an interrupted run resumes from it
+    checkpoint = CrawlCheckpoint(OUTPUT_FILE)
+
+    if token:
+        print("Using authenticated GitHub token (GraphQL batched crawl)", file=sys.stderr)
+        finished = crawl_stargazers_graphql(get_client(token).graphql, checkpoint)
+    else:
+        # GraphQL requires authentication
+        print("No GitHub token found. Using unauthenticated requests (limited to 60/hour)", file=sys.stderr)
+        finished = crawl_stargazers_rest(token, checkpoint)
 
-    # Final save
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(all_stargazers, f, indent=2)
+    # Final save: compact the checkpoint into OUTPUT_FILE
+    checkpoint.compact(finished)
+    with open(OUTPUT_FILE, 'r') as f:
+        all_stargazers = json.load(f)
 
     print(f"\n✓ Successfully fetched {len(all_stargazers)} stargazers", file=sys.stderr)
     print(f"✓ Data saved to: {OUTPUT_FILE}", file=sys.stderr)
@@ -1,13 +1,26 @@
 #!/usr/bin/env python3
 """
 Fetch stargazers from DB-GPT repository using gh CLI for authentication
+
+Modes (GH_FETCH_MODE):
+- client     (default) read the token from `gh auth token` once, then use the
+             in-process pooled client with batched GraphQL (100 users/request)
+- gh-graphql one `gh api graphql` invocation per 100 users
+- gh-rest    legacy: one `gh api` process per page and per user
 """
+import os
 import subprocess
 import json
-import time
 import sys
 from datetime import datetime
 
+from crawl_checkpoint import CrawlCheckpoint
+from fetch_stargazers import (
+    build_user_record as build_record_from_rest, build_user_record_from_graphql, crawl_stargazers_graphql,
+    get_github_token, hydrate_users
+)
+from github_client import get_client
+
 # Configuration
 REPO_OWNER = "eosphoros-ai"
 REPO_NAME = "DB-GPT"
@@ -15,6 +28,7 @@ REPO = f"{REPO_OWNER}/{REPO_NAME}"
 OUTPUT_FILE = "/media/terry/data/projects/projects/getidea-git-bank/stargazers_data.json"
 TARGET_COUNT = 1000  # Fetch 1000 stargazers
 PER_PAGE = 100
+FETCH_MODE = os.getenv('GH_FETCH_MODE', 'client')
 
 def gh_api_call(endpoint):
     """Make GitHub API call using gh CLI"""
@@ -31,6 +45,30 @@ def gh_api_call(endpoint):
         print(f"Exception calling {endpoint}: {e}", file=sys.stderr)
         return None
 
+def gh_graphql_call(query, variables):
+    """Run one GraphQL query through a single `gh api graphql` process"""
+    cmd = ['gh', 'api', 'graphql', '-f', f'query={query}']
+    for key, value in variables.items():
+        if value is None:
+            continue
+        # -F sends typed values (ints), -f sends raw strings
+        flag = '-F' if isinstance(value, int) else '-f'
+        cmd.extend([flag, f'{key}={value}'])
+
+    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+
+    return json.loads(result.stdout).get('data') or {}
+
+def build_user_record(node):
+    """stargazers_data.json record for a GraphQL User node"""
+    return {
+        **build_user_record_from_graphql(node),
+        "avatar_url": node.get('avatarUrl'),
+        "name": node.get('name')
+    }
+
 def fetch_stargazers_page(page):
     """Fetch a single page of stargazers"""
     endpoint = f"/repos/{REPO}/stargazers?per_page={PER_PAGE}&page={page}"
@@ -43,68 +81,95 @@ def fetch_user_details(username):
     endpoint = f"/users/{username}"
     return gh_api_call(endpoint)
 
-def main():
-    print(f"Using gh CLI for authenticated GitHub API access", file=sys.stderr)
-
-    all_stargazers = []
-    page = 1
-
-    print(f"Fetching {TARGET_COUNT} stargazers from {REPO}...", file=sys.stderr)
-
-    while len(all_stargazers) < TARGET_COUNT:
+def build_rest_user_record(username, user_details):
+    """stargazers_data.json record for a REST /users/{u} payload"""
+    return {
+        **build_record_from_rest(username, user_details),
+        "avatar_url": user_details.get('avatar_url'),
+        "name": user_details.get('name')
+    }
+
+def crawl_stargazers_rest(checkpoint):
+    """
+    Legacy crawl: one `gh api` process per page and per user
+
+    Users whose `gh api` call failed are kept in the checkpoint and
+    retried first on the next run.
+    """
+    state = checkpoint.resume() or {}
+    page = state.get('page', 1)
+    failed = state.get('failed', [])
+    done = state.get('done', False)
+
+    if state:
+        print(f"Resuming at page {page} ({checkpoint.count} stargazers already saved)", file=sys.stderr)
+
+    # Small delay between users to avoid overwhelming the API
+    def hydrate(usernames):
+        return hydrate_users(usernames, fetch_user_details, build_rest_user_record, checkpoint.count, delay=0.3)
+
+    if failed:
+        print(f"Retrying {len(failed)} stargazers that failed last run...", file=sys.stderr)
+        records, failed = hydrate(failed)
+        checkpoint.append(records)
+        checkpoint.commit(page=page, failed=failed, done=done)
+
+    while not done and checkpoint.count < TARGET_COUNT:
         stargazers = fetch_stargazers_page(page)
 
-        if not stargazers or len(stargazers) == 0:
+        if stargazers is None:
+            # `gh api` failed - keep the checkpoint so a rerun resumes here
+            break
+
+        if not stargazers:
             print(f"No more stargazers found at page {page}", file=sys.stderr)
+            done = True
+            checkpoint.commit(page=page, failed=failed, done=done)
             break
 
         print(f"Processing {len(stargazers)} stargazers from page {page}...", file=sys.stderr)
 
-        for stargazer in stargazers:
-            if len(all_stargazers) >= TARGET_COUNT:
-                break
-
-            username = stargazer.get('login')
-            print(f"  [{len(all_stargazers) + 1}/{TARGET_COUNT}] Fetching details for {username}...", file=sys.stderr)
-
-            # Fetch detailed user info
-            user_details = fetch_user_details(username)
-
-            if user_details:
-                user_data = {
-                    "username": username,
-                    "profile_url": user_details.get('html_url'),
-                    "public_repos_count": user_details.get('public_repos', 0),
-                    "followers": user_details.get('followers', 0),
-                    "following": user_details.get('following', 0),
-                    "account_created": user_details.get('created_at'),
-                    "account_updated": user_details.get('updated_at'),
-                    "bio": user_details.get('bio'),
-                    "location": user_details.get('location'),
-                    "company": user_details.get('company'),
-                    "blog": user_details.get('blog'),
-                    "twitter_username": user_details.get('twitter_username'),
-                    "hireable": user_details.get('hireable'),
-                    "public_gists": user_details.get('public_gists', 0),
-                    "avatar_url": user_details.get('avatar_url'),
-                    "name": user_details.get('name')
-                }
-                all_stargazers.append(user_data)
-
-            # Small delay to avoid overwhelming the API
-            time.sleep(0.3)
+        page_records, page_failed = hydrate([stargazer.get('login') for stargazer in stargazers])
+        failed += page_failed
 
         page += 1
 
-        # Save intermediate results every 2 pages
-        if page % 2 == 0:
-            with open(OUTPUT_FILE, 'w') as f:
-                json.dump(all_stargazers, f, indent=2)
-            print(f"Intermediate save: {len(all_stargazers)} stargazers saved", file=sys.stderr)
+        # Append this page and move the resume cursor past it (failed users ride along)
+        checkpoint.append(page_records)
+        checkpoint.commit(page=page, failed=failed)
+        print(f"Checkpoint: {checkpoint.count} stargazers saved"
+              + (f", {len(failed)} to retry" if failed else ""), file=sys.stderr)
+
+    return (done or checkpoint.count >= TARGET_COUNT) and not failed
+
+def main():
+    print(f"Fetching {TARGET_COUNT} stargazers from {REPO}...", file=sys.stderr)
 
-    # Final save
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(all_stargazers, f, indent=2)
+    mode = FETCH_MODE
+    token = get_github_token() if mode == 'client' else None
+
+    if mode == 'client' and not token:
+        print("Could not read a token from `gh auth token` - batching through `gh api graphql`", file=sys.stderr)
+        mode = 'gh-graphql'
+
+    # Append-only checkpoint next to OUTPUT_FILE; an interrupted run resumes from it
+    checkpoint = CrawlCheckpoint(OUTPUT_FILE)
+
+    if mode == 'client':
+        # Token fetched once; every request reuses the pooled in-process client
+        print("Using gh token with the pooled GitHub client (GraphQL)", file=sys.stderr)
+        finished = crawl_stargazers_graphql(get_client(token).graphql, checkpoint, build_user_record)
+    elif mode == 'gh-graphql':
+        print("Using gh CLI: one `gh api graphql` call per 100 users", file=sys.stderr)
+        finished = crawl_stargazers_graphql(gh_graphql_call, checkpoint, build_user_record)
+    else:
+        print("Using gh CLI for authenticated GitHub API access", file=sys.stderr)
+        finished = crawl_stargazers_rest(checkpoint)
+
+    # Final save: compact the checkpoint into OUTPUT_FILE
+    checkpoint.compact(finished)
+    with open(OUTPUT_FILE, 'r') as f:
+        all_stargazers = json.load(f)
 
     print(f"\n✓ Successfully fetched {len(all_stargazers)} stargazers", file=sys.stderr)
     print(f"✓ Data saved to: {OUTPUT_FILE}", file=sys.stderr)
@@ -11,6 +11,7 @@ import sys
 from datetime import datetime
 from typing import List, Dict, Any
 from train_simple_vector_db import SimpleVectorDB, generate_embedding
+from repo_features import FEATURES
 
 class GameState:
     """Track player progress and scores"""
@@ -91,40 +92,39 @@ class AgentDBDetector:
     STATE_KEYWORDS = ['state', 'history', 'context', 'memory', 'session', 'persistence']
     AI_KEYWORDS = ['llm', 'gpt', 'ai', 'chatbot', 'conversation', 'assistant']
 
+    KEYWORDS = FEATURES.register(REAL_TIME_KEYWORDS, COLLABORATIVE_KEYWORDS, DATA_KEYWORDS, STATE_KEYWORDS, AI_KEYWORDS)
+
     @classmethod
     def check_fit(cls, repo: Dict[str, Any]) -> Dict[str, Any]:
         """Check if repo would benefit from AgentDB"""
 
-        desc = repo['repository']['description'].lower()
-        category = repo['repository']['category'].lower()
-        topics = [t.lower() for t in repo['repository'].get('topics', [])]
-        text = f"{desc} {category} {' '.join(topics)}"
+        hits = FEATURES.features(repo['repository']).hits('description', 'category', 'topics')
 
         score = 0
         reasons = []
 
         # Check real-time features
-        if any(kw in text for kw in cls.REAL_TIME_KEYWORDS):
+        if any(kw in hits for kw in cls.REAL_TIME_KEYWORDS):
             score += 3
             reasons.append("Real-time data needs → AgentDB for fast queries")
 
         # Check collaborative features
-        if any(kw in text for kw in cls.COLLABORATIVE_KEYWORDS):
+        if any(kw in hits for kw in cls.COLLABORATIVE_KEYWORDS):
             score += 3
             reasons.append("Multi-user collaboration → AgentDB for shared state")
 
         # Check analytics/monitoring
-        if any(kw in text for kw in cls.DATA_KEYWORDS):
+        if any(kw in hits for kw in cls.DATA_KEYWORDS):
             score += 2
             reasons.append("Analytics/monitoring → AgentDB for time-series storage")
 
         # Check state management
-        if any(kw in text for kw in cls.STATE_KEYWORDS):
+        if any(kw in hits for kw in cls.STATE_KEYWORDS):
             score += 2
             reasons.append("State management → AgentDB for persistence")
 
         # Check AI/LLM
-        if any(kw in text for kw in cls.AI_KEYWORDS):
+        if any(kw in hits for kw in cls.AI_KEYWORDS):
             score += 4
             reasons.append("AI/LLM features → AgentDB for context/memory")
 
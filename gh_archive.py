@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+🗄️ GH Archive Bulk Ingestion
+
+GH Archive (https://www.gharchive.org) publishes every public GitHub event
+as hourly gzipped JSON files (one event per line). Reading downloaded dumps
+finds candidate repos at disk speed without spending any API budget.
+
+- Streams `.json.gz` files line by line; only WatchEvent (star), ForkEvent,
+  PushEvent and CreateEvent lines are decoded, the rest are skipped by a
+  byte-level type check before json.loads
+- Keeps one small running counter per repo (memory grows with distinct
+  repos, not with events read)
+- Emits repos in the 5-100 star band as search-API shaped dicts, so they go
+  through the same seen filter and HiddenGemScorer as search results
+
+WatchEvents inside the ingested window are the stars a repo *gained*; they
+only equal its star count when its CreateEvent is inside the window too.
+So `candidates()` emits just the repos created in the window, and
+`resolved_candidates()` looks up real counts for the older repos that
+gained stars (batched GraphQL, ~100 repos per request, needs a token).
+
+Download dumps with e.g.:
+    wget https://data.gharchive.org/2025-01-15-{0..23}.json.gz
+
+Usage:
+    python gh_archive.py 2025-01-15-*.json.gz
+    python gh_archive.py fixtures/gharchive-sample.json.gz   # tiny sample hour
+"""
+
+import glob
+import gzip
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from github_graphql import REPOSITORY_BATCH_SIZE, resolve_repositories
+
+ARCHIVE_EVENT_TYPES = ('WatchEvent', 'ForkEvent', 'PushEvent', 'CreateEvent')
+
+# Cheap pre-check on the raw line; most events (issues, comments, ...) never get decoded
+EVENT_TYPE_PATTERN = re.compile(rb'"type":\s*"(' + b'|'.join(t.encode() for t in ARCHIVE_EVENT_TYPES) + rb')"')
+
+# Star band for emitted candidates (matches continuous discovery's "real traction" band)
+MIN_STARS = 5
+MAX_STARS = 100
+
+# Older repos looked up per ingest (busiest first): 50 GraphQL requests
+MAX_RESOLVE = 50 * REPOSITORY_BATCH_SIZE
+
+
+class RepoActivity:
+    """Running per-repo counters from archive events"""
+
+    __slots__ = ('id', 'name', 'stars', 'forks', 'pushes', 'created_at', 'pushed_at', 'description')
+
+    def __init__(self, repo_id: int, name: str):
+        self.id = repo_id
+        self.name = name
+        self.stars = 0
+        self.forks = 0
+        self.pushes = 0
+        self.created_at: Optional[str] = None
+        self.pushed_at: Optional[str] = None
+        self.description: Optional[str] = None
+
+    def as_repo(self) -> Dict[str, Any]:
+        """Search-API shaped repo dict (fields the archive can't know are empty)"""
+        owner, _, name = self.name.partition('/')
+        return {
+            'id': self.id,
+            'name': name,
+            'full_name': self.name,
+            'owner': {'login': owner},
+            'html_url': f"https://github.com/{self.name}",
+            'stargazers_count': self.stars,
+            'forks_count': self.forks,
+            'description': self.description,
+            'language': None,
+            'topics': [],
+            'created_at': self.created_at,
+            'pushed_at': self.pushed_at,
+            'source': 'gharchive',
+            'archive_stars': self.stars,
+            'archive_pushes': self.pushes,
+        }
+
+    def archive_fields(self) -> Dict[str, Any]:
+        """Archive-only counters merged into a resolved repo dict"""
+        return {'source': 'gharchive', 'archive_stars': self.stars, 'archive_pushes': self.pushes}
+
+
+def iter_events(path: str) -> Iterator[Dict[str, Any]]:
+    """Decoded archive events of the tracked types, streamed from one file"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        for line in f:
+            if not EVENT_TYPE_PATTERN.search(line):
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # Truncated last line of a partial download
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """Files for a list of paths, globs or directories, in name (= hour) order"""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.json.gz')
+        paths.extend(glob.glob(pattern) or ([pattern] if os.path.exists(pattern) else []))
+    return sorted(set(paths))
+
+
+class ArchiveIngest:
+    """Aggregate archive files into per-repo activity"""
+
+    def __init__(self):
+        self.repos: Dict[int, RepoActivity] = {}
+        self.stats = {'files': 0, 'events': 0, 'repos': 0, 'resolved': 0}
+
+    def activity(self, repo: Dict[str, Any]) -> Optional[RepoActivity]:
+        repo_id = repo.get('id')
+        name = repo.get('name')
+        if not repo_id or not name:
+            return None
+
+        activity = self.repos.get(repo_id)
+        if activity is None:
+            activity = self.repos[repo_id] = RepoActivity(repo_id, name)
+        else:
+            activity.name = name  # Renames: keep the latest
+        return activity
+
+    def add_event(self, event: Dict[str, Any]):
+        activity = self.activity(event.get('repo') or {})
+        if activity is None:
+            return
+
+        kind = event.get('type')
+        created_at = event.get('created_at')
+        payload = event.get('payload') or {}
+
+        if kind == 'WatchEvent':
+            activity.stars += 1
+        elif kind == 'ForkEvent':
+            activity.forks += 1
+        elif kind == 'PushEvent':
+            activity.pushes += 1
+            if created_at and (activity.pushed_at is None or created_at > activity.pushed_at):
+                activity.pushed_at = created_at
+        elif kind == 'CreateEvent' and payload.get('ref_type') == 'repository':
+            activity.created_at = created_at
+            activity.description = payload.get('description') or activity.description
+
+        self.stats['events'] += 1
+
+    def ingest(self, paths: Iterable[str]):
+        """Stream every file in `paths` into the running counters"""
+        for path in paths:
+            for event in iter_events(path):
+                self.add_event(event)
+            self.stats['files'] += 1
+        self.stats['repos'] = len(self.repos)
+
+    def candidates(self, min_stars: int = MIN_STARS, max_stars: int = MAX_STARS) -> Iterator[Dict[str, Any]]:
+        """Repos created inside the window whose star count falls in [min_stars, max_stars]"""
+        for activity in self.repos.values():
+            if activity.created_at and min_stars <= activity.stars <= max_stars:
+                yield activity.as_repo()
+
+    def resolved_candidates(
+        self,
+        client,
+        min_stars: int = MIN_STARS,
+        max_stars: int = MAX_STARS,
+        limit: int = MAX_RESOLVE
+    ) -> List[Dict[str, Any]]:
+        """
+        Older repos that gained stars in the window, with their real counts
+
+        Stars gained never exceed the total, so repos that gained more than
+        `max_stars` are out of the band without a lookup. The busiest
+        `limit` of the rest are resolved; those in the band are returned.
+        """
+        pending = sorted(
+            (a for a in self.repos.values() if not a.created_at and 0 < a.stars <= max_stars and '/' in a.name),
+            key=lambda a: a.stars,
+            reverse=True
+        )[:limit]
+        by_name = {a.name.lower(): a for a in pending}
+
+        repos = resolve_repositories(client, [tuple(a.name.split('/', 1)) for a in pending])
+        self.stats['resolved'] = len(repos)
+
+        candidates = []
+        for repo in repos:
+            if not min_stars <= repo['stargazers_count'] <= max_stars:
+                continue
+            activity = by_name.get((repo.get('full_name') or '').lower())
+            if activity is not None:
+                repo.update(activity.archive_fields())
+            candidates.append(repo)
+        return candidates
+
+
+def main():
+    """
+    Score archive candidates and print the top hidden gems
+
+    Without a token only repos created inside the window are scored (their
+    archive star count is exact); with one, older repos that gained stars
+    are resolved to their real counts as well.
+    """
+    from github_client import get_client, tokens_from_env
+    from hidden_gem_discovery import HiddenGemScorer
+
+    paths = expand_paths(sys.argv[1:])
+    if not paths:
+        print("Usage: python gh_archive.py <file.json.gz | glob | directory> ...")
+        sys.exit(1)
+
+    print(f"🗄️  Ingesting {len(paths)} GH Archive file(s)...")
+    archive = ArchiveIngest()
+    archive.ingest(paths)
+    print(f"   {archive.stats['events']:,} events, {archive.stats['repos']:,} repos")
+
+    candidates = list(archive.candidates())
+    token = tokens_from_env()
+    if token:
+        resolved = archive.resolved_candidates(get_client(token))
+        print(f"   Resolved {archive.stats['resolved']:,} older repos, {len(resolved):,} in the star band")
+        candidates.extend(resolved)
+    else:
+        print("   ⚠️  No GITHUB_TOKEN - scoring only repos created inside the window")
+
+    gems = []
+    for repo in candidates:
+        repo_data = {
+            'name': repo['name'],
+            'owner': repo['owner']['login'],
+            'url': repo['html_url'],
+            'stars': repo['stargazers_count'],
+            'forks': repo['forks_count'],
+            'description': repo['description'],
+            'language': repo['language'],
+            'topics': repo['topics'],
+            'created_at': repo['created_at'],
+        }
+        score_data = HiddenGemScorer.score_hidden_gem(repo_data)
+        if score_data['is_hidden_gem']:
+            gems.append({**repo_data, **score_data})
+
+    gems.sort(key=lambda gem: gem['hidden_gem_score'], reverse=True)
+    print(f"   {len(candidates):,} candidates in the {MIN_STARS}-{MAX_STARS} star band, {len(gems)} hidden gems\n")
+
+    for i, gem in enumerate(gems[:20], 1):
+        print(f"{i}. {gem['owner']}/{gem['name']} ({gem['stars']}⭐) - score {gem['hidden_gem_score']}, "
+              f"{gem['agentdb_multiplier']}x")
+        print(f"   🔗 {gem['url']}")
+
+
+if __name__ == '__main__':
+    main()
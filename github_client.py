@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+🔌 Shared GitHub API Client
+
+Every GitHub caller in this repo goes through one pooled HTTP session
+instead of bare `requests.get` calls.
+
+Features:
+- Keep-alive connection pooling (no TCP+TLS handshake per request)
+- gzip-compressed responses
+- Shared auth + Accept headers
+- Per-endpoint timeouts (search, core REST, GraphQL)
+- Persistent response cache with ETag revalidation (see response_cache.py)
+- Cross-process rate-limit governor fed by response headers (see rate_governor.py)
+- Retry-After aware retries and per-endpoint circuit breakers (see retry_policy.py)
+- Optional record/replay cassette transport for offline runs (see cassette.py)
+- One client per token, reused across the whole process
+- TokenPool: several tokens behind one client interface, each request
+  routed to the token with the most remaining budget
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cassette import cassette_active, cassette_adapter_from_env
+from rate_governor import GOVERNOR_DB_PATH, RateLimitGovernor, token_fingerprint
+from response_cache import CACHE_DB_PATH, ResponseCache, cache_key
+from retry_policy import RetryPolicy
+
+# Override to point every caller at a different API host
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+
+# (connect, read) timeouts in seconds per endpoint class
+ENDPOINT_TIMEOUTS = {
+    'search': (5, 30),     # Search is slow on broad queries
+    'graphql': (5, 60),    # Batched queries can take a while
+    'core': (5, 15),       # /users, /repos, ...
+}
+
+DEFAULT_HEADERS = {
+    'Accept': 'application/vnd.github.v3+json',
+    'Accept-Encoding': 'gzip, deflate',
+    'X-GitHub-Api-Version': '2022-11-28',
+    'User-Agent': 'agentdb-discovery',
+}
+
+# A single token, a list of tokens (pooled), or None for anonymous access
+TokenSpec = Union[str, List[str], None]
+
+
+def endpoint_class(url: str) -> str:
+    """Classify a GitHub API URL as 'search', 'graphql' or 'core'"""
+    path = urlparse(url).path
+
+    if path.startswith('/search/'):
+        return 'search'
+    elif path.rstrip('/').endswith('/graphql'):
+        return 'graphql'
+    else:
+        return 'core'
+
+
+def tokens_from_env() -> TokenSpec:
+    """GITHUB_TOKENS (comma-separated) if set, else GITHUB_TOKEN"""
+    tokens = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+    if tokens:
+        return tokens if len(tokens) > 1 else tokens[0]
+    return os.getenv('GITHUB_TOKEN')
+
+
+def token_count(token: TokenSpec) -> int:
+    """Number of tokens in a TokenSpec (0 when anonymous)"""
+    if isinstance(token, (list, tuple)):
+        return len([t for t in token if t])
+    return 1 if token else 0
+
+
+class GraphQLError(Exception):
+    """GitHub answered a GraphQL query with an `errors` payload"""
+
+
+class GitHubClient:
+    """Pooled, authenticated HTTP client for the GitHub API"""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: str = GITHUB_API_URL,
+        pool_size: int = 10,
+        cache: Optional[ResponseCache] = None,
+        governor: Optional[RateLimitGovernor] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        self.token = token
+        self.fingerprint = token_fingerprint(token)
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache
+        self.governor = governor
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.request_count = 0
+
+        # Set by a TokenPool: rate-limited requests fail over to its other tokens
+        self.pool: Optional['TokenPool'] = None
+
+        # resource -> [limit, remaining, reset_at], estimated locally and
+        # corrected from every response's X-RateLimit-* headers
+        self.budgets: Dict[str, List[float]] = {}
+        self.budget_lock = threading.Lock()
+
+        # One session = keep-alive connections reused across requests
+        # (GITHUB_CASSETTE swaps in a record/replay transport)
+        self.session = requests.Session()
+        adapter = cassette_adapter_from_env(pool_size) or HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.session.headers.update(DEFAULT_HEADERS)
+        if self.token:
+            self.session.headers['Authorization'] = f'token {self.token}'
+
+    def url_for(self, path: str) -> str:
+        """Build an absolute URL from an API path (absolute URLs pass through)"""
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def headroom(self, resource: str) -> int:
+        """Requests left in this token's `resource` budget (best estimate)"""
+        with self.budget_lock:
+            budget = self.budgets.get(resource)
+            if budget is None or budget[2] <= time.time():
+                return RateLimitGovernor.default_bucket(self.fingerprint, resource)[0]
+            return int(budget[1])
+
+    def spend(self, resource: str):
+        """Count one request against the local budget estimate"""
+        with self.budget_lock:
+            budget = self.budgets.get(resource)
+            if budget is None or budget[2] <= time.time():
+                budget = list(RateLimitGovernor.default_bucket(self.fingerprint, resource))
+                self.budgets[resource] = budget
+            budget[1] -= 1
+            self.request_count += 1
+
+    def exhaust(self, resource: str, seconds: float):
+        """Mark `resource` as spent for `seconds` (after a rate-limit reply)"""
+        with self.budget_lock:
+            budget = self.budgets.get(resource)
+            limit = budget[0] if budget else RateLimitGovernor.default_bucket(self.fingerprint, resource)[0]
+            self.budgets[resource] = [limit, 0, time.time() + seconds]
+
+    def update_budget(self, resource: str, headers):
+        """Replace the local estimate with the budget GitHub reports"""
+        if 'X-RateLimit-Remaining' not in headers or 'X-RateLimit-Reset' not in headers:
+            return  # Cached response or non-API reply
+
+        resource = headers.get('X-RateLimit-Resource', resource)
+        remaining = int(headers['X-RateLimit-Remaining'])
+        limit = int(headers.get('X-RateLimit-Limit', remaining))
+
+        with self.budget_lock:
+            self.budgets[resource] = [limit, remaining, float(headers['X-RateLimit-Reset'])]
+
+    def usage(self) -> Dict[str, Dict[str, Any]]:
+        """Per-token request count and known budgets, keyed by fingerprint"""
+        with self.budget_lock:
+            budgets = {
+                resource: {
+                    'limit': int(limit),
+                    'remaining': int(remaining),
+                    'resets_in': max(int(reset_at - time.time()), 0),
+                }
+                for resource, (limit, remaining, reset_at) in self.budgets.items()
+            }
+        return {self.fingerprint: {'requests': self.request_count, 'budgets': budgets}}
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request under the retry policy (rate limits, 5xx, breaker)
+
+        In a TokenPool a rate-limited request is re-sent at once on the
+        token with the most headroom; the policy only sleeps when every
+        token in the pool is exhausted.
+        """
+        resource = endpoint_class(url)
+        client = self
+
+        def failover(wait: float) -> bool:
+            nonlocal client
+            if self.pool is None:
+                return False
+            client.exhaust(resource, wait)
+            candidate = self.pool.pick(resource)
+            if candidate is client or candidate.headroom(resource) <= 0:
+                return False
+            client = candidate
+            return True
+
+        return self.retry_policy.call(
+            resource,
+            lambda: client.send_once(method, url, resource, **kwargs),
+            failover=failover
+        )
+
+    def send_once(self, method: str, url: str, resource: str, **kwargs) -> requests.Response:
+        """Send one request through the shared rate-limit governor"""
+        if self.governor is not None:
+            self.governor.acquire(self.fingerprint, resource)
+
+        self.spend(resource)
+        response = self.session.request(method, url, **kwargs)
+
+        self.update_budget(resource, response.headers)
+        if self.governor is not None:
+            self.governor.update_from_headers(self.fingerprint, resource, response.headers)
+
+        return response
+
+    def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Any] = None
+    ) -> requests.Response:
+        """GET an API path using the shared session (served from cache when fresh)"""
+        url = self.url_for(path)
+
+        if timeout is None:
+            timeout = ENDPOINT_TIMEOUTS[endpoint_class(url)]
+
+        key = None
+        entry = None
+        if self.cache is not None:
+            key = cache_key('GET', url, params)
+            entry = self.cache.lookup(key)
+
+            if entry and entry['is_fresh']:
+                self.cache.stats['hits'] += 1
+                return ResponseCache.to_response(entry, 'HIT')
+
+            if entry:
+                # Stale: revalidate - a 304 is free against the rate limit
+                headers = {**ResponseCache.conditional_headers(entry), **(headers or {})}
+
+        response = self.send('GET', url, params=params, headers=headers, timeout=timeout)
+
+        if self.cache is not None:
+            if response.status_code == 304 and entry:
+                self.cache.touch(key)
+                self.cache.stats['revalidated'] += 1
+                return ResponseCache.to_response(entry, 'REVALIDATED')
+
+            if response.status_code == 200:
+                self.cache.store(key, response)
+                self.cache.stats['misses'] += 1
+
+        return response
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET an API path and return the decoded JSON body (raises on HTTP errors)"""
+        response = self.get(path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None, partial: bool = False) -> Dict[str, Any]:
+        """
+        Run a GraphQL query (requires a token) and return its `data`
+
+        With `partial`, errors on some fields (e.g. an aliased repository
+        that no longer exists) still return the data that did resolve.
+        """
+        url = self.url_for('/graphql')
+
+        response = self.send(
+            'POST',
+            url,
+            json={'query': query, 'variables': variables or {}},
+            timeout=ENDPOINT_TIMEOUTS['graphql']
+        )
+        response.raise_for_status()
+
+        body = response.json()
+        if body.get('errors') and not (partial and body.get('data')):
+            raise GraphQLError('; '.join(e.get('message', str(e)) for e in body['errors']))
+
+        return body.get('data') or {}
+
+    def search_repositories(
+        self,
+        query: str,
+        sort: str = 'updated',
+        order: str = 'desc',
+        per_page: int = 30,
+        page: int = 1
+    ) -> Dict[str, Any]:
+        """Run a repository search and return the raw response body"""
+        params = {
+            'q': query,
+            'sort': sort,
+            'order': order,
+            'per_page': min(100, per_page),
+            'page': page,
+        }
+        return self.get_json('/search/repositories', params=params)
+
+    def close(self):
+        self.session.close()
+
+
+class TokenPool:
+    """
+    Several tokens behind the GitHubClient interface
+
+    Each request goes to the token with the most headroom left in the
+    resource it hits (search/core/graphql), so N tokens give roughly N
+    times the throughput of one. Ties go to the least-used token, and a
+    request that hits a rate limit moves to the next token instead of
+    waiting.
+    """
+
+    def __init__(self, clients: List[GitHubClient]):
+        if not clients:
+            raise ValueError("TokenPool needs at least one client")
+        self.clients = clients
+        self.pick_lock = threading.Lock()
+        for client in clients:
+            client.pool = self
+
+    @property
+    def token(self) -> Optional[str]:
+        return self.clients[0].token
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self.clients[0].cache
+
+    @property
+    def governor(self) -> Optional[RateLimitGovernor]:
+        return self.clients[0].governor
+
+    @property
+    def request_count(self) -> int:
+        return sum(client.request_count for client in self.clients)
+
+    def pick(self, resource: str) -> GitHubClient:
+        """The client with the most budget left for `resource`"""
+        with self.pick_lock:
+            return max(self.clients, key=lambda c: (c.headroom(resource), -c.request_count))
+
+    def url_for(self, path: str) -> str:
+        return self.clients[0].url_for(path)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.pick(endpoint_class(self.url_for(path))).get(path, **kwargs)
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return self.pick(endpoint_class(self.url_for(path))).get_json(path, params=params)
+
+    def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None, partial: bool = False) -> Dict[str, Any]:
+        return self.pick('graphql').graphql(query, variables, partial=partial)
+
+    def search_repositories(self, query: str, **kwargs) -> Dict[str, Any]:
+        return self.pick('search').search_repositories(query, **kwargs)
+
+    def usage(self) -> Dict[str, Dict[str, Any]]:
+        usage = {}
+        for client in self.clients:
+            usage.update(client.usage())
+        return usage
+
+    def close(self):
+        for client in self.clients:
+            client.close()
+
+
+# Process-wide clients, one per token, sharing one response cache + governor
+_clients: Dict[Any, Union[GitHubClient, TokenPool]] = {}
+_clients_lock = threading.Lock()
+_shared_cache: Optional[ResponseCache] = None
+_shared_governor: Optional[RateLimitGovernor] = None
+_shared_retry_policy = RetryPolicy()
+
+
+def _client_for(token: Optional[str]) -> GitHubClient:
+    # Caller holds _clients_lock
+    global _shared_cache, _shared_governor
+
+    client = _clients.get(token)
+    if client is None:
+        # Cassette runs bypass the response cache and the governor DB (see cassette.py)
+        if _shared_cache is None and CACHE_DB_PATH and not cassette_active():
+            _shared_cache = ResponseCache(CACHE_DB_PATH)
+        if _shared_governor is None and GOVERNOR_DB_PATH and not cassette_active():
+            _shared_governor = RateLimitGovernor(GOVERNOR_DB_PATH)
+        client = GitHubClient(
+            token,
+            cache=_shared_cache,
+            governor=_shared_governor,
+            retry_policy=_shared_retry_policy
+        )
+        _clients[token] = client
+    return client
+
+
+def get_client(token: TokenSpec = None) -> Union[GitHubClient, TokenPool]:
+    """
+    Return the shared client for `token`, creating it on first use
+
+    A list of two or more tokens returns a TokenPool over their clients.
+    """
+    if isinstance(token, (list, tuple)):
+        tokens = list(dict.fromkeys(t for t in token if t))
+        if len(tokens) <= 1:
+            token = tokens[0] if tokens else None
+        else:
+            with _clients_lock:
+                key = tuple(tokens)
+                pool = _clients.get(key)
+                if pool is None:
+                    pool = TokenPool([_client_for(t) for t in tokens])
+                    _clients[key] = pool
+                return pool
+
+    with _clients_lock:
+        return _client_for(token)
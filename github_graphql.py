@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+🧬 GitHub GraphQL Repository Queries
+
+Projects only the repository fields our scorers read, then normalizes the
+nodes into the REST search item shape so every existing caller keeps working.
+
+Compared to REST search items this adds nothing we don't use and includes
+fields REST callers used to skip (pushed_at, license, topics).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from github_client import GitHubClient
+
+# Every field read by HiddenGemScorer / FastMoneyScorer / AdvancedEmbedding
+REPOSITORY_FIELDS = """
+fragment RepoFields on Repository {
+  databaseId
+  name
+  nameWithOwner
+  url
+  description
+  owner { login }
+  stargazerCount
+  forkCount
+  primaryLanguage { name }
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+  createdAt
+  pushedAt
+  licenseInfo { spdxId name }
+  isArchived
+  isFork
+}
+"""
+
+SEARCH_REPOSITORIES_QUERY = """
+query($q: String!, $first: Int!, $after: String) {
+  search(query: $q, type: REPOSITORY, first: $first, after: $after) {
+    repositoryCount
+    pageInfo { hasNextPage endCursor }
+    nodes { ... on Repository { ...RepoFields } }
+  }
+}
+""" + REPOSITORY_FIELDS
+
+# Aliased repository() lookups per request (cost stays at 1 rate-limit point)
+REPOSITORY_BATCH_SIZE = 100
+
+# REST `sort` values expressed as GraphQL search qualifiers
+SORT_QUALIFIERS = {
+    'stars': 'sort:stars-desc',
+    'forks': 'sort:forks-desc',
+    'updated': 'sort:updated-desc',
+}
+
+
+def normalize_repository(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a GraphQL Repository node into a REST-style search item"""
+    license_info = node.get('licenseInfo')
+    language = node.get('primaryLanguage')
+    topics = (node.get('repositoryTopics') or {}).get('nodes') or []
+
+    return {
+        'id': node.get('databaseId'),
+        'name': node.get('name'),
+        'full_name': node.get('nameWithOwner'),
+        'owner': {'login': (node.get('owner') or {}).get('login')},
+        'html_url': node.get('url'),
+        'description': node.get('description'),
+        'stargazers_count': node.get('stargazerCount', 0),
+        'forks_count': node.get('forkCount', 0),
+        'language': language.get('name') if language else None,
+        'topics': [t['topic']['name'] for t in topics if t and t.get('topic')],
+        'created_at': node.get('createdAt'),
+        'pushed_at': node.get('pushedAt'),
+        'license': {
+            'spdx_id': license_info.get('spdxId'),
+            'name': license_info.get('name'),
+        } if license_info else None,
+        'archived': node.get('isArchived', False),
+        'fork': node.get('isFork', False),
+    }
+
+
+def search_repositories(
+    client: GitHubClient,
+    query: str,
+    sort: str = 'updated',
+    first: int = 30,
+    after: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+    """
+    Run one GraphQL search page
+
+    Returns (items, total_count, next_cursor); next_cursor is None on the last page.
+    """
+    qualifier = SORT_QUALIFIERS.get(sort)
+    q = f"{query} {qualifier}" if qualifier else query
+
+    data = client.graphql(SEARCH_REPOSITORIES_QUERY, {
+        'q': q,
+        'first': min(100, first),
+        'after': after,
+    })
+
+    search = data.get('search') or {}
+    page_info = search.get('pageInfo') or {}
+    items = [normalize_repository(node) for node in search.get('nodes') or [] if node]
+    next_cursor = page_info.get('endCursor') if page_info.get('hasNextPage') else None
+
+    return items, search.get('repositoryCount', 0), next_cursor
+
+
+def resolve_repositories(
+    client: GitHubClient,
+    names: Iterable[Tuple[str, str]],
+    batch_size: int = REPOSITORY_BATCH_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Metadata for many (owner, name) pairs, normalized like search items
+
+    Each request carries `batch_size` aliased repository() lookups, so a
+    thousand repos resolve in about ten requests. Repos that no longer
+    resolve (deleted, private) are dropped.
+    """
+    names = list(names)
+    repos = []
+
+    for start in range(0, len(names), batch_size):
+        batch = names[start:start + batch_size]
+
+        params = ', '.join(f"$o{i}: String!, $n{i}: String!" for i in range(len(batch)))
+        lookups = '\n'.join(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}" for i in range(len(batch)))
+        variables = {}
+        for i, (owner, name) in enumerate(batch):
+            variables[f'o{i}'] = owner
+            variables[f'n{i}'] = name
+
+        data = client.graphql(f"query({params}) {{\n{lookups}\n}}\n" + REPOSITORY_FIELDS, variables, partial=True)
+        repos.extend(normalize_repository(data[f'r{i}']) for i in range(len(batch)) if data.get(f'r{i}'))
+
+    return repos
+
+
+class GraphQLSearchPager:
+    """
+    Page-number access on top of cursor pagination
+
+    Remembers the cursor that starts each page so callers can keep asking
+    for `page=N` like they do with REST; unknown pages are walked to once.
+    """
+
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.cursors: Dict[tuple, str] = {}
+        self.total_counts: Dict[tuple, int] = {}  # (query, sort) -> last repositoryCount
+
+    def page(self, query: str, sort: str = 'updated', per_page: int = 30, page: int = 1) -> List[Dict[str, Any]]:
+        """Return the items of `page` (1-based) for a search"""
+        # Start from the deepest page whose cursor we already know
+        start = page
+        while start > 1 and (query, sort, per_page, start) not in self.cursors:
+            start -= 1
+        cursor = self.cursors.get((query, sort, per_page, start))
+
+        for current in range(start, page + 1):
+            items, total_count, next_cursor = search_repositories(self.client, query, sort, per_page, cursor)
+            self.total_counts[(query, sort)] = total_count
+
+            if next_cursor:
+                self.cursors[(query, sort, per_page, current + 1)] = next_cursor
+
+            if current == page:
+                return items
+            if not next_cursor:
+                return []  # Ran out of results before the requested page
+
+            cursor = next_cursor
+
+        return []
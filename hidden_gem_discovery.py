@@ -13,12 +13,20 @@ Scoring factors:
 """
 
 import json
-import requests
-import time
-from datetime import datetime
-from typing import List, Dict, Any
+import os
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
 from collections import Counter
 
+import numpy as np
+
+from github_client import TokenSpec, get_client
+from github_graphql import GraphQLSearchPager
+from keyword_matcher import KeywordMatcher
+from page_prefetch import PagePrefetcher
+from repo_categorizer import categorize
+from repo_features import FEATURES, MICROSECONDS_PER_DAY, epoch_microseconds, parse_created
+
 class HiddenGemScorer:
     """
     Score repos for hidden gem potential with AgentDB
@@ -58,18 +66,38 @@ class HiddenGemScorer:
         'exploration', 'research', 'fresh', 'alternative'
     ]
 
+    # Does it solve a real problem?
+    PAIN_INDICATORS = [
+        'problem', 'solution', 'fix', 'simplify', 'easier',
+        'better', 'improve', 'manage', 'organize', 'track',
+        'automate', 'faster', 'efficient', 'productivity'
+    ]
+
+    # How easy is it to add AgentDB?
+    SIMPLE_INDICATORS = [
+        'simple', 'minimal', 'lightweight', 'small', 'basic',
+        'starter', 'boilerplate', 'template', 'example'
+    ]
+
+    # Every table above: the batch path (columns) scans with this matcher,
+    # score_hidden_gem reads the hits from the shared feature record
+    KEYWORDS = KeywordMatcher(AGENTDB_MULTIPLIER_KEYWORDS, NOVELTY_KEYWORDS, PAIN_INDICATORS, SIMPLE_INDICATORS)
+    FEATURES.register(KEYWORDS.keywords)
+
+    # Languages/frameworks where adding AgentDB is simple
+    SIMPLE_LANGUAGES = ['javascript', 'typescript', 'python', 'go']
+
+    # Keyword-hit matrix columns for score_batch: multiplier keywords, then pain, simple, novelty
+    HIT_COLUMNS = [*AGENTDB_MULTIPLIER_KEYWORDS, *PAIN_INDICATORS, *SIMPLE_INDICATORS, *NOVELTY_KEYWORDS]
+
     @classmethod
     def score_hidden_gem(cls, repo: Dict[str, Any]) -> Dict[str, Any]:
         """Score a repo for hidden gem + AgentDB potential"""
 
-        stars = repo.get('stars', 0)
-        forks = repo.get('forks', 0)
-        description = (repo.get('description') or '').lower()
-        topics = [t.lower() for t in repo.get('topics', [])]
-        category = (repo.get('category') or '').lower()
-        language = (repo.get('language') or '').lower()
-
-        text = f"{description} {' '.join(topics)} {category}"
+        features = FEATURES.features(repo)
+        stars = features.stars
+        forks = features.forks
+        hits = features.hits('description', 'topics', 'category')
 
         # Score components
         undiscovered_score = 0.0
@@ -100,7 +128,7 @@ class HiddenGemScorer:
         multiplier_scores = []
 
         for keyword, mult in cls.AGENTDB_MULTIPLIER_KEYWORDS.items():
-            if keyword in text:
+            if keyword in hits:
                 multiplier_scores.append(mult)
 
         # Compound multipliers (multiple matches = exponential value)
@@ -117,48 +145,30 @@ class HiddenGemScorer:
             agentdb_multiplier = min(agentdb_multiplier, 50.0)
 
         # 3. PAIN POINT SCORE (0-2 points)
-        # Does it solve a real problem?
-        pain_indicators = [
-            'problem', 'solution', 'fix', 'simplify', 'easier',
-            'better', 'improve', 'manage', 'organize', 'track',
-            'automate', 'faster', 'efficient', 'productivity'
-        ]
-
-        pain_point_score = sum(1.0 for word in pain_indicators if word in text)
+        pain_point_score = sum(1.0 for word in cls.PAIN_INDICATORS if word in hits)
         pain_point_score = min(pain_point_score * 0.5, 2.0)
 
         # 4. SIMPLICITY SCORE (0-2 points)
-        # How easy is it to add AgentDB?
-        simple_indicators = [
-            'simple', 'minimal', 'lightweight', 'small', 'basic',
-            'starter', 'boilerplate', 'template', 'example'
-        ]
-
-        simplicity_score = sum(1.0 for word in simple_indicators if word in text)
+        simplicity_score = sum(1.0 for word in cls.SIMPLE_INDICATORS if word in hits)
         simplicity_score = min(simplicity_score * 0.5, 2.0)
 
         # Bonus: Simple languages/frameworks
-        if language in ['javascript', 'typescript', 'python', 'go']:
+        if features.language in cls.SIMPLE_LANGUAGES:
             simplicity_score += 0.5
 
         # 5. NOVELTY SCORE (0-3 points)
         # Is this a new/unique idea?
-        novelty_score = sum(1.0 for word in cls.NOVELTY_KEYWORDS if word in text)
+        novelty_score = sum(1.0 for word in cls.NOVELTY_KEYWORDS if word in hits)
         novelty_score = min(novelty_score * 0.5, 3.0)
 
         # Recent creation = more novel
-        created_at = repo.get('created_at')
-        if created_at:
-            try:
-                created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                days_old = (datetime.now(created_date.tzinfo) - created_date).days
-
-                if days_old < 180:  # Less than 6 months
-                    novelty_score += 1.5
-                elif days_old < 365:  # Less than 1 year
-                    novelty_score += 1.0
-            except:
-                pass
+        if features.created_us is not None:
+            days_old = (epoch_microseconds(datetime.now(timezone.utc)) - features.created_us) // MICROSECONDS_PER_DAY
+
+            if days_old < 180:  # Less than 6 months
+                novelty_score += 1.5
+            elif days_old < 365:  # Less than 1 year
+                novelty_score += 1.0
 
         # Calculate final scores
         base_score = (
@@ -188,20 +198,179 @@ class HiddenGemScorer:
             'is_hidden_gem': hidden_gem_score >= 10.0 and stars < 500,
             'multiplier_reasons': [
                 kw for kw in cls.AGENTDB_MULTIPLIER_KEYWORDS.keys()
-                if kw in text
+                if kw in hits
             ]
         }
 
 
+    @classmethod
+    def columns(cls, repos: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Columnar arrays of the fields score_hidden_gem reads
+
+        created_us is microseconds since the epoch (created_valid marks rows
+        with a parseable created_at); hits is the keyword-hit matrix over
+        HIT_COLUMNS. Only these fields are extracted: building full feature
+        records costs more than scoring a batch.
+        """
+        n = len(repos)
+        stars = np.zeros(n, dtype=np.int64)
+        forks = np.zeros(n, dtype=np.int64)
+        created_us = np.zeros(n, dtype=np.int64)
+        created_valid = np.zeros(n, dtype=bool)
+        simple_language = np.zeros(n, dtype=bool)
+        hits = np.zeros((n, len(cls.HIT_COLUMNS)), dtype=bool)
+
+        column_index: Dict[str, List[int]] = {}
+        for j, keyword in enumerate(cls.HIT_COLUMNS):
+            column_index.setdefault(keyword, []).append(j)
+
+        for i, repo in enumerate(repos):
+            stars[i] = repo.get('stars', 0)
+            forks[i] = repo.get('forks', 0)
+
+            description = (repo.get('description') or '').lower()
+            topics = [t.lower() for t in repo.get('topics', [])]
+            category = (repo.get('category') or '').lower()
+            simple_language[i] = (repo.get('language') or '').lower() in cls.SIMPLE_LANGUAGES
+
+            for keyword in cls.KEYWORDS.hits(f"{description} {' '.join(topics)} {category}"):
+                for j in column_index.get(keyword, ()):
+                    hits[i, j] = True
+
+            created = parse_created(repo.get('created_at'))
+            if created is not None:
+                created_us[i] = created
+                created_valid[i] = True
+
+        return {
+            'stars': stars,
+            'forks': forks,
+            'created_us': created_us,
+            'created_valid': created_valid,
+            'simple_language': simple_language,
+            'hits': hits,
+        }
+
+    @classmethod
+    def score_batch(cls, columns: Dict[str, np.ndarray], now: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """
+        Vectorized score_hidden_gem over columns() output
+
+        Returns unrounded score arrays computed with the same float
+        operations in the same order as the scalar path, so rounding them
+        gives identical results. `now` defaults to the current time, taken
+        once for the whole batch.
+        """
+        stars = columns['stars']
+        forks = columns['forks']
+        hits = columns['hits']
+
+        n_mult = len(cls.AGENTDB_MULTIPLIER_KEYWORDS)
+        n_pain = len(cls.PAIN_INDICATORS)
+        n_simple = len(cls.SIMPLE_INDICATORS)
+        mult_hits = hits[:, :n_mult]
+        pain_hits = hits[:, n_mult:n_mult + n_pain]
+        simple_hits = hits[:, n_mult + n_pain:n_mult + n_pain + n_simple]
+        novelty_hits = hits[:, n_mult + n_pain + n_simple:]
+
+        # 1. Undiscovered
+        undiscovered = np.select(
+            [stars < 50, stars < 100, stars < 250, stars < 500],
+            [3.0, 2.5, 2.0, 1.5],
+            default=0.0
+        )
+        undiscovered = undiscovered + np.where((forks > 0) & (stars < 100), 1.0, 0.0)
+
+        # 2. AgentDB multiplier: mean of the top 3 matched multipliers, x1.5 for 3+ matches, cap 50
+        values = np.where(mult_hits, np.array(list(cls.AGENTDB_MULTIPLIER_KEYWORDS.values())), 0.0)
+        values = -np.sort(-values, axis=1)
+        match_count = mult_hits.sum(axis=1)
+
+        top_3_sum = values[:, 0] + values[:, 1] + values[:, 2]
+        multiplier = np.where(match_count > 0, top_3_sum / np.maximum(np.minimum(match_count, 3), 1), 1.0)
+        multiplier = np.where(match_count >= 3, multiplier * 1.5, multiplier)
+        multiplier = np.where(match_count > 0, np.minimum(multiplier, 50.0), multiplier)
+
+        # 3. Pain point
+        pain = np.minimum(pain_hits.sum(axis=1) * 0.5, 2.0)
+
+        # 4. Simplicity
+        simplicity = np.minimum(simple_hits.sum(axis=1) * 0.5, 2.0)
+        simplicity = simplicity + np.where(columns['simple_language'], 0.5, 0.0)
+
+        # 5. Novelty, plus a bonus for repos created in the last 6 / 12 months
+        novelty = np.minimum(novelty_hits.sum(axis=1) * 0.5, 3.0)
+        now_us = epoch_microseconds(now or datetime.now(timezone.utc))
+        days_old = (now_us - columns['created_us']) // MICROSECONDS_PER_DAY
+        valid = columns['created_valid']
+        novelty = novelty + np.select(
+            [valid & (days_old < 180), valid & (days_old < 365)],
+            [1.5, 1.0],
+            default=0.0
+        )
+
+        base_score = undiscovered + pain + simplicity + novelty
+        hidden_gem_score = base_score * (multiplier / 10.0)
+        base_value = np.maximum(stars * 50, 1000).astype(np.float64)
+
+        return {
+            'hidden_gem_score': hidden_gem_score,
+            'undiscovered_score': undiscovered,
+            'agentdb_multiplier': multiplier,
+            'pain_point_score': pain,
+            'simplicity_score': simplicity,
+            'novelty_score': novelty,
+            'base_value': base_value,
+            'value_with_agentdb': base_value * multiplier,
+            'is_hidden_gem': (hidden_gem_score >= 10.0) & (stars < 500),
+        }
+
+    @classmethod
+    def score_many(cls, repos: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """score_hidden_gem results for many repos, computed with score_batch"""
+        columns = cls.columns(repos)
+        scores = {name: values.tolist() for name, values in cls.score_batch(columns, now).items()}
+        reasons = columns['hits'][:, :len(cls.AGENTDB_MULTIPLIER_KEYWORDS)].tolist()
+        keywords = list(cls.AGENTDB_MULTIPLIER_KEYWORDS)
+
+        results = []
+        for i in range(len(repos)):
+            multiplier = scores['agentdb_multiplier'][i]
+            results.append({
+                'hidden_gem_score': round(scores['hidden_gem_score'][i], 2),
+                'undiscovered_score': round(scores['undiscovered_score'][i], 1),
+                'agentdb_multiplier': round(multiplier, 1),
+                'pain_point_score': round(scores['pain_point_score'][i], 1),
+                'simplicity_score': round(scores['simplicity_score'][i], 1),
+                'novelty_score': round(scores['novelty_score'][i], 1),
+                'base_value': f"${int(scores['base_value'][i]/1000)}K",
+                'value_with_agentdb': f"${int(scores['value_with_agentdb'][i]/1000)}K",
+                'value_increase': f"{int(multiplier)}x",
+                'is_hidden_gem': scores['is_hidden_gem'][i],
+                'multiplier_reasons': [kw for kw, hit in zip(keywords, reasons[i]) if hit],
+            })
+
+        return results
+
+
 class HiddenGemDiscovery:
     """Discover hidden gems from GitHub"""
 
-    def __init__(self, github_token: str = None):
+    def __init__(self, github_token: TokenSpec = None, search_backend: str = None):
+        # One token or a list of tokens (pooled, see github_client.TokenPool)
         self.token = github_token
-        self.headers = {}
-        if self.token:
-            self.headers['Authorization'] = f'token {self.token}'
-        self.headers['Accept'] = 'application/vnd.github.v3+json'
+        self.client = get_client(self.token)
+
+        # 'rest' (default) or 'graphql' (smaller, projected payloads; needs a token)
+        self.search_backend = search_backend or os.getenv('GITHUB_SEARCH_BACKEND', 'rest')
+        if self.search_backend == 'graphql' and not self.token:
+            print("⚠️  GraphQL search needs a GitHub token - using REST search")
+            self.search_backend = 'rest'
+        self.graphql_pager = GraphQLSearchPager(self.client)
+
+        # Search pages kept downloading while the current one is processed
+        self.prefetch_depth = int(os.getenv('GITHUB_PREFETCH_DEPTH', '2'))
 
     def find_hidden_gems(self, max_stars: int = 500, count: int = 100) -> List[Dict]:
         """
@@ -231,21 +400,22 @@ class HiddenGemDiscovery:
         all_repos = []
         seen_urls = set()
 
-        for query in queries:
+        def search(query: str) -> List[Dict]:
             print(f"  Searching: {query}")
+            return self._search_repos(query, max_results=20)
 
-            repos = self._search_repos(query, max_results=20)
+        # Next queries download while this page is deduplicated
+        fetches = [lambda query=query: search(query) for query in queries]
+        with PagePrefetcher(fetches, depth=self.prefetch_depth, is_new=lambda page: True) as pages:
+            for repos in pages:
+                for repo in repos:
+                    url = repo.get('html_url')
+                    if url not in seen_urls:
+                        seen_urls.add(url)
+                        all_repos.append(repo)
 
-            for repo in repos:
-                url = repo.get('html_url')
-                if url not in seen_urls:
-                    seen_urls.add(url)
-                    all_repos.append(repo)
-
-            if len(all_repos) >= count:
-                break
-
-            time.sleep(1.2)
+                if len(all_repos) >= count:
+                    break
 
         print(f"✅ Found {len(all_repos)} potential gems")
 
@@ -278,43 +448,45 @@ class HiddenGemDiscovery:
 
         return gems[:count]
 
+    def search_page(self, query: str, per_page: int = 100, page: int = 1) -> Tuple[List[Dict], int]:
+        """One search page as (items, total_count) - raises on API errors"""
+        if self.search_backend == 'graphql':
+            items = self.graphql_pager.page(query, sort='updated', per_page=per_page, page=page)
+            return items, self.graphql_pager.total_counts.get((query, 'updated'), 0)
+
+        data = self.client.search_repositories(
+            query,
+            sort='updated',  # Recently updated = active
+            per_page=per_page,
+            page=page
+        )
+        return data.get('items', []), data.get('total_count', 0)
+
     def _search_repos(self, query: str, max_results: int = 20, page: int = 1) -> List[Dict]:
         """Search GitHub with pagination support"""
-        url = "https://api.github.com/search/repositories"
-        params = {
-            'q': query,
-            'sort': 'updated',  # Recently updated = active
-            'order': 'desc',
-            'per_page': max_results,
-            'page': page
-        }
-
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json().get('items', [])
+            items, _ = self.search_page(query, per_page=max_results, page=page)
+            return items
         except Exception as e:
             print(f"  ⚠️  Error: {e}")
             return []
 
+    def fetch_last_commit(self, owner: str, name: str) -> Optional[str]:
+        """Date of the most recent commit (one core API call)"""
+        try:
+            response = self.client.get(f'/repos/{owner}/{name}/commits', params={'per_page': 1})
+            if response.status_code == 200:
+                commits = response.json()
+                if commits:
+                    return commits[0].get('commit', {}).get('committer', {}).get('date')
+        except Exception as e:
+            print(f"  ⚠️  Error: {e}")
+
+        return None
+
     def _categorize(self, repo: Dict) -> str:
         """Categorize repo"""
-        desc = (repo.get('description') or '').lower()
-        topics = [t.lower() for t in repo.get('topics', [])]
-        text = f"{desc} {' '.join(topics)}"
-
-        if any(kw in text for kw in ['chat', 'message', 'conversation']):
-            return 'Communication'
-        elif any(kw in text for kw in ['dashboard', 'analytics', 'monitoring']):
-            return 'Analytics'
-        elif any(kw in text for kw in ['collaborative', 'multiplayer', 'team']):
-            return 'Collaboration'
-        elif any(kw in text for kw in ['realtime', 'live', 'streaming']):
-            return 'Real-time'
-        elif any(kw in text for kw in ['ai', 'ml', 'llm', 'gpt']):
-            return 'AI/ML'
-        else:
-            return 'General'
+        return categorize(repo, 'gem')
 
 
 def main():
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+🔤 Compiled Keyword Matching
+
+Scorers used to run one `kw in text` scan per keyword per table. A
+KeywordMatcher compiles all of a scorer's keyword tables into a single
+trie-shaped regex and returns every keyword found in a text in one pass;
+scorers then test membership in that hit set.
+
+Matching keeps the substring semantics of `kw in text` exactly (no word
+boundaries, so scores don't change):
+- the scan takes the longest keyword at each match position; keywords
+  contained in it are implied hits
+- keywords that start inside a match and run past it are checked only at
+  the offsets where that is possible (precomputed per keyword)
+
+Hit sets are memoized per text, so rescoring a corpus whose descriptions
+haven't changed skips the scan entirely. field_hits() scans several texts
+(e.g. a repo's description and topics) in one pass and splits the hits by
+text.
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Set, Tuple
+
+# Distinct texts whose hit sets are kept per matcher
+HIT_CACHE_SIZE = 65536
+
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation factored by common prefixes, longest match first"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of a keyword
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword ends here: the longer continuations are optional (greedy = longest first)
+        return f"(?:{pattern})?" if '' in node else pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Every keyword of one or more tables, matched in a single scan"""
+
+    def __init__(self, *tables: Iterable[str], cache_size: int = HIT_CACHE_SIZE):
+        self.keywords = sorted({keyword for table in tables for keyword in table if keyword})
+        self.pattern = re.compile(trie_pattern(self.keywords)) if self.keywords else None
+
+        # Keywords found inside each keyword (including itself)
+        self.contained: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(other for other in self.keywords if other in keyword)
+            for keyword in self.keywords
+        }
+
+        # Offsets inside each keyword where another keyword could start and run past its end
+        self.overlap_offsets: Dict[str, Tuple[int, ...]] = {
+            keyword: tuple(
+                offset for offset in range(1, len(keyword))
+                if any(
+                    other.startswith(keyword[offset:]) and len(other) > len(keyword) - offset
+                    for other in self.keywords
+                )
+            )
+            for keyword in self.keywords
+        }
+
+        # field_hits() joins texts with newlines, so no keyword may contain one
+        self.multiline = any('\n' in keyword for keyword in self.keywords)
+
+        self.cached_scan = lru_cache(maxsize=cache_size)(self.scan)
+
+    def hits(self, text: str) -> FrozenSet[str]:
+        """Every keyword that occurs in `text` (same result as `kw in text` per keyword)"""
+        return self.cached_scan(text)
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        if self.pattern is None or not text:
+            return frozenset()
+
+        found: Set[str] = set()
+
+        for match in self.pattern.finditer(text):
+            keyword = match.group()
+            found |= self.contained[keyword]
+
+            start = match.start()
+            for offset in self.overlap_offsets[keyword]:
+                overlap = self.pattern.match(text, start + offset)
+                if overlap:
+                    found |= self.contained[overlap.group()]
+
+        return frozenset(found)
+
+    def field_hits(self, texts: Sequence[str]) -> Tuple[FrozenSet[str], ...]:
+        """hits() of each text, found in a single scan of the texts joined by newlines"""
+        if self.pattern is None or self.multiline:
+            return tuple(self.scan(text) for text in texts)
+
+        text = '\n'.join(texts)
+        # Offset just past each text's separator; a match can't cross one
+        ends = list(accumulate(len(part) + 1 for part in texts))
+        found: List[Set[str]] = [set() for _ in texts]
+
+        field = 0
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            if start >= ends[field]:
+                field = bisect_right(ends, start, field)
+
+            keyword = match.group()
+            found[field] |= self.contained[keyword]
+
+            for offset in self.overlap_offsets[keyword]:
+                overlap = self.pattern.match(text, start + offset)
+                if overlap:
+                    found[field] |= self.contained[overlap.group()]
+
+        return tuple(frozenset(hits) for hits in found)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+⏩ Prefetching Page Iterator
+
+Keeps the next N search pages downloading in background threads while the
+caller scores and stores the current one, so network latency overlaps
+with CPU and SQLite work.
+
+- Pages are yielded strictly in order
+- Requests still go through the shared GitHub client, so the rate-limit
+  governor and retry policy apply to every prefetched page
+- Iteration stops at the first empty page, or the first page the caller's
+  `is_new` check rejects; pages still in flight are cancelled
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+Page = List[Dict[str, Any]]
+
+
+def numbered_pages(fetch_page: Callable[[int], Page], first: int = 1, last: Optional[int] = None) -> Iterator[Callable[[], Page]]:
+    """Zero-argument fetches for pages first..last (unbounded if last is None)"""
+    page = first
+    while last is None or page <= last:
+        yield lambda page=page: fetch_page(page)
+        page += 1
+
+
+class PagePrefetcher:
+    """Iterate page fetches with up to `depth` of them in flight"""
+
+    def __init__(
+        self,
+        fetches: Iterable[Callable[[], Page]],
+        depth: int = 2,
+        is_new: Optional[Callable[[Page], bool]] = None
+    ):
+        self.fetches = iter(fetches)
+        self.depth = max(1, depth)
+        self.is_new = is_new or bool
+        self.executor = ThreadPoolExecutor(max_workers=self.depth, thread_name_prefix='prefetch')
+        self.in_flight: Deque[Future] = deque()
+        self.exhausted = False
+
+    def submit_next(self):
+        if self.exhausted:
+            return
+
+        fetch = next(self.fetches, None)
+        if fetch is None:
+            self.exhausted = True
+            return
+
+        self.in_flight.append(self.executor.submit(fetch))
+
+    def __iter__(self) -> Iterator[Page]:
+        try:
+            while len(self.in_flight) < self.depth and not self.exhausted:
+                self.submit_next()
+
+            while self.in_flight:
+                page = self.in_flight.popleft().result()
+
+                if not self.is_new(page):
+                    return  # Nothing new here - later pages won't have more
+
+                # Refill before handing the page over, so the fetch overlaps scoring
+                self.submit_next()
+                yield page
+        finally:
+            self.close()
+
+    def close(self):
+        """Cancel pages not yet started and release the worker threads"""
+        self.exhausted = True
+        for future in self.in_flight:
+            future.cancel()
+        self.in_flight.clear()
+        self.executor.shutdown(wait=False)
+
+    def __enter__(self) -> 'PagePrefetcher':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
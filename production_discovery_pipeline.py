@@ -14,8 +14,12 @@ from advanced_discovery_engine import (
     AdvancedEmbedding,
     FastMoneyScorer,
     MultiSourceDiscovery,
-    AdvancedVectorDB
+    AdvancedVectorDB,
+    has_recent_activity
 )
+from github_client import tokens_from_env
+from repo_categorizer import CATEGORIZER, categorize
+from repo_features import FEATURES
 
 def process_existing_repos():
     """Process all 42 existing discoveries with new engine"""
@@ -34,12 +38,9 @@ def process_existing_repos():
     processed = []
     improvements = []
 
-    for i, repo in enumerate(repos, 1):
-        project = repo['project']
-        old_score = repo['monetization']['revenue_potential_score']
-
-        # Prepare repo data
-        repo_data = {
+    # Prepare repo data
+    repo_datas = [
+        {
             'name': repo['repository']['name'],
             'description': repo['repository']['description'],
             'category': repo['repository']['category'],
@@ -49,12 +50,19 @@ def process_existing_repos():
             'forks': repo['repository']['forks'],
             'recent_activity': True,  # Assume active
         }
+        for repo in repos
+    ]
+
+    # Calculate new fast-money scores in one batch
+    scores = FastMoneyScorer.score_many(repo_datas)
+
+    for i, (repo, repo_data, score_data) in enumerate(zip(repos, repo_datas, scores), 1):
+        project = repo['project']
+        old_score = repo['monetization']['revenue_potential_score']
 
         # Generate advanced embedding
         embedding = AdvancedEmbedding.generate(repo_data)
 
-        # Calculate new fast-money score
-        score_data = FastMoneyScorer.score(repo_data)
         new_score = score_data['total_score']
 
         # Track improvement
@@ -132,7 +140,7 @@ def discover_new_repos(count_target: int = 100):
     print(f"🔍 DISCOVERING NEW REPOSITORIES (Target: {count_target})")
     print(f"{'='*70}")
 
-    discovery = MultiSourceDiscovery()
+    discovery = MultiSourceDiscovery(tokens_from_env())
     db = AdvancedVectorDB("advanced_vectors.db")
 
     all_discoveries = []
@@ -142,10 +150,7 @@ def discover_new_repos(count_target: int = 100):
     trending = discovery.discover_trending(language='', since='weekly')
     print(f"   Found {len(trending)} trending repos")
 
-    for repo in trending:
-        processed = process_github_repo(repo, db)
-        if processed:
-            all_discoveries.append(processed)
+    all_discoveries.extend(process_github_repos(trending, db))
 
     # Strategy 2: Topic-based discovery
     print("\n2. Topic-Based Discovery...")
@@ -160,14 +165,18 @@ def discover_new_repos(count_target: int = 100):
         print(f"   Searching topic: {topic}...")
         repos = discovery.discover_by_topic(topic, min_stars=200)
 
-        for repo in repos:
-            processed = process_github_repo(repo, db)
-            if processed:
-                all_discoveries.append(processed)
+        all_discoveries.extend(process_github_repos(repos, db))
 
         if len(all_discoveries) >= count_target:
             break
 
+    # Strategy 3: Repos linked from awesome lists
+    print("\n3. Awesome List Links...")
+    known = {f"{disc['owner']}/{disc['project']}" for disc in all_discoveries}
+    linked = discovery.discover_awesome_lists(known=known)
+
+    all_discoveries.extend(process_github_repos(linked, db))
+
     # Remove duplicates
     seen = set()
     unique_discoveries = []
@@ -185,76 +194,80 @@ def discover_new_repos(count_target: int = 100):
 
 def process_github_repo(repo: Dict, db: AdvancedVectorDB) -> Optional[Dict]:
     """Process a GitHub API repo response"""
+    processed = process_github_repos([repo], db)
+    return processed[0] if processed else None
+
+
+def process_github_repos(repos: List[Dict], db: AdvancedVectorDB) -> List[Dict]:
+    """Process a page of GitHub API repo responses (scored in one batch)"""
+
+    page = []
+    for repo in repos:
+        try:
+            repo_data = {
+                'id': repo.get('id'),
+                'name': repo.get('name', ''),
+                'description': repo.get('description'),
+                'category': categorize_repo(repo),
+                'topics': repo.get('topics', []),
+                'language': repo.get('language'),
+                'stars': repo.get('stargazers_count', 0),
+                'forks': repo.get('forks_count', 0),
+                'recent_activity': has_recent_activity(repo.get('pushed_at')),
+                'license': repo.get('license'),
+            }
+            page.append((repo, repo_data))
+        except Exception as e:
+            print(f"    ⚠️  Error processing repo: {e}")
+
+    if not page:
+        return []
+
+    # Score the whole page at once; the embeddings below read the page's feature records
+    repo_datas = [repo_data for _, repo_data in page]
+    FEATURES.features_many(repo_datas)
+    scores = FastMoneyScorer.score_many(repo_datas)
 
-    try:
-        repo_data = {
-            'name': repo.get('name', ''),
-            'description': repo.get('description'),
-            'category': categorize_repo(repo),
-            'topics': repo.get('topics', []),
-            'language': repo.get('language'),
-            'stars': repo.get('stargazers_count', 0),
-            'forks': repo.get('forks_count', 0),
-            'recent_activity': True,  # Would need to check pushed_at
-        }
-
-        # Generate embedding
-        embedding = AdvancedEmbedding.generate(repo_data)
-
-        # Score
-        score_data = FastMoneyScorer.score(repo_data)
-
+    processed = []
+    for (repo, repo_data), score_data in zip(page, scores):
         # Only store if score >= 6.0
         if score_data['total_score'] < 6.0:
-            return None
+            continue
+
+        try:
+            # Generate embedding
+            embedding = AdvancedEmbedding.generate(repo_data)
+
+            # Prepare metadata
+            metadata = {
+                'project': repo.get('name'),
+                'owner': repo.get('owner', {}).get('login', 'unknown'),
+                'url': repo.get('html_url'),
+                'category': repo_data['category'],
+                'stars': repo_data['stars'],
+                'forks': repo_data['forks'],
+                'language': repo_data['language'],
+                'fast_money_score': score_data['total_score'],
+                'revenue_estimate': score_data['estimated_revenue'],
+                'time_to_market': score_data['time_to_market'],
+                'risk_level': score_data['risk_level'],
+            }
+
+            # Store
+            repo_id = f"{metadata['owner']}/{metadata['project']}"
+            db.store(repo_id, embedding, metadata)
+
+            processed.append(metadata)
+
+        except Exception as e:
+            print(f"    ⚠️  Error processing repo: {e}")
 
-        # Prepare metadata
-        metadata = {
-            'project': repo.get('name'),
-            'owner': repo.get('owner', {}).get('login', 'unknown'),
-            'url': repo.get('html_url'),
-            'category': repo_data['category'],
-            'stars': repo_data['stars'],
-            'forks': repo_data['forks'],
-            'language': repo_data['language'],
-            'fast_money_score': score_data['total_score'],
-            'revenue_estimate': score_data['estimated_revenue'],
-            'time_to_market': score_data['time_to_market'],
-            'risk_level': score_data['risk_level'],
-        }
-
-        # Store
-        repo_id = f"{metadata['owner']}/{metadata['project']}"
-        db.store(repo_id, embedding, metadata)
-
-        return metadata
-
-    except Exception as e:
-        print(f"    ⚠️  Error processing repo: {e}")
-        return None
+    return processed
 
 
 def categorize_repo(repo: Dict) -> str:
     """Categorize GitHub repo"""
-
-    desc = (repo.get('description') or '').lower()
-    topics = [t.lower() for t in repo.get('topics', [])]
-    text = f"{desc} {' '.join(topics)}"
-
-    if any(kw in text for kw in ['security', 'pentest', 'vulnerability']):
-        return 'Security Tools'
-    elif any(kw in text for kw in ['ai', 'ml', 'machine learning', 'llm']):
-        return 'AI/ML Tools'
-    elif any(kw in text for kw in ['devops', 'kubernetes', 'deployment']):
-        return 'DevOps Tools'
-    elif any(kw in text for kw in ['api', 'framework', 'library']):
-        return 'Developer Framework'
-    elif any(kw in text for kw in ['analytics', 'dashboard', 'monitoring']):
-        return 'Analytics Platform'
-    elif any(kw in text for kw in ['database', 'storage', 'sql']):
-        return 'Database Technology'
-    else:
-        return 'General Software'
+    return categorize(repo, 'market')
 
 
 def generate_final_report():
@@ -365,6 +378,13 @@ def main():
         print(f"✅ New repos discovered: {len(new_repos)}")
         print(f"✅ Total fast-money opportunities: {report['statistics']['fast_money_count']}")
 
+        categorizer = CATEGORIZER.stats()
+        print(f"🏷️  Categorizer cache: {categorizer['hits']} hits / {categorizer['misses']} misses "
+              f"({categorizer['hit_rate']:.0%})")
+        features = FEATURES.stats()
+        print(f"🧬 Feature store: {features['hits']} hits / {features['misses']} misses "
+              f"({features['hit_rate']:.0%}), {features['loaded']} loaded / {features['stored']} stored")
+
         # Summary insights
         print(f"\n💡 KEY INSIGHTS:")
         print(f"   • Average score: {report['statistics']['avg_score']}/10")
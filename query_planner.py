@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+🗺️ Date-Sliced Search Query Planner
+
+GitHub search returns at most 1000 results per query, however large its
+`total_count`. The planner covers the full result set anyway:
+
+- The first page of a query (per_page=100) doubles as the probe: it
+  reports `total_count` and is kept whenever the query fits under the cap
+- A query over the cap is split into `created:` (or `pushed:`) date
+  slices sized from its total_count; slices still over the cap split again
+- Each slice is then paged only as far as its own total_count needs
+
+Every request made is either a page of new results or one probe per split.
+With a CrawlFrontier attached, progress is persisted per slice: known
+splits are replayed without probing, partly read slices resume at their
+next page, and finished slices are skipped until their refresh is due.
+"""
+
+import math
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from crawl_frontier import CrawlFrontier
+
+SEARCH_RESULT_CAP = 1000
+MAX_PER_PAGE = 100
+
+# Oldest useful bound for created:/pushed: slices (GitHub launched in 2008)
+EARLIEST_DATE = date(2008, 1, 1)
+
+# search_page(query, per_page, page) -> (items, total_count)
+SearchPageFn = Callable[[str, int, int], Tuple[List[Dict[str, Any]], int]]
+
+
+def slice_query(query: str, field: str, start: date, end: date) -> str:
+    """Add a `field:start..end` qualifier to a search query"""
+    return f"{query} {field}:{start.isoformat()}..{end.isoformat()}"
+
+
+def split_range(start: date, end: date, parts: int) -> List[Tuple[date, date]]:
+    """Split an inclusive date range into up to `parts` contiguous ranges"""
+    days = (end - start).days + 1
+    parts = max(1, min(parts, days))
+    step = days / parts
+
+    ranges = []
+    for i in range(parts):
+        lo = start + timedelta(days=int(i * step))
+        hi = start + timedelta(days=int((i + 1) * step) - 1)
+        ranges.append((lo, hi))
+    return ranges
+
+
+class QueryPlanner:
+    """Walks every result of a search query, slicing past the 1000-result cap"""
+
+    def __init__(
+        self,
+        search_page: SearchPageFn,
+        field: str = 'created',
+        per_page: int = MAX_PER_PAGE,
+        frontier: Optional[CrawlFrontier] = None
+    ):
+        self.search_page = search_page
+        self.field = field
+        self.per_page = min(per_page, MAX_PER_PAGE)
+        self.frontier = frontier
+        self.stats = {'requests': 0, 'splits': 0, 'capped_slices': 0, 'resumed': 0, 'skipped': 0}
+
+    def fetch(self, query: str, page: int) -> Tuple[List[Dict[str, Any]], int]:
+        self.stats['requests'] += 1
+        return self.search_page(query, self.per_page, page)
+
+    def page_count(self, total_count: int) -> int:
+        """Pages needed to read min(total_count, cap) results"""
+        return math.ceil(min(total_count, SEARCH_RESULT_CAP) / self.per_page)
+
+    @staticmethod
+    def split_parts(total_count: int) -> int:
+        """Slices to split an over-cap query into (deterministic, so splits replay)"""
+        return math.ceil(total_count / SEARCH_RESULT_CAP) + 1
+
+    @staticmethod
+    def split_children(lo: date, hi: date, parts: int, split_end: date) -> List[Tuple[date, date]]:
+        """
+        Sub-slices of lo..hi, with boundaries fixed by an earlier split
+
+        Anything after split_end (open-ended root queries grow daily)
+        becomes one extra trailing slice instead of moving every boundary.
+        """
+        split_end = min(split_end, hi)
+        children = split_range(lo, split_end, parts)
+        if split_end < hi:
+            children.append((split_end + timedelta(days=1), hi))
+        return children
+
+    def record(
+        self,
+        query: str,
+        page: int,
+        pages: int,
+        total_count: int,
+        split_end: Optional[date] = None
+    ):
+        if self.frontier is not None:
+            split = split_end is not None
+            self.frontier.record(
+                query, page, pages, total_count,
+                split=split, exhausted=not split and page >= pages, split_end=split_end
+            )
+
+    def complete(self, planned: Dict[str, Any]):
+        """Record a page yielded by `pages()` as crawled (call after processing its items)"""
+        if not planned['split']:
+            self.record(planned['query'], planned['page'], planned['pages'], planned['total_count'])
+
+    def pages(
+        self,
+        query: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one planned page per search request
+
+        Each item is {'query', 'page', 'pages', 'total_count', 'items', 'split'};
+        split probes carry no items. Exactly one request is made per item,
+        so callers can rate-limit each `next()` call.
+
+        A page only counts as crawled once the caller hands it back to
+        `complete()` after processing its items, so a run that stops between
+        fetching and scoring a page fetches it again on resume.
+        """
+        start = start or EARLIEST_DATE
+        end = end or date.today()
+
+        # None = the unsliced root query
+        pending: List[Optional[Tuple[date, date]]] = [None]
+
+        while pending:
+            date_range = pending.pop()
+            sliced = query if date_range is None else slice_query(query, self.field, *date_range)
+            lo, hi = date_range or (start, end)
+
+            state = self.frontier.lookup(sliced) if self.frontier is not None else None
+            previous_split = state if state and state['split'] and state['split_end'] else None
+
+            if state and state['due']:
+                state = None  # Refresh: probe again from page 1
+
+            if state and state['split']:
+                # Replay a known split without probing again
+                pending.extend(reversed(self.split_children(lo, hi, state['pages'], state['split_end'])))
+                continue
+
+            if state and state['exhausted']:
+                self.stats['skipped'] += 1
+                continue
+
+            if state:
+                # Partly read: continue after the last fetched page
+                self.stats['resumed'] += 1
+                total_count = state['total_count']
+                pages = state['pages']
+                first_page = state['last_page'] + 1
+            else:
+                items, total_count = self.fetch(sliced, 1)
+
+                if total_count > SEARCH_RESULT_CAP and lo < hi:
+                    # Size slices from the count; denser slices split again.
+                    # A refreshed split keeps its old boundaries.
+                    if previous_split:
+                        parts, split_end = previous_split['pages'], min(previous_split['split_end'], hi)
+                    else:
+                        parts, split_end = self.split_parts(total_count), hi
+
+                    pending.extend(reversed(self.split_children(lo, hi, parts, split_end)))
+                    self.stats['splits'] += 1
+                    self.record(sliced, 1, parts, total_count, split_end=split_end)
+
+                    yield {'query': sliced, 'page': 1, 'pages': 0, 'total_count': total_count,
+                           'items': [], 'split': True}
+                    continue
+
+                if total_count > SEARCH_RESULT_CAP:
+                    # A single day over the cap: only the first 1000 are reachable
+                    self.stats['capped_slices'] += 1
+
+                pages = self.page_count(total_count)
+                first_page = 2
+
+                yield {'query': sliced, 'page': 1, 'pages': pages, 'total_count': total_count,
+                       'items': items, 'split': False}
+
+            for page in range(first_page, pages + 1):
+                items, _ = self.fetch(sliced, page)
+                if not items:
+                    self.record(sliced, pages, pages, total_count)  # Ran dry early
+                    break
+
+                yield {'query': sliced, 'page': page, 'pages': pages, 'total_count': total_count,
+                       'items': items, 'split': False}
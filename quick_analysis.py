@@ -4,12 +4,12 @@ Quick analysis focusing on most promising users with batched API calls.
 """
 
 import json
-import requests
-import time
 from datetime import datetime, timedelta
 from typing import List, Dict
 
-HEADERS = {'Accept': 'application/vnd.github.v3+json'}
+from github_client import get_client
+
+CLIENT = get_client()
 
 def load_stargazers():
     with open('/media/terry/data/projects/projects/getidea-git-bank/stargazers_data.json', 'r') as f:
@@ -43,7 +43,7 @@ def get_top_users():
 
 def fetch_repos_batch(username, max_repos=50):
     """Fetch repos with aggressive filtering."""
-    url = f'https://api.github.com/users/{username}/repos'
+    url = f'/users/{username}/repos'
     params = {
         'per_page': 100,
         'sort': 'stargazers',
@@ -52,7 +52,7 @@ def fetch_repos_batch(username, max_repos=50):
     }
 
     try:
-        response = requests.get(url, headers=HEADERS, params=params, timeout=10)
+        response = CLIENT.get(url, params=params)
 
         if response.status_code == 403:
             return None  # Rate limited
@@ -213,8 +213,6 @@ def main():
         if result:
             all_opportunities.extend(result)
 
-        time.sleep(1)  # Rate limit protection
-
     # Sort by score
     all_opportunities.sort(key=lambda x: (x['score'], x['stars']), reverse=True)
 
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+🚦 Cross-Process GitHub Rate-Limit Governor
+
+Every discovery script running on one machine (start_all.sh, cron jobs,
+manual runs) shares the same token budget. Instead of each keeping its own
+guess, they all hand out request tokens from one SQLite file.
+
+- Budgets are tracked per token and per GitHub resource (core/search/graphql)
+- Every response's X-RateLimit-Remaining / X-RateLimit-Reset headers
+  correct the shared state, so the budget is never over- or under-used
+- When a bucket is empty, callers sleep until its reset time instead of
+  colliding on 403s
+
+MultiBucketLimiter is the in-process counterpart: one asyncio-friendly
+token bucket per resource with its own refill schedule.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+# Set GITHUB_GOVERNOR_DB='' to disable the shared governor
+GOVERNOR_DB_PATH = os.getenv('GITHUB_GOVERNOR_DB', 'github_rate_governor.db')
+
+# Documented budgets used until the first response headers arrive:
+# resource -> (authenticated limit, anonymous limit, window seconds)
+DEFAULT_LIMITS = {
+    'core': (5000, 60, 3600),
+    'search': (30, 10, 60),
+    'graphql': (5000, 60, 3600),  # Anonymous GraphQL is rejected outright anyway
+}
+
+# Multiplies the default budgets, e.g. against fake_github_server.py --rate-scale
+RATE_LIMIT_SCALE = float(os.getenv('GITHUB_RATE_LIMIT_SCALE', '1'))
+
+
+def token_fingerprint(token: Optional[str]) -> str:
+    """Short, non-reversible id for a token (never store the token itself)"""
+    if not token:
+        return 'anonymous'
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:12]
+
+
+class RateLimitGovernor:
+    """Shared, header-driven token bucket per (token, resource)"""
+
+    def __init__(self, db_path: str = GOVERNOR_DB_PATH):
+        self.db_path = db_path
+        self.init_database()
+
+    def connect(self) -> sqlite3.Connection:
+        # isolation_level=None: we manage BEGIN IMMEDIATE ourselves
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def init_database(self):
+        conn = self.connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                bucket TEXT PRIMARY KEY,
+                limit_total INTEGER,
+                remaining INTEGER,
+                reset_at REAL,
+                updated_at REAL
+            )
+        """)
+        conn.close()
+
+    @staticmethod
+    def bucket_key(fingerprint: str, resource: str) -> str:
+        return f"{fingerprint}:{resource}"
+
+    @staticmethod
+    def default_bucket(fingerprint: str, resource: str) -> tuple:
+        """(limit, remaining, reset_at) before any headers have been seen"""
+        auth_limit, anon_limit, window = DEFAULT_LIMITS.get(resource, DEFAULT_LIMITS['core'])
+        limit = int((anon_limit if fingerprint == 'anonymous' else auth_limit) * RATE_LIMIT_SCALE)
+        return limit, limit, time.time() + window
+
+    def try_acquire(self, fingerprint: str, resource: str) -> float:
+        """
+        Take one request from the bucket
+
+        Returns 0 on success, otherwise the seconds until the bucket resets.
+        """
+        key = self.bucket_key(fingerprint, resource)
+        now = time.time()
+
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT limit_total, remaining, reset_at FROM rate_buckets WHERE bucket = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                limit, remaining, reset_at = self.default_bucket(fingerprint, resource)
+            else:
+                limit, remaining, reset_at = row
+                if reset_at <= now:
+                    # Window rolled over - full budget until headers say otherwise
+                    default_limit, _, reset_at = self.default_bucket(fingerprint, resource)
+                    limit = limit or default_limit
+                    remaining = limit
+
+            if remaining <= 0:
+                conn.execute("""
+                    INSERT OR REPLACE INTO rate_buckets
+                    (bucket, limit_total, remaining, reset_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (key, limit, remaining, reset_at, now))
+                conn.execute("COMMIT")
+                return max(reset_at - now, 0.1)
+
+            conn.execute("""
+                INSERT OR REPLACE INTO rate_buckets
+                (bucket, limit_total, remaining, reset_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (key, limit, remaining - 1, reset_at, now))
+            conn.execute("COMMIT")
+            return 0.0
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def acquire(self, fingerprint: str, resource: str):
+        """Block until a request is available in the shared bucket"""
+        while True:
+            wait_seconds = self.try_acquire(fingerprint, resource)
+            if wait_seconds <= 0:
+                return
+
+            print(f"⏸️  {resource} budget exhausted (shared). Waiting {int(wait_seconds)}s for reset...", flush=True)
+            time.sleep(min(wait_seconds + 1, 60))
+
+    def update_from_headers(self, fingerprint: str, resource: str, headers: Mapping[str, str]):
+        """Correct the shared bucket from a response's X-RateLimit-* headers"""
+        if 'X-RateLimit-Remaining' not in headers or 'X-RateLimit-Reset' not in headers:
+            return  # Cached response or non-API reply
+
+        resource = headers.get('X-RateLimit-Resource', resource)
+        remaining = int(headers['X-RateLimit-Remaining'])
+        reset_at = float(headers['X-RateLimit-Reset'])
+        limit = int(headers.get('X-RateLimit-Limit', remaining))
+        key = self.bucket_key(fingerprint, resource)
+
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT remaining, reset_at FROM rate_buckets WHERE bucket = ?",
+                (key,)
+            ).fetchone()
+
+            if row is not None and abs(row[1] - reset_at) < 2:
+                # Same window: other processes may have spent more since this reply
+                remaining = min(remaining, row[0])
+
+            conn.execute("""
+                INSERT OR REPLACE INTO rate_buckets
+                (bucket, limit_total, remaining, reset_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (key, limit, remaining, reset_at, time.time()))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Current view of every bucket"""
+        conn = self.connect()
+        rows = conn.execute(
+            "SELECT bucket, limit_total, remaining, reset_at FROM rate_buckets"
+        ).fetchall()
+        conn.close()
+
+        return {
+            bucket: {
+                'limit': limit,
+                'remaining': remaining,
+                'resets_in': max(int(reset_at - time.time()), 0),
+            }
+            for bucket, limit, remaining, reset_at in rows
+        }
+
+
+class TokenBucket:
+    """In-process token bucket refilled continuously over its window"""
+
+    def __init__(self, capacity: int, window_seconds: float):
+        self.capacity = capacity
+        self.refill_rate = capacity / window_seconds  # tokens per second
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.used = 0
+        # Taken from the event loop and from planner worker threads
+        self.lock = threading.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def wait_time(self) -> float:
+        """Seconds until one token is available (0 if available now)"""
+        self.refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.refill_rate
+
+    def take(self):
+        self.tokens -= 1
+        self.used += 1
+
+    def try_take(self) -> float:
+        """Take a token if one is available; returns 0, else the seconds to wait"""
+        with self.lock:
+            wait_seconds = self.wait_time()
+            if wait_seconds <= 0:
+                self.take()
+            return wait_seconds
+
+
+class MultiBucketLimiter:
+    """
+    One token bucket per GitHub resource
+
+    Search (30/min) and core (5000/h) have separate budgets and refill
+    schedules, so a discovery loop can keep both saturated instead of
+    treating every call as part of one hourly budget.
+    """
+
+    def __init__(self, authenticated: bool = True, tokens: int = 1):
+        # Budgets are per token, so a pool of N tokens gets N times the capacity
+        self.buckets = {}
+        for resource, (auth_limit, anon_limit, window) in DEFAULT_LIMITS.items():
+            capacity = int((auth_limit if authenticated else anon_limit) * tokens * RATE_LIMIT_SCALE)
+            self.buckets[resource] = TokenBucket(capacity, window)
+
+    async def acquire(self, resource: str):
+        """Wait (without blocking the event loop) for a token in `resource`"""
+        bucket = self.buckets[resource]
+        while True:
+            wait_seconds = bucket.try_take()
+            if wait_seconds <= 0:
+                return
+            await asyncio.sleep(wait_seconds)
+
+    def acquire_blocking(self, resource: str):
+        """Wait (blocking this thread) for a token in `resource`"""
+        bucket = self.buckets[resource]
+        while True:
+            wait_seconds = bucket.try_take()
+            if wait_seconds <= 0:
+                return
+            time.sleep(wait_seconds)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            resource: {
+                'available': int(bucket.tokens),
+                'capacity': bucket.capacity,
+                'used': bucket.used,
+            }
+            for resource, bucket in self.buckets.items()
+        }
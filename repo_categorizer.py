@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+🏷️ Shared Repo Categorizer
+
+Every pipeline labels repos from their description and topics, each with
+its own label set. This categorizer produces all label sets in one pass:
+
+- One compiled KeywordMatcher over every scheme's rules: one scan per repo
+- Each scheme is an ordered rule list (first matching rule wins), the same
+  if/elif order its caller used before
+- Results are memoized by (description, topics), so a repo seen by several
+  stages of a run - or rescored later - is scanned once; hit/miss counts
+  are exposed via stats()
+
+Schemes:
+    gem     hidden gem discovery (HiddenGemDiscovery)
+    market  production pipeline (production_discovery_pipeline)
+    live    live discovery (LiveGitHubDiscovery)
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from keyword_matcher import KeywordMatcher
+
+Rules = List[Tuple[str, List[str]]]
+
+# scheme -> (ordered rules, fallback label)
+CATEGORY_SCHEMES: Dict[str, Tuple[Rules, str]] = {
+    'gem': ([
+        ('Communication', ['chat', 'message', 'conversation']),
+        ('Analytics', ['dashboard', 'analytics', 'monitoring']),
+        ('Collaboration', ['collaborative', 'multiplayer', 'team']),
+        ('Real-time', ['realtime', 'live', 'streaming']),
+        ('AI/ML', ['ai', 'ml', 'llm', 'gpt']),
+    ], 'General'),
+    'market': ([
+        ('Security Tools', ['security', 'pentest', 'vulnerability']),
+        ('AI/ML Tools', ['ai', 'ml', 'machine learning', 'llm']),
+        ('DevOps Tools', ['devops', 'kubernetes', 'deployment']),
+        ('Developer Framework', ['api', 'framework', 'library']),
+        ('Analytics Platform', ['analytics', 'dashboard', 'monitoring']),
+        ('Database Technology', ['database', 'storage', 'sql']),
+    ], 'General Software'),
+    'live': ([
+        ('Security Tools', ['security', 'pentest', 'vulnerability', 'exploit']),
+        ('AI/ML Tools', ['ai', 'ml', 'machine learning', 'neural', 'llm', 'gpt']),
+        ('DevOps Tools', ['devops', 'deployment', 'ci/cd', 'kubernetes', 'docker']),
+        ('Developer Framework', ['api', 'framework', 'library', 'sdk']),
+        ('Analytics Platform', ['dashboard', 'analytics', 'monitoring', 'observability']),
+        ('Database Technology', ['database', 'storage', 'sql', 'nosql']),
+        ('Web Development', ['web', 'frontend', 'react', 'vue', 'angular']),
+        ('Education Platform', ['education', 'tutorial', 'learning', 'course']),
+    ], 'General Software'),
+}
+
+# Distinct (description, topics) pairs kept
+CATEGORY_CACHE_SIZE = 65536
+
+
+class RepoCategorizer:
+    """All category schemes for a repo, memoized by its description and topics"""
+
+    def __init__(self, schemes: Dict[str, Tuple[Rules, str]] = CATEGORY_SCHEMES, cache_size: int = CATEGORY_CACHE_SIZE):
+        self.schemes = schemes
+        self.keywords = KeywordMatcher(*(keywords for rules, _ in schemes.values() for _, keywords in rules))
+        self.cached_labels = lru_cache(maxsize=cache_size)(self.labels)
+
+    def categorize(self, repo: Dict[str, Any]) -> Dict[str, str]:
+        """{scheme: label} for a repo (search item or repo_data dict)"""
+        description = (repo.get('description') or '').lower()
+        topics = tuple(t.lower() for t in repo.get('topics') or [])
+        return dict(self.cached_labels(description, topics))
+
+    def labels(self, description: str, topics: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+        hits = self.keywords.hits(f"{description} {' '.join(topics)}")
+
+        labels = []
+        for scheme, (rules, fallback) in self.schemes.items():
+            label = next((name for name, keywords in rules if any(kw in hits for kw in keywords)), fallback)
+            labels.append((scheme, label))
+
+        return tuple(labels)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hits/misses since start"""
+        info = self.cached_labels.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every pipeline in the process, so one cache serves them all
+CATEGORIZER = RepoCategorizer()
+
+
+def categorize(repo: Dict[str, Any], scheme: str) -> str:
+    """Label of `repo` in one scheme (from the shared categorizer)"""
+    return CATEGORIZER.categorize(repo)[scheme]
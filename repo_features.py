@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+🧬 Shared Repo Feature Store
+
+HiddenGemScorer, FastMoneyScorer, AdvancedEmbedding and AgentDBDetector
+used to lowercase and join a repo's text, scan it for keywords and derive
+log-count / ratio features each on their own. The feature store does that
+work once per repo and every scorer reads the same RepoFeatures record:
+
+- Text: lowercased name, description, category, language, topics and the
+  word tokens of all of them
+- Keyword hits per field, from one KeywordMatcher over every table the
+  scorers register(); no keyword contains whitespace, so the hits of any
+  space-joined combination of fields are the union of the field hits
+- Numbers: counts, log1p counts, fork/star and issue/star ratios, creation
+  time in epoch microseconds, activity and license flags
+
+Records are memoized in process by repo content (features). Pipelines
+load a page's records with features_many before scoring it: records are
+persisted in SQLite as JSON, keyed by repo id + vocabulary signature, and
+reused while the repo's content hash still matches. Each entry point
+registers its own scorers, so each keeps its own rows in a shared DB file.
+Stored hit sets are bitmasks over the sorted vocabulary.
+
+Batch rescoring (the scorers' columns()) doesn't build records: it only
+needs a few fields, and full records cost more than the vectorized
+scoring itself.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+
+# Bump when RepoFeatures fields or their derivation change
+FEATURE_VERSION = 1
+
+# '' disables persistence (in-process memoization only)
+FEATURE_DB = os.getenv('REPO_FEATURE_DB', 'repo_features.db')
+
+# Distinct repo contents whose records are kept in process
+FEATURE_CACHE_SIZE = 65536
+
+# Repo ids per SELECT (SQLite caps bound parameters per statement)
+LOAD_CHUNK_SIZE = 500
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+MICROSECONDS_PER_DAY = 86_400 * 1_000_000
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Fields with their own keyword-hit set (topics are scanned space-joined)
+HIT_FIELDS = ('name', 'description', 'category', 'topics')
+
+ContentKey = Tuple[Any, ...]
+
+
+def epoch_microseconds(moment: datetime) -> int:
+    """Exact integer microseconds since the epoch (naive times are local, like datetime.now())"""
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def parse_created(created_at: Any) -> Optional[int]:
+    """created_at (ISO 8601, 'Z' allowed) in epoch microseconds; None if missing or unparseable"""
+    if not created_at:
+        return None
+    try:
+        return epoch_microseconds(datetime.fromisoformat(created_at.replace('Z', '+00:00')))
+    except (ValueError, TypeError, AttributeError, OverflowError):
+        return None
+
+
+def repo_id(repo: Dict[str, Any]) -> Optional[str]:
+    """Stable identity of a repo dict (search item or repo_data); None if it has none"""
+    if repo.get('id'):
+        return str(repo['id'])
+    if repo.get('full_name'):
+        return repo['full_name'].lower()
+
+    url = repo.get('url') or repo.get('html_url')
+    if url:
+        return url.lower()
+
+    owner = repo.get('owner')
+    if isinstance(owner, str) and owner and repo.get('name'):
+        return f"{owner}/{repo['name']}".lower()
+    return None
+
+
+def content_key(repo: Dict[str, Any]) -> ContentKey:
+    """Every input a RepoFeatures record is derived from, as a hashable tuple"""
+    stars = repo.get('stars', 0)
+    return (
+        repo.get('name'),
+        repo.get('description'),
+        repo.get('category'),
+        tuple(repo.get('topics') or ()),
+        repo.get('language'),
+        stars,
+        repo.get('forks', 0),
+        repo.get('watchers', stars),
+        repo.get('open_issues', 0),
+        repo.get('created_at'),
+        bool(repo.get('recent_activity', False)),
+        repo.get('license') is not None,
+    )
+
+
+class RepoFeatures(NamedTuple):
+    """Text, keyword hits and numeric features of one repo"""
+
+    # Lowercased text
+    name: str
+    description: str
+    category: str
+    language: str
+    topics: Tuple[str, ...]
+    words: Tuple[str, ...]
+
+    # Keywords found in each HIT_FIELDS text
+    name_hits: FrozenSet[str]
+    description_hits: FrozenSet[str]
+    category_hits: FrozenSet[str]
+    topics_hits: FrozenSet[str]
+
+    stars: int
+    forks: int
+    watchers: int
+    open_issues: int
+    log_stars: float
+    log_forks: float
+    log_watchers: float
+    log_open_issues: float
+    fork_ratio: float             # forks / stars (0.0 without stars)
+    issue_ratio: float            # open_issues / stars (0.0 without stars)
+    created_us: Optional[int]     # epoch microseconds; None if missing or unparseable
+    recent_activity: bool
+    has_license: bool
+
+    def hits(self, *fields: str) -> FrozenSet[str]:
+        """Keywords found in the space-joined text of `fields` (all HIT_FIELDS by default)"""
+        found: FrozenSet[str] = frozenset()
+        for field in fields or HIT_FIELDS:
+            found |= getattr(self, f'{field}_hits')
+        return found
+
+
+# Record positions re-encoded for storage (see FeatureStore.encode)
+TOPICS_INDEX = RepoFeatures._fields.index('topics')
+HIT_INDEXES = tuple(RepoFeatures._fields.index(f'{field}_hits') for field in HIT_FIELDS)
+WORDS_INDEX = RepoFeatures._fields.index('words')
+
+
+def extract_features(key: ContentKey, keywords: KeywordMatcher) -> RepoFeatures:
+    """Build the record for one content_key()"""
+    name, description, category, topics, language, stars, forks, watchers, open_issues, \
+        created_at, recent_activity, has_license = key
+
+    name = (name or '').lower()
+    description = (description or '').lower()
+    category = (category or '').lower()
+    language = (language or '').lower()
+    topics = tuple(t.lower() for t in topics)
+    topic_text = ' '.join(topics)
+    name_hits, description_hits, category_hits, topics_hits = keywords.field_hits((name, description, category, topic_text))
+
+    return RepoFeatures(
+        name=name,
+        description=description,
+        category=category,
+        language=language,
+        topics=topics,
+        words=tuple(WORD_PATTERN.findall(f"{name} {description} {category} {topic_text}")),
+        name_hits=name_hits,
+        description_hits=description_hits,
+        category_hits=category_hits,
+        topics_hits=topics_hits,
+        stars=stars,
+        forks=forks,
+        watchers=watchers,
+        open_issues=open_issues,
+        log_stars=float(np.log1p(stars)),
+        log_forks=float(np.log1p(forks)),
+        log_watchers=float(np.log1p(watchers)),
+        log_open_issues=float(np.log1p(open_issues)),
+        fork_ratio=forks / stars if stars > 0 else 0.0,
+        issue_ratio=open_issues / stars if stars > 0 else 0.0,
+        created_us=parse_created(created_at),
+        recent_activity=recent_activity,
+        has_license=has_license,
+    )
+
+
+class FeatureStore:
+    """RepoFeatures records, memoized by content and persisted by repo id + content hash"""
+
+    def __init__(self, db_path: str = FEATURE_DB, cache_size: int = FEATURE_CACHE_SIZE):
+        self.db_path = db_path
+        self.vocabulary: FrozenSet[str] = frozenset()
+        self.signature = ''
+        self.keyword_bits: Dict[str, int] = {}
+        # Records are memoized below, so the matcher keeps no per-text cache of its own
+        self.keywords = KeywordMatcher(cache_size=0)
+        self.cached_features = lru_cache(maxsize=cache_size)(self.compute)
+        self.cached_hit_set = lru_cache(maxsize=cache_size)(self.hit_set)
+        # Records read from SQLite by features_many, served by features() ahead of the memo
+        self.loaded: Dict[ContentKey, RepoFeatures] = {}
+        self.cache_size = cache_size
+        self.counts = {'loaded': 0, 'stored': 0}
+        self.database_ready = False
+
+    def register(self, *tables: Iterable[str]) -> Tuple[str, ...]:
+        """
+        Add a scorer's keyword tables to the shared vocabulary
+
+        Returns the scorer's own keywords, sorted (e.g. for hit-matrix
+        columns). Memoized records are dropped when the vocabulary grows.
+        """
+        keywords = tuple(sorted({keyword for table in tables for keyword in table if keyword}))
+        spaced = [keyword for keyword in keywords if any(char.isspace() for char in keyword)]
+        if spaced:
+            raise ValueError(f"Feature keywords can't contain whitespace (hits are kept per field): {spaced}")
+
+        if not self.vocabulary.issuperset(keywords):
+            self.vocabulary = self.vocabulary.union(keywords)
+            self.keywords = KeywordMatcher(self.vocabulary, cache_size=0)
+            vocabulary = sorted(self.vocabulary)
+            self.keyword_bits = {keyword: 1 << bit for bit, keyword in enumerate(vocabulary)}
+            self.signature = hashlib.sha1('\n'.join([str(FEATURE_VERSION), *vocabulary]).encode()).hexdigest()[:12]
+            self.cached_features.cache_clear()
+            self.cached_hit_set.cache_clear()
+            self.loaded.clear()
+
+        return keywords
+
+    def compute(self, key: ContentKey) -> RepoFeatures:
+        return extract_features(key, self.keywords)
+
+    def features(self, repo: Dict[str, Any]) -> RepoFeatures:
+        """Record for one repo dict (in-process: loaded by features_many, else memoized)"""
+        key = content_key(repo)
+        return self.loaded.get(key) or self.cached_features(key)
+
+    def encode(self, record: RepoFeatures) -> str:
+        """Stored form: hit sets as bitmasks over the sorted vocabulary, words space-joined"""
+        values = list(record)
+        for index in HIT_INDEXES:
+            values[index] = sum(self.keyword_bits[keyword] for keyword in values[index])
+        values[WORDS_INDEX] = ' '.join(values[WORDS_INDEX])
+        return json.dumps(values)
+
+    def decode(self, data: str) -> RepoFeatures:
+        values = json.loads(data)
+        for index in HIT_INDEXES:
+            values[index] = self.cached_hit_set(values[index])
+        values[WORDS_INDEX] = tuple(values[WORDS_INDEX].split())
+        values[TOPICS_INDEX] = tuple(values[TOPICS_INDEX])
+        return RepoFeatures._make(values)
+
+    def hit_set(self, mask: int) -> FrozenSet[str]:
+        return frozenset(keyword for keyword, bit in self.keyword_bits.items() if mask & bit)
+
+    def content_hash(self, key: ContentKey) -> str:
+        return hashlib.sha1(repr((FEATURE_VERSION, key)).encode()).hexdigest()
+
+    def features_many(self, repos: List[Dict[str, Any]]) -> List[RepoFeatures]:
+        """
+        Records for a page of repos, persisted across runs
+
+        Repos with an id are looked up in SQLite first (one query per
+        LOAD_CHUNK_SIZE ids); the rest are computed and the new records
+        stored in one write. Loaded records are kept for features(), so
+        the scorers that run on the page next reuse them.
+        """
+        keys = [content_key(repo) for repo in repos]
+        if not self.db_path:
+            return [self.cached_features(key) for key in keys]
+
+        ids = [repo_id(repo) for repo in repos]
+        hashes = [self.content_hash(key) if rid else None for key, rid in zip(keys, ids)]
+        stored = self.load({rid: content_hash for rid, content_hash in zip(ids, hashes) if rid})
+
+        records = []
+        rows = []
+        for key, rid, content_hash in zip(keys, ids, hashes):
+            record = stored.get(rid) if rid else None
+            if record is None:
+                record = self.cached_features(key)
+                if rid:
+                    rows.append((rid, self.signature, content_hash, self.encode(record), datetime.now().isoformat()))
+            records.append(record)
+
+        if len(self.loaded) + len(stored) > self.cache_size:
+            self.loaded.clear()
+        for key, rid in zip(keys, ids):
+            if rid in stored:
+                self.loaded[key] = stored[rid]
+
+        if rows:
+            self.save(rows)
+        return records
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        if not self.database_ready:
+            # Tables from before rows were keyed by vocabulary signature are only a cache: rebuild them
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(repo_features)")]
+            if columns and 'signature' not in columns:
+                conn.execute("DROP TABLE repo_features")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS repo_features (
+                    repo_id TEXT NOT NULL,
+                    signature TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    features TEXT NOT NULL,
+                    updated_at TEXT,
+                    PRIMARY KEY (repo_id, signature)
+                )
+            """)
+            conn.commit()
+            self.database_ready = True
+        return conn
+
+    def load(self, wanted: Dict[str, str]) -> Dict[str, RepoFeatures]:
+        """Stored records (this vocabulary) for {repo_id: content_hash} whose hash still matches"""
+        if not wanted:
+            return {}
+
+        ids = list(wanted)
+        records = {}
+        conn = self.connect()
+        for start in range(0, len(ids), LOAD_CHUNK_SIZE):
+            chunk = ids[start:start + LOAD_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT repo_id, content_hash, features FROM repo_features "
+                f"WHERE signature = ? AND repo_id IN ({placeholders})",
+                [self.signature, *chunk]
+            )
+            for rid, content_hash, features in rows:
+                if wanted[rid] == content_hash:
+                    records[rid] = self.decode(features)
+        conn.close()
+
+        self.counts['loaded'] += len(records)
+        return records
+
+    def save(self, rows: List[Tuple[str, str, str, str, str]]):
+        conn = self.connect()
+        conn.executemany(
+            "INSERT OR REPLACE INTO repo_features (repo_id, signature, content_hash, features, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+        conn.close()
+        self.counts['stored'] += len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Memo hits/misses and SQLite loads/stores since start"""
+        info = self.cached_features.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+            'loaded': self.counts['loaded'],
+            'stored': self.counts['stored'],
+        }
+
+
+# Shared by every scorer in the process, so each repo's text is processed once
+FEATURES = FeatureStore()
+
+
+def features(repo: Dict[str, Any]) -> RepoFeatures:
+    """Record for `repo` from the shared store"""
+    return FEATURES.features(repo)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+🗄️ Persistent GitHub Response Cache
+
+SQLite-backed HTTP cache shared by every process that uses the GitHub client.
+
+- Keyed by method + URL + params
+- Stores body plus ETag / Last-Modified validators
+- Fresh entries are served without touching the network
+- Stale entries are revalidated with If-None-Match / If-Modified-Since;
+  a 304 reply does not count against the GitHub rate limit
+- TTLs per endpoint class (search pages go stale faster than user profiles)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Set GITHUB_CACHE_DB='' to disable caching
+CACHE_DB_PATH = os.getenv('GITHUB_CACHE_DB', 'github_cache.db')
+
+# Entries not revalidated for this long are dropped when the cache opens
+CACHE_MAX_AGE = int(os.getenv('GITHUB_CACHE_MAX_AGE', str(7 * 86400)))
+
+# (path pattern, endpoint class, TTL seconds) - first match wins
+CACHE_TTL_RULES = [
+    (re.compile(r'^/search/'), 'search', 15 * 60),
+    (re.compile(r'^/users/[^/]+/repos$'), 'user_repos', 6 * 3600),
+    (re.compile(r'^/users/[^/]+$'), 'users', 24 * 3600),
+    (re.compile(r'^/repos/[^/]+/[^/]+/stargazers$'), 'stargazers', 24 * 3600),
+    (re.compile(r'^/repos/[^/]+/[^/]+/commits$'), 'commits', 3600),
+    (re.compile(r'^/repos/[^/]+/[^/]+/readme$'), 'readme', 24 * 3600),
+]
+DEFAULT_TTL = ('core', 3600)
+
+# Response headers worth keeping with the body
+CACHED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified', 'Link']
+
+
+def cache_ttl(url: str) -> tuple:
+    """Return (endpoint_class, ttl_seconds) for a URL"""
+    path = urlparse(url).path
+
+    for pattern, name, ttl in CACHE_TTL_RULES:
+        if pattern.search(path):
+            return name, ttl
+
+    return DEFAULT_TTL
+
+
+def cache_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for method + URL + params"""
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    raw = f"{method.upper()} {url}?{query}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """SQLite store of GitHub responses with conditional revalidation"""
+
+    def __init__(self, db_path: str = CACHE_DB_PATH):
+        self.db_path = db_path
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+        self.init_database()
+        self.prune()
+
+    def connect(self) -> sqlite3.Connection:
+        # One connection per call keeps this safe across threads and processes
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def init_database(self):
+        conn = self.connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                endpoint_class TEXT,
+                status INTEGER,
+                headers JSON,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                validated_at REAL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_validated ON http_cache(validated_at)")
+        conn.commit()
+        conn.close()
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for `key` (fresh or stale), or None"""
+        conn = self.connect()
+        row = conn.execute("""
+            SELECT url, endpoint_class, status, headers, body, etag, last_modified, validated_at
+            FROM http_cache WHERE key = ?
+        """, (key,)).fetchone()
+        conn.close()
+
+        if not row:
+            return None
+
+        url, endpoint, status, headers, body, etag, last_modified, validated_at = row
+        _, ttl = cache_ttl(url)
+
+        return {
+            'url': url,
+            'endpoint_class': endpoint,
+            'status': status,
+            'headers': json.loads(headers or '{}'),
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'is_fresh': (time.time() - validated_at) < ttl,
+        }
+
+    def store(self, key: str, response: requests.Response):
+        """Store a 200 response with its validators"""
+        endpoint, _ = cache_ttl(response.url)
+        headers = {h: response.headers[h] for h in CACHED_HEADERS if h in response.headers}
+        now = time.time()
+
+        conn = self.connect()
+        conn.execute("""
+            INSERT OR REPLACE INTO http_cache
+            (key, url, endpoint_class, status, headers, body, etag, last_modified,
+             stored_at, validated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            key,
+            response.url,
+            endpoint,
+            response.status_code,
+            json.dumps(headers),
+            response.content,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            now,
+            now,
+        ))
+        conn.commit()
+        conn.close()
+
+    def touch(self, key: str):
+        """Mark an entry as revalidated (after a 304)"""
+        conn = self.connect()
+        conn.execute("UPDATE http_cache SET validated_at = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a stale entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def to_response(entry: Dict[str, Any], cache_status: str) -> requests.Response:
+        """Rebuild a requests.Response from a cached entry"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = entry['url']
+        response._content = entry['body']
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.headers['X-Cache'] = cache_status
+        return response
+
+    def prune(self, max_age_seconds: int = CACHE_MAX_AGE) -> int:
+        """Drop entries not revalidated within `max_age_seconds`"""
+        conn = self.connect()
+        cursor = conn.execute(
+            "DELETE FROM http_cache WHERE validated_at < ?",
+            (time.time() - max_age_seconds,)
+        )
+        conn.commit()
+        deleted = cursor.rowcount
+        conn.close()
+        return deleted
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+🔁 GitHub Retry Policy + Circuit Breaker
+
+One retry policy for every GitHub call made through the shared client,
+replacing fixed `sleep(60)` retries.
+
+- Primary rate limit (403/429 with X-RateLimit-Remaining: 0): wait exactly
+  until `Retry-After` / `X-RateLimit-Reset`, then retry
+- Secondary rate limit (403/429 with Retry-After or an abuse message):
+  honor `Retry-After`, else jittered exponential backoff from 60s
+- 5xx and connection errors: jittered exponential backoff
+- Every attempt is bounded; a circuit breaker per endpoint stops hammering
+  an endpoint that keeps failing and fails fast until it cools down
+- Callers with a fallback (a token pool) fail over on a rate limit instead
+  of sleeping; the wait only happens once every fallback is exhausted
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+
+RETRYABLE_STATUS = {500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.RequestException):
+    """The endpoint's circuit breaker is open - request not sent"""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures
+
+    While open, requests fail fast. After `reset_timeout` seconds one trial
+    request is let through (half-open) and every other caller keeps failing
+    fast until it resolves; success closes the breaker again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False  # A caller holds the half-open trial
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def before_request(self):
+        """Raise CircuitOpenError if the breaker is open (or its trial is taken)"""
+        with self.lock:
+            state = self.state
+            if state == 'half-open' and not self.trial_in_flight:
+                self.trial_in_flight = True  # This caller is the trial
+                return
+
+            if state != 'closed':
+                retry_in = max(self.reset_timeout - (time.time() - self.opened_at), 0)
+                raise CircuitOpenError(
+                    f"circuit open for '{self.name}' endpoint (retry in {int(retry_in) + 1}s)"
+                )
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def release_trial(self):
+        """Give the half-open trial back without a verdict (the request never completed)"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            # A failed half-open trial re-opens immediately
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                if self.opened_at is None:
+                    print(f"🔌 Circuit opened for '{self.name}' after {self.failures} failures", flush=True)
+                self.opened_at = time.time()
+
+
+class RetryPolicy:
+    """Decides whether and how long to wait before retrying a GitHub request"""
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 120.0,
+        secondary_base_delay: float = 60.0,
+        max_rate_limit_wait: float = 3600.0,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.secondary_base_delay = secondary_base_delay
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.sleep = sleep
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.breakers_lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self.breakers_lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(endpoint)
+            return self.breakers[endpoint]
+
+    def backoff(self, attempt: int, base: float) -> float:
+        """Full-jitter exponential backoff for the given (0-based) attempt"""
+        return random.uniform(0, min(self.max_delay, base * (2 ** attempt))) + base / 2
+
+    @staticmethod
+    def is_rate_limited(response: requests.Response) -> bool:
+        return response.status_code in (403, 429) and (
+            response.headers.get('X-RateLimit-Remaining') == '0'
+            or 'Retry-After' in response.headers
+            or 'rate limit' in response.text.lower()
+        )
+
+    def rate_limit_wait(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait after a primary or secondary rate-limit reply"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+
+        if response.headers.get('X-RateLimit-Remaining') == '0' and 'X-RateLimit-Reset' in response.headers:
+            return max(float(response.headers['X-RateLimit-Reset']) - time.time(), 0) + 1
+
+        # Secondary limit without a hint: back off from a minute
+        return self.backoff(attempt, self.secondary_base_delay)
+
+    def delay_for(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying `response`, or None to give up"""
+        if self.is_rate_limited(response):
+            wait = self.rate_limit_wait(response, attempt)
+            return wait if wait <= self.max_rate_limit_wait else None
+
+        if response.status_code in RETRYABLE_STATUS:
+            return self.backoff(attempt, self.base_delay)
+
+        return None
+
+    def call(
+        self,
+        endpoint: str,
+        send: Callable[[], requests.Response],
+        failover: Optional[Callable[[float], bool]] = None
+    ) -> requests.Response:
+        """
+        Run `send` under the policy
+
+        On a rate limit, `failover(wait)` is asked first; if it returns True
+        (`send` now goes somewhere else, e.g. another token) the request is
+        retried at once without using up an attempt.
+
+        Returns the final response (possibly still an error status once
+        attempts run out); raises CircuitOpenError or the last connection error.
+        """
+        breaker = self.breaker(endpoint)
+
+        attempt = 0
+        while attempt < self.max_attempts:
+            breaker.before_request()
+
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.record_failure()
+                if attempt + 1 >= self.max_attempts:
+                    raise
+                wait = self.backoff(attempt, self.base_delay)
+                print(f"⚠️  {endpoint} request failed ({e.__class__.__name__}). Retrying in {wait:.1f}s...", flush=True)
+                self.sleep(wait)
+                attempt += 1
+                continue
+            except Exception:
+                breaker.release_trial()
+                raise
+
+            if response.status_code in RETRYABLE_STATUS:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            rate_limited = self.is_rate_limited(response)
+            if rate_limited and failover is not None and failover(self.rate_limit_wait(response, attempt)):
+                print(f"🔀 {endpoint} rate limited. Switching token...", flush=True)
+                continue
+
+            wait = self.delay_for(response, attempt)
+            if wait is None or attempt + 1 >= self.max_attempts:
+                return response
+
+            reason = 'rate limited' if rate_limited else f"HTTP {response.status_code}"
+            print(f"⏸️  {endpoint} {reason}. Retrying in {wait:.0f}s (attempt {attempt + 2}/{self.max_attempts})...", flush=True)
+            self.sleep(wait)
+            attempt += 1
+
+        return response
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+♻️ Persistent Seen-Repo Filter
+
+Search results repeat heavily across queries and cycles. This filter lets
+discovery skip repos it has already handled, before any scoring or DB write.
+
+- Key: repo id + pushed_at, so a repo that got new commits is seen again
+- On-disk Bloom filter answers "definitely new" without touching SQLite
+- Bloom "maybe seen" answers are confirmed against an exact SQLite table
+  (one batched query per page), so false positives never drop a repo
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter backed by a bytearray, saved to one file"""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        self.size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, key: str) -> List[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.sha256(key.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str):
+        for pos in self.positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self.positions(key))
+
+    def load(self, path: str) -> bool:
+        """Load bits saved by save(); False if missing or sized differently"""
+        if not os.path.exists(path):
+            return False
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) != len(self.bits):
+            return False
+
+        self.bits = bytearray(data)
+        return True
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+
+def seen_key(repo: Dict[str, Any]) -> Optional[str]:
+    """Identity of a repo; falls back to its URL when the id is missing"""
+    key = repo.get('id') or repo.get('html_url')
+    return str(key) if key else None
+
+
+class SeenRepoFilter:
+    """Bloom filter in front of an exact SQLite set of (repo, pushed_at)"""
+
+    def __init__(self, db_path: str, bloom_path: Optional[str] = None, capacity: int = 1_000_000):
+        self.db_path = db_path
+        self.bloom_path = bloom_path or f"{os.path.splitext(db_path)[0]}.seen.bloom"
+        self.bloom = BloomFilter(capacity)
+        self.stats = {'checked': 0, 'skipped': 0}
+        self.init_database()
+
+        if not self.bloom.load(self.bloom_path):
+            self.rebuild_bloom()
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def init_database(self):
+        conn = self.connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_repos (
+                repo_key TEXT PRIMARY KEY,
+                pushed_at TEXT,
+                seen_at REAL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def rebuild_bloom(self):
+        """Refill the Bloom filter from the exact table (file lost or resized)"""
+        conn = self.connect()
+        for repo_key, pushed_at in conn.execute("SELECT repo_key, pushed_at FROM seen_repos"):
+            self.bloom.add(f"{repo_key}:{pushed_at}")
+        conn.close()
+
+    def filter_unseen(self, repos: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop repos already handled at their current pushed_at"""
+        repos = list(repos)
+        maybe_seen = {}
+
+        for repo in repos:
+            key = seen_key(repo)
+            if key and f"{key}:{repo.get('pushed_at')}" in self.bloom:
+                maybe_seen[key] = repo.get('pushed_at')
+
+        confirmed = set()
+        if maybe_seen:
+            placeholders = ','.join('?' * len(maybe_seen))
+            conn = self.connect()
+            rows = conn.execute(
+                f"SELECT repo_key, pushed_at FROM seen_repos WHERE repo_key IN ({placeholders})",
+                list(maybe_seen)
+            ).fetchall()
+            conn.close()
+            confirmed = {key for key, pushed_at in rows if maybe_seen[key] == pushed_at}
+
+        unseen = [repo for repo in repos if seen_key(repo) not in confirmed]
+
+        self.stats['checked'] += len(repos)
+        self.stats['skipped'] += len(repos) - len(unseen)
+        return unseen
+
+    def mark(self, repos: Iterable[Dict[str, Any]]):
+        """Record repos as handled at their current pushed_at"""
+        rows = []
+        for repo in repos:
+            key = seen_key(repo)
+            if key:
+                rows.append((key, repo.get('pushed_at'), time.time()))
+                self.bloom.add(f"{key}:{repo.get('pushed_at')}")
+
+        if not rows:
+            return
+
+        conn = self.connect()
+        conn.executemany("INSERT OR REPLACE INTO seen_repos (repo_key, pushed_at, seen_at) VALUES (?, ?, ?)", rows)
+        conn.commit()
+        conn.close()
+
+    def save(self):
+        """Persist the Bloom filter (the SQLite side is written on every mark)"""
+        self.bloom.save(self.bloom_path)
+
+    def take_stats(self) -> Dict[str, Any]:
+        """Checked/skipped counts since the last call, then reset them"""
+        stats = dict(self.stats)
+        stats['skip_ratio'] = stats['skipped'] / stats['checked'] if stats['checked'] else 0.0
+        self.stats = {'checked': 0, 'skipped': 0}
+        return stats
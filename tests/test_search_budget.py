@@ -0,0 +1,56 @@
+"""Search-bucket accounting in the continuous discovery cycle"""
+
+import asyncio
+
+import pytest
+
+import continuous_discovery
+from repo_features import FEATURES
+
+
+def fake_repo(repo_id: int):
+    return {
+        'id': repo_id,
+        'name': f'repo-{repo_id}',
+        'full_name': f'owner/repo-{repo_id}',
+        'owner': {'login': 'owner'},
+        'html_url': f'https://github.com/owner/repo-{repo_id}',
+        'description': 'plain project',
+        'stargazers_count': 10,
+        'forks_count': 1,
+        'language': 'Python',
+        'topics': [],
+        'created_at': '2024-01-01T00:00:00Z',
+        'pushed_at': '2024-06-01T00:00:00Z',
+    }
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(FEATURES, 'db_path', str(tmp_path / 'repo_features.db'))
+    engine = continuous_discovery.ContinuousDiscoveryEngine('fake-token')
+    monkeypatch.setattr(engine.discovery, 'fetch_last_commit', lambda owner, name: None)
+    return engine
+
+
+def test_search_tokens_match_planner_requests(engine, monkeypatch):
+    totals = {'small': 250, 'empty': 0}
+
+    def search_page(query, per_page=100, page=1):
+        total = totals[query.split()[0]]
+        start = (page - 1) * per_page
+        items = [fake_repo(sum(map(ord, query)) * 1000 + i) for i in range(start, min(start + per_page, total))]
+        return items, total
+
+    monkeypatch.setattr(engine.discovery, 'search_page', search_page)
+    queries = [('small', 100), ('empty', 100)]
+
+    asyncio.run(engine.run_discovery_cycle_async(queries))
+    assert engine.planner.stats['requests'] == 4  # 3 pages + 1 empty probe
+    assert engine.limiter.buckets['search'].used == engine.planner.stats['requests']
+
+    # Finished slices are skipped on the next cycle: no requests, no tokens
+    asyncio.run(engine.run_discovery_cycle_async(queries))
+    assert engine.planner.stats['skipped'] == 2
+    assert engine.limiter.buckets['search'].used == engine.planner.stats['requests'] == 4